@@ -0,0 +1,68 @@
+"""
+업무 배정 시뮬레이션 벤치마크.
+작업자 N명(일부 퇴근 상태)에게 업무 M개를 배정하면서 임의로 완료를 섞어,
+모든 작업자를 훑는 선형 방식과 WorkerScheduler(힙)의 처리 시간을 비교한다.
+
+사용법: python bench_assign.py [작업자 수] [업무 수]
+"""
+import random
+import sys
+import time
+from task_scheduler import WorkerScheduler
+
+COMPLETION_RATE = 0.9  # 업무 하나 배정할 때마다 완료가 일어날 확률
+CHECKED_IN_RATIO = 0.8
+
+class LinearAssigner:
+    """기존 assign_task 방식을 N명으로 일반화: 출근한 작업자를 모두 훑어 남은 작업이 가장 적은 사람 선택."""
+    def __init__(self):
+        self.outstanding = {}
+        self.checked_in = set()
+
+    def check_in(self, name):
+        self.checked_in.add(name)
+        self.outstanding.setdefault(name, 0)
+
+    def assign(self):
+        best = None
+        for name in self.checked_in:
+            if best is None or self.outstanding[name] < self.outstanding[best]:
+                best = name
+        if best is not None:
+            self.outstanding[best] += 1
+        return best
+
+    def complete(self, name, duration=None):
+        if self.outstanding.get(name, 0) > 0:
+            self.outstanding[name] -= 1
+
+def simulate(assigner, workers, tasks, seed=1):
+    rng = random.Random(seed)
+    for name in workers:
+        if rng.random() < CHECKED_IN_RATIO:
+            assigner.check_in(name)
+
+    busy = []  # 업무를 가진 작업자 (완료 대상)
+    start = time.perf_counter()
+    for _ in range(tasks):
+        name = assigner.assign()
+        if name is not None:
+            busy.append(name)
+        if busy and rng.random() < COMPLETION_RATE:
+            index = rng.randrange(len(busy))
+            busy[index], busy[-1] = busy[-1], busy[index]
+            assigner.complete(busy.pop(), rng.uniform(30, 90))
+    return time.perf_counter() - start
+
+def main():
+    worker_count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    task_count = int(sys.argv[2]) if len(sys.argv) > 2 else 100000
+    workers = [f"worker{i}" for i in range(worker_count)]
+
+    print(f"작업자 {worker_count}명, 업무 {task_count}개")
+    for name, assigner in (("선형 탐색", LinearAssigner()), ("힙(WorkerScheduler)", WorkerScheduler())):
+        elapsed = simulate(assigner, workers, task_count)
+        print(f"{name:<20} {elapsed:>8.3f} s   {elapsed / task_count * 1e6:>8.2f} us/업무")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Message 직렬화 마이크로 벤치마크.
+pickle 경로와 고정 레이아웃 바이너리 코덱의 메시지당 인코딩/디코딩 시간(ns)과
+전송 바이트 수를 비교한다.
+
+사용법: python bench_codec.py [반복 횟수]
+"""
+import sys
+import time
+from common import Message, MessageType, SendType, CODEC_BINARY, CODEC_PICKLE, set_codec
+
+SAMPLES = {
+    "재고 업데이트": Message(
+        type=MessageType.INVENTORY_UPDATE_FROM_WARE,
+        send_type=SendType.SEND_FROM_WAREHOUSE,
+        zone="A구역",
+        quantity=90,
+    ),
+    "업무 지시": Message(
+        type=MessageType.WORK_ORDER,
+        send_type=SendType.SEND_FROM_WAREHOUSE,
+        content="A구역 재고 불일치",
+    ),
+}
+
+def measure(msg, codec, iterations):
+    """(인코딩 ns/msg, 디코딩 ns/msg, 바이트 수)를 반환."""
+    set_codec(codec)  # pickle 디코딩은 명시적으로 켠 경우만 허용되므로
+    data = msg.serialize(codec)
+
+    start = time.perf_counter_ns()
+    for _ in range(iterations):
+        msg.serialize(codec)
+    encode_ns = (time.perf_counter_ns() - start) / iterations
+
+    start = time.perf_counter_ns()
+    for _ in range(iterations):
+        Message.deserialize(data)
+    decode_ns = (time.perf_counter_ns() - start) / iterations
+
+    return encode_ns, decode_ns, len(data)
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    print(f"반복 횟수: {iterations}")
+    print(f"{'메시지':<10} {'코덱':<8} {'encode ns':>10} {'decode ns':>10} {'bytes':>6}")
+    for name, msg in SAMPLES.items():
+        for codec in (CODEC_PICKLE, CODEC_BINARY):
+            encode_ns, decode_ns, size = measure(msg, codec, iterations)
+            print(f"{name:<10} {codec:<8} {encode_ns:>10.0f} {decode_ns:>10.0f} {size:>6}")
+    set_codec(CODEC_BINARY)
+
+if __name__ == "__main__":
+    main()
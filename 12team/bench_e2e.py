@@ -0,0 +1,416 @@
+"""
+종단 간 벤치마크: 중앙 서버, 창고 N개, 작업자 스테이션 M개를 한 프로세스 안에서 localhost로 연결해 부하를 건다.
+GPIO/RFID/LCD는 mock 하드웨어 백엔드(fake_hardware)를 쓰므로 라즈베리 파이 없이 실행된다.
+--processes를 2 이상으로 주면 중앙 서버를 샤드 프로세스들로 따로 띄우고, 지표 엔드포인트로 진행 상황을 확인한다.
+
+- 창고: 정해진 속도(초당 메시지 수, 0이면 최대 속도)로 재고 업데이트와 작업 지시를 섞어 전송
+- 작업자 스테이션: 식별 메시지로 등록한 뒤 받은 작업 지시마다 바로 완료 응답
+- 마지막에 worker_management로 된 스테이션 하나를 붙여, 카드 태그(출근)와 버튼(작업 완료)으로
+  작업 지시가 완료 응답까지 처리되는지 확인 (실패하면 0이 아닌 종료 코드)
+- 결과: 처리량, 작업 지시 종단 간 지연(창고 전송 -> 스테이션 수신) p50/p99,
+  재고 업데이트의 중앙 서버 처리 지연 p50/p99, 메시지당 CPU 시간 (모든 노드 합계)
+
+사용법: python bench_e2e.py [--warehouses N] [--workers M] [--messages K] [--rate R] [--order-ratio P] [--engine thread|asyncio]
+                          [--flush-latency-ms L] [--low-latency] [--processes P]
+"""
+import argparse
+import asyncio
+import os
+import random
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+
+from log_util import setup_logging
+import central_management as central
+import hardware
+import worker_management
+from client_connection import ResilientConnection
+from common import Message, MessageType, SendType, send_message, make_identification
+from fake_hardware import FakeMFRC522
+from metrics import LatencyHistogram
+from socket_util import create_and_connect_socket
+from socket_writer import CoalescingWriter, FlushPolicy, DEFAULT_FLUSH_POLICY
+
+WAIT_TIMEOUT = 60.0
+BUTTON_DEBOUNCE = 0.35  # worker_management가 0.3초 이내의 같은 버튼 입력을 무시하므로 그보다 길게
+CENTRAL_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "central_management.py")
+INVENTORY_LABELS = (("type", MessageType.INVENTORY_UPDATE_FROM_WARE.name),
+                    ("send_type", SendType.SEND_FROM_WAREHOUSE.name))
+
+sent_times = {}  # 작업 지시 내용 -> 창고에서 보낸 시각
+sent_lock = threading.Lock()
+
+def free_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+def wait_listening(port, timeout=10):
+    """서버가 listen을 시작할 때까지 대기."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            create_and_connect_socket("127.0.0.1", port).close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.05)
+
+class LocalCentral:
+    """같은 프로세스의 스레드로 실행하는 중앙 서버. 상태는 모듈 전역을 직접 읽음."""
+    def __init__(self, engine, port, data_dir, flush_policy):
+        central.open_state(data_dir)
+        if engine == central.ENGINE_ASYNCIO:
+            target = lambda: asyncio.run(central.run_asyncio_server(port, central.DEFAULT_BACKLOG, flush_policy=flush_policy))
+        else:
+            target = lambda: central.run_threaded_server(port, central.DEFAULT_BACKLOG, flush_policy=flush_policy)
+        threading.Thread(target=target, name="central", daemon=True).start()
+        wait_listening(port)
+
+    def stations(self):
+        return len(central.worker_registry)
+
+    def processed_inventory(self):
+        return central.metrics.counters.get(("central_messages_total", INVENTORY_LABELS), 0)
+
+    def outstanding_orders(self):
+        return central.work_orders.inflight_count() + central.work_orders.pending_count()
+
+    def cpu_time(self):
+        return 0.0  # 벤치마크 프로세스의 CPU 시간에 포함됨
+
+    def route_latency(self):
+        route = central.metrics.histograms.get(("central_route_latency_us", INVENTORY_LABELS), LatencyHistogram())
+        return f"p50 {route.percentile(0.5)} us, p99 {route.percentile(0.99)} us"
+
+    def stop(self):
+        central.close_state()
+
+class ShardedCentral:
+    """central_management.py --processes N을 별도 프로세스로 실행. 상태는 샤드별 지표 엔드포인트에서 읽음."""
+    def __init__(self, processes, engine, port, data_dir, flush_policy):
+        self.processes = processes
+        self.metrics_port = free_port()
+        command = [sys.executable, CENTRAL_SCRIPT, "--processes", str(processes), "--engine", engine,
+                   "--port", str(port), "--data-dir", data_dir, "--hardware", hardware.BACKEND_MOCK,
+                   "--metrics-port", str(self.metrics_port), "--log-level", "WARNING",
+                   "--flush-latency-ms", str(flush_policy.latency * 1000)]
+        if flush_policy.low_latency:
+            command.append("--low-latency")
+        self.process = subprocess.Popen(command)
+        wait_listening(port)
+        for shard in range(processes):
+            wait_until(lambda: self._fetch(shard) is not None, 10)
+
+    def _fetch(self, shard):
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{self.metrics_port + shard}/metrics", timeout=2) as response:
+                return response.read().decode("utf-8")
+        except OSError:
+            return None
+
+    def scrape(self, name, labels=""):
+        """샤드별로 'name{labels} 값' 줄의 값을 모음."""
+        prefix = f"{name}{{{labels}}} " if labels else f"{name} "
+        values = []
+        for shard in range(self.processes):
+            for line in (self._fetch(shard) or "").splitlines():
+                if line.startswith(prefix):
+                    values.append(float(line[len(prefix):]))
+        return values
+
+    def stations(self):
+        # 샤드마다 자신에게 연결된 스테이션과 다른 샤드의 스테이션을 모두 알고 있어야 함
+        values = self.scrape("central_worker_stations")
+        return min(values) if len(values) == self.processes else 0
+
+    def processed_inventory(self):
+        return sum(self.scrape("central_messages_total", metric_labels(INVENTORY_LABELS)))
+
+    def outstanding_orders(self):
+        return sum(self.scrape("central_work_orders_inflight")) + sum(self.scrape("central_work_orders_pending"))
+
+    def cpu_time(self):
+        """중앙 서버 프로세스와 샤드 프로세스들의 CPU 시간 합계 (리눅스 /proc)."""
+        total = 0
+        for pid in [self.process.pid] + child_pids(self.process.pid):
+            try:
+                with open(f"/proc/{pid}/stat") as stat:
+                    fields = stat.read().rsplit(")", 1)[1].split()
+                total += int(fields[11]) + int(fields[12])  # utime + stime
+            except (OSError, IndexError, ValueError):
+                pass
+        return total / os.sysconf("SC_CLK_TCK")
+
+    def route_latency(self):
+        labels = metric_labels(INVENTORY_LABELS)
+        p50 = self.scrape("central_route_latency_us", labels + ',quantile="0.5"')
+        p99 = self.scrape("central_route_latency_us", labels + ',quantile="0.99"')
+        return "샤드별 " + ", ".join(f"p50 {a:.0f}/p99 {b:.0f} us" for a, b in zip(p50, p99))
+
+    def stop(self):
+        self.process.send_signal(signal.SIGINT)
+        try:
+            self.process.wait(10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+
+def metric_labels(labels):
+    return ",".join(f'{key}="{value}"' for key, value in labels)
+
+def child_pids(pid):
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as children:
+            return [int(child) for child in children.read().split()]
+    except OSError:
+        return []
+
+class SimulatedWorkerStation:
+    """worker_management와 같은 프로토콜로 작업 지시를 받고 즉시 완료 응답을 보내는 스테이션."""
+    def __init__(self, index, port, flush_policy, zones=()):
+        self.station_id = f"bench-worker-{index}"
+        self.latency = LatencyHistogram()
+        self.received = 0
+        self.lock = threading.Lock()
+        hello = Message(MessageType.WORK_ORDER, SendType.SEND_FROM_WORKER,
+                        content=make_identification(self.station_id, zones))
+        self.connection = ResilientConnection("127.0.0.1", port, hello=[hello], on_message=self.on_message,
+                                              flush_policy=flush_policy)
+
+    def start(self):
+        self.connection.start()
+        self.connection.wait_connected(5)
+
+    def on_message(self, msg):
+        if msg.type != MessageType.WORK_ORDER:
+            return
+        now = time.perf_counter()
+        with sent_lock:
+            sent_at = sent_times.pop(msg.content, None)
+        with self.lock:
+            self.received += 1
+            if sent_at is not None:
+                self.latency.record((now - sent_at) * 1000000)
+        send_message(self.connection, Message(MessageType.WORK_ORDER_ACK, SendType.SEND_FROM_WORKER,
+                                              order_id=msg.order_id))
+
+    def close(self):
+        self.connection.close()
+
+class HardwareStation:
+    """
+    worker_management를 그대로 쓰는 스테이션. 출근은 FakeMFRC522.tap(uid), 작업 완료는 버튼 press()로 넣는다.
+    worker_management.main()은 로그 설정을 기본값으로 바꾸므로, main()과 같은 순서로 부품만 직접 띄운다.
+    """
+    STATION_ID = "bench-hardware-station"
+
+    def __init__(self, port, flush_policy):
+        self.port = port
+        self.flush_policy = flush_policy
+        self.tag_thread = None
+
+    def start(self):
+        worker_management.display.start()
+        worker_management.setup_buttons()
+        hello = Message(MessageType.WORK_ORDER, SendType.SEND_FROM_WORKER,
+                        content=make_identification(self.STATION_ID, ()))
+        worker_management.central_connection = ResilientConnection(
+            "127.0.0.1", self.port, hello=[hello], on_message=worker_management.handle_server_message,
+            flush_policy=self.flush_policy).start()
+        worker_management.central_connection.wait_connected(5)
+        self.tag_thread = threading.Thread(target=self.read_tags, name="bench-rfid", daemon=True)
+        self.tag_thread.start()
+
+    @staticmethod
+    def read_tags():
+        """worker_management.read_tags()와 같지만 None 태그를 받으면 끝남 (close()에서 사용)."""
+        reader = hardware.get_backend().rfid_reader()
+        for uid in iter(reader.read_id, None):
+            worker_management.toggle_work_state(uid)
+
+    def close(self):
+        if self.tag_thread is not None:
+            FakeMFRC522.tap(None)
+            self.tag_thread.join()
+        if worker_management.central_connection is not None:
+            worker_management.central_connection.close()
+            worker_management.central_connection = None
+        worker_management.display.stop()
+
+def check_hardware_station(server, port, flush_policy, orders=3, timeout=10):
+    """
+    HardwareStation 하나만 연결한 상태에서 작업 지시를 보내고, 작업자가 카드로 출근해 버튼으로
+    모두 완료하면 중앙 서버에 완료 응답이 도착해 남은 작업 지시가 0이 되는지 확인.
+    """
+    _, worker = next(iter(worker_management.roster))
+    station = HardwareStation(port, flush_policy)
+    station.start()
+    try:
+        if not wait_until(lambda: server.stations() == 1, timeout):
+            return False
+        FakeMFRC522.tap(worker["uid"])
+        if not wait_until(lambda: worker_management.attendance_states.get(worker["uid"]), timeout):
+            return False
+
+        sock = create_and_connect_socket("127.0.0.1", port)
+        try:
+            for sequence in range(orders):
+                send_message(sock, Message(MessageType.WORK_ORDER, SendType.SEND_FROM_WAREHOUSE,
+                                           content=f"hardware-{sequence}", zone=f"{central.zone_registry.ids[0]}구역"))
+        finally:
+            sock.close()
+
+        gpio = hardware.get_backend().gpio()
+        for _ in range(orders):
+            if not wait_until(lambda: not worker["queue"].empty(), timeout):
+                return False
+            time.sleep(BUTTON_DEBOUNCE)  # 같은 버튼의 연속 입력은 무시되므로 간격을 둠
+            gpio.press(worker["button_pin"])
+        return wait_until(lambda: server.outstanding_orders() == 0, timeout)
+    finally:
+        if worker_management.attendance_states.get(worker["uid"]):
+            FakeMFRC522.tap(worker["uid"])  # 퇴근
+        station.close()
+
+def run_warehouse(index, port, messages, rate, order_ratio, zones, flush_policy, counts, flushes):
+    """
+    재고 업데이트와 작업 지시를 섞어 전송. counts[index] = (재고 메시지 수, 작업 지시 수),
+    flushes[index] = 전송 시스템 호출 수.
+    """
+    rng = random.Random(index)
+    sock = create_and_connect_socket("127.0.0.1", port, nodelay=flush_policy.low_latency)
+    writer = CoalescingWriter(sock, flush_policy)
+    interval = 1.0 / rate if rate else 0.0
+    next_send = time.perf_counter()
+    inventory_sent = orders_sent = 0
+    try:
+        for sequence in range(messages):
+            zone = rng.choice(zones)
+            if rng.random() < order_ratio:
+                content = f"bench-{index}-{sequence}"
+                msg = Message(MessageType.WORK_ORDER, SendType.SEND_FROM_WAREHOUSE,
+                              content=content, zone=f"{zone}구역", priority=rng.randrange(100))
+                with sent_lock:
+                    sent_times[content] = time.perf_counter()
+                orders_sent += 1
+            else:
+                msg = Message(MessageType.INVENTORY_UPDATE_FROM_WARE, SendType.SEND_FROM_WAREHOUSE,
+                              zone=f"{zone}구역", quantity=rng.randrange(10))
+                inventory_sent += 1
+            send_message(writer, msg)
+
+            if interval:
+                next_send += interval
+                delay = next_send - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+    finally:
+        writer.flush()
+        counts[index] = (inventory_sent, orders_sent)
+        flushes[index] = writer.flushes
+        # 중앙 서버가 모두 읽을 때까지 연결을 유지했다가 닫음
+        sock.shutdown(socket.SHUT_WR)
+        sock.recv(1)
+        sock.close()
+
+def wait_until(condition, timeout=WAIT_TIMEOUT):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+def main():
+    parser = argparse.ArgumentParser(description="종단 간 벤치마크 (가짜 하드웨어)")
+    parser.add_argument("--warehouses", type=int, default=4)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--messages", type=int, default=5000, help="창고 하나가 보내는 메시지 수")
+    parser.add_argument("--rate", type=float, default=0, help="창고 하나의 초당 전송 수 (0이면 최대 속도)")
+    parser.add_argument("--order-ratio", type=float, default=0.2, help="전체 메시지 중 작업 지시 비율")
+    parser.add_argument("--engine", choices=(central.ENGINE_THREAD, central.ENGINE_ASYNCIO), default=central.ENGINE_THREAD)
+    parser.add_argument("--flush-latency-ms", type=float, default=DEFAULT_FLUSH_POLICY.latency * 1000,
+                        help="모든 노드의 송신 묶음 대기 시간(밀리초)")
+    parser.add_argument("--low-latency", action="store_true", help="TCP_NODELAY를 켜고 묶지 않고 바로 전송")
+    parser.add_argument("--processes", type=int, default=1, help="중앙 서버 샤드 프로세스 수 (2 이상이면 별도 프로세스로 실행)")
+    args = parser.parse_args()
+    flush_policy = FlushPolicy(args.flush_latency_ms / 1000, low_latency=args.low_latency)
+
+    setup_logging("WARNING")
+    hardware.use_backend(hardware.BACKEND_MOCK)
+    data_dir = tempfile.mkdtemp(prefix="bench-e2e-")
+    port = free_port()
+    zones = central.zone_registry.ids
+    server = None
+    try:
+        if args.processes > 1:
+            server = ShardedCentral(args.processes, args.engine, port, data_dir, flush_policy)
+        else:
+            server = LocalCentral(args.engine, port, data_dir, flush_policy)
+        stations = [SimulatedWorkerStation(index, port, flush_policy) for index in range(args.workers)]
+        for station in stations:
+            station.start()
+        wait_until(lambda: server.stations() == args.workers, 5)
+
+        counts = [(0, 0)] * args.warehouses
+        flushes = [0] * args.warehouses
+        warehouses = [
+            threading.Thread(target=run_warehouse,
+                             args=(index, port, args.messages, args.rate, args.order_ratio, zones, flush_policy,
+                                   counts, flushes))
+            for index in range(args.warehouses)
+        ]
+
+        started_cpu = time.process_time() + server.cpu_time()
+        started = time.perf_counter()
+        for thread in warehouses:
+            thread.start()
+        for thread in warehouses:
+            thread.join()
+        inventory_sent = sum(count[0] for count in counts)
+        orders_sent = sum(count[1] for count in counts)
+
+        done = wait_until(lambda: server.processed_inventory() >= inventory_sent
+                          and sum(station.received for station in stations) >= orders_sent
+                          and server.outstanding_orders() == 0)
+        elapsed = time.perf_counter() - started
+        cpu = time.process_time() + server.cpu_time() - started_cpu
+
+        total = inventory_sent + orders_sent
+        latency = LatencyHistogram()
+        for station in stations:
+            latency.merge(station.latency)
+
+        print(f"엔진: {args.engine}, 중앙 서버 프로세스 {args.processes}개, 창고 {args.warehouses}개, 작업자 스테이션 {args.workers}개, "
+              f"속도: {args.rate or '최대'} msg/s/창고, {flush_policy}")
+        print(f"메시지: {total}개 (재고 {inventory_sent}, 작업 지시 {orders_sent})"
+              f"{'' if done else ' - 시간 초과: 일부 미처리'}")
+        print(f"처리량: {total / elapsed:,.0f} msg/s ({elapsed:.2f}초)")
+        print(f"작업 지시 종단 간 지연: p50 {latency.percentile(0.5) / 1000:.2f} ms, "
+              f"p99 {latency.percentile(0.99) / 1000:.2f} ms, 최대 {latency.max / 1000:.2f} ms")
+        print(f"재고 업데이트 서버 처리 지연: {server.route_latency()}")
+        print(f"창고 전송 시스템 호출: 메시지 {total / max(1, sum(flushes)):.1f}개당 1회")
+        print(f"메시지당 CPU: {cpu / total * 1000000:.1f} us (모든 노드 합계)")
+
+        for station in stations:
+            station.close()
+
+        # 실제 작업자 스테이션 코드(worker_management)로도 작업 지시가 끝까지 처리되는지 확인
+        if not check_hardware_station(server, port, flush_policy):
+            raise SystemExit("mock 하드웨어 스테이션의 작업 완료 응답이 중앙 서버에 도착하지 않음")
+        print("mock 하드웨어 스테이션: 카드 출근, 버튼 완료 응답 확인")
+    finally:
+        if server is not None:
+            server.stop()
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
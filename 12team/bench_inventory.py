@@ -0,0 +1,68 @@
+"""
+재고 저장소 멀티스레드 스트레스 벤치마크.
+기존 방식(잠금 없는 dict), 전역 잠금 dict, InventoryStore에 여러 스레드가 동시에 증감(delta)을 가해
+초당 처리량과 최종 값의 정확성(유실된 갱신 수)을 비교한다.
+
+사용법: python bench_inventory.py [스레드 수] [스레드당 연산 수] [구역 수]
+"""
+import random
+import sys
+import threading
+import time
+from inventory_store import InventoryStore
+
+GLOBAL_LOCK = threading.Lock()
+
+def plain_dict_worker(inventory, zones, operations, seed):
+    """central_management의 이전 방식: 읽고 쓰는 사이에 다른 스레드가 끼어들 수 있음."""
+    rng = random.Random(seed)
+    for _ in range(operations):
+        zone = rng.choice(zones)
+        quantity = inventory[zone]
+        inventory[zone] = quantity + 1
+
+def global_lock_worker(inventory, zones, operations, seed):
+    """dict 전체를 잠금 하나로 보호하는 방식 (서로 다른 구역의 갱신도 직렬화됨)."""
+    rng = random.Random(seed)
+    for _ in range(operations):
+        zone = rng.choice(zones)
+        with GLOBAL_LOCK:
+            inventory[zone] = inventory[zone] + 1
+
+def store_worker(inventory, zones, operations, seed):
+    rng = random.Random(seed)
+    for _ in range(operations):
+        inventory.add(rng.choice(zones), 1)
+
+def run(name, worker, inventory, zones, threads, operations):
+    workers = [
+        threading.Thread(target=worker, args=(inventory, zones, operations, seed))
+        for seed in range(threads)
+    ]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    values = inventory.snapshot() if isinstance(inventory, InventoryStore) else inventory
+    expected = threads * operations
+    total = sum(values.values())
+    print(f"{name:<16} {expected / elapsed:>12.0f} ops/s   유실된 갱신: {expected - total}")
+
+def main():
+    threads = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    operations = int(sys.argv[2]) if len(sys.argv) > 2 else 100000
+    zone_count = int(sys.argv[3]) if len(sys.argv) > 3 else 64
+    zones = [f"{i} 구역" for i in range(zone_count)]
+
+    # 스레드 전환을 자주 일으켜 경쟁 상태가 드러나도록 함
+    sys.setswitchinterval(1e-6)
+    print(f"스레드 {threads}개 × 연산 {operations}회, 구역 {zone_count}개")
+    run("dict (잠금 없음)", plain_dict_worker, {zone: 0 for zone in zones}, zones, threads, operations)
+    run("dict + 전역 잠금", global_lock_worker, {zone: 0 for zone in zones}, zones, threads, operations)
+    run("InventoryStore", store_worker, InventoryStore(zones), zones, threads, operations)
+
+if __name__ == "__main__":
+    main()
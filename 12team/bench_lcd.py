@@ -0,0 +1,40 @@
+"""
+LCD 드라이버 벤치마크 (FakeSMBus 사용, 실제 장치 불필요).
+기존 LCD와 BufferedLCD가 작업자 화면 메시지를 표시할 때의
+I2C 트랜잭션 수, 전송 바이트 수, 소요 시간을 비교한다.
+
+사용법: python bench_lcd.py
+"""
+import time
+from lcd import LCD, BufferedLCD, FakeSMBus
+
+# 작업자 스테이션에서 실제로 연달아 표시되는 화면들
+SCREENS = [
+    ("worker1: + task",),
+    ("worker2: + task",),
+    ("worker1: done", "worker1: no task"),
+    ("worker1: start",),
+    ("worker1: finish",),
+    (),
+]
+
+def run(lcd_class):
+    bus = FakeSMBus()
+    lcd = lcd_class(bus=bus)
+    bus.reset()
+
+    start = time.perf_counter()
+    for lines in SCREENS:
+        lcd.display_lines(lines)
+    elapsed = time.perf_counter() - start
+    return bus.transactions, bus.bytes_written, elapsed
+
+def main():
+    print(f"화면 {len(SCREENS)}개 표시")
+    print(f"{'드라이버':<12} {'트랜잭션':>8} {'바이트':>8} {'시간(ms)':>9}")
+    for lcd_class in (LCD, BufferedLCD):
+        transactions, written, elapsed = run(lcd_class)
+        print(f"{lcd_class.__name__:<12} {transactions:>8} {written:>8} {elapsed * 1000:>9.1f}")
+
+if __name__ == "__main__":
+    main()
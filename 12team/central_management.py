@@ -1,100 +1,646 @@
-import RPi.GPIO as GPIO
+import argparse
+import asyncio
+import os
 import socket
 import threading
-from common import Message, MessageType, SendType, CENTRAL_SERVER_PORT
-from socket_util import create_and_bind_socket
+import time
+from common import Message, MessageType, SendType, FrameBuffer, ConnectionReader, encode_frame, parse_identification, BUFFER_SIZE, IDLE_TIMEOUT, CENTRAL_SERVER_PORT
+from socket_util import create_and_bind_socket, raise_open_file_limit, DEFAULT_BACKLOG
+from socket_writer import CoalescingWriter, FlushPolicy, DEFAULT_FLUSH_POLICY, DEFAULT_FLUSH_BYTES
+from worker_registry import WorkerRegistry
+from zone_registry import ZoneRegistry
+from inventory_store import InventoryStore
+from write_ahead_log import WriteAheadLog, SnapshotScheduler
+from work_order_broker import WorkOrderBroker
+from connection_tracker import ConnectionTracker
+from led_controller import LEDController
+from sharding import ShardGroup, RemoteStation, run_processes, ROUTE, DELIVER, STATION_UP, STATION_DOWN
+from metrics import Metrics
+from inventory_table import InventoryTable, DEFAULT_TABLE_PATH
+import hardware
+from log_util import get_logger, setup_logging, DEFAULT_LEVEL
+
+# 연결 처리 엔진
+ENGINE_THREAD = "thread"
+ENGINE_ASYNCIO = "asyncio"
+
+# 재고/작업 지시 로그와 스냅숏을 저장하는 디렉터리
+DEFAULT_DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+SNAPSHOT_INTERVAL = 60.0       # 스냅숏 최대 간격(초)
+SNAPSHOT_MAX_RECORDS = 100000  # 이만큼 로그가 쌓이면 간격과 관계없이 스냅숏
+WORK_ORDER_ACK_TIMEOUT = 600.0  # 이 시간 안에 완료 응답이 없으면 작업 지시 재전송(초)
+REDELIVERY_CHECK_INTERVAL = 1.0
+REAP_INTERVAL = 5.0  # 유휴 연결 확인 주기(초)
+log = get_logger("central")
+
+DEFAULT_METRICS_PORT = 9108  # 지표 HTTP 엔드포인트 (localhost 전용, 0이면 사용 안 함)
+
+# heartbeat 응답은 내용이 항상 같으므로 미리 인코딩
+HEARTBEAT_FRAME = encode_frame(Message(MessageType.HEARTBEAT, SendType.SEND_FROM_CENTRAL))
 
 # 글로벌 변수
-worker_socket = None
-inventory = {"A 구역": 0, "B 구역": 0}  # 각 구역의 재고 상태
-led_pins = {"A 구역": 27, "B 구역": 5}  # 각 구역의 LED 핀
-
-# GPIO 초기화
-GPIO.setwarnings(False)
-GPIO.setmode(GPIO.BCM)
-for pin in led_pins.values():
-    GPIO.setup(pin, GPIO.OUT)
-    GPIO.output(pin, GPIO.LOW)  # 초기 LED 꺼짐 상태
-
-def update_led(zone):
-    """재고 상태에 따라 LED를 켜거나 끄는 함수."""
-    if inventory[zone] < 3:
-        GPIO.output(led_pins[zone], GPIO.HIGH)  # LED 켜기
-        print(f"{zone} LED 켜짐 (재고: {inventory[zone]})")
-    else:
-        GPIO.output(led_pins[zone], GPIO.LOW)  # LED 끄기
-        print(f"{zone} LED 꺼짐 (재고: {inventory[zone]})")
+worker_registry = WorkerRegistry()  # 접속 중인 작업자 스테이션
+zone_registry = ZoneRegistry.load()  # zones.json에 정의된 구역 목록
+inventory = InventoryStore(zone.label for zone in zone_registry)  # 각 구역의 재고 상태
+# 재고 부족 LED (구역별 기준값/히스테리시스는 zones.json, GPIO는 처음 출력할 때 열림)
+leds = LEDController.from_registry(zone_registry, lambda: hardware.get_backend().gpio())
+work_orders = WorkOrderBroker(ack_timeout=WORK_ORDER_ACK_TIMEOUT)  # 완료 응답 전까지 작업 지시 보관
+wal = None  # 재고 변경 로그 (open_state()에서 연결)
+order_wal = None  # 작업 지시 접수/완료 로그
+snapshot_schedulers = []
+background_stop = threading.Event()  # 재전송/유휴 연결 정리 스레드 종료 신호 (close_state()에서 설정)
+# 연결별 마지막 수신 시각. 유휴 연결은 끊고 작업자 라우팅에서도 제거
+connections = ConnectionTracker(IDLE_TIMEOUT, on_reap=lambda conn: reap_connection(conn))
+shards = None  # 여러 프로세스로 실행할 때의 ShardGroup (configure_shard()에서 설정)
+inventory_table = None  # 다른 프로세스가 읽는 공유 재고 표 (open_inventory_table()에서 연결)
+table_slots = {zone.label: zone.index for zone in zone_registry}  # 구역 -> 재고 표 칸 번호
+
+# 처리량/지연 시간 지표
+metrics = Metrics()
+metrics.describe("central_messages_total", "종류별 수신 메시지 수")
+metrics.describe("central_route_latency_us", "수신부터 처리 완료까지 걸린 시간(마이크로초)")
+metrics.describe("central_decode_errors_total", "해석할 수 없는 프레임 수")
+metrics.describe("central_connections_accepted_total", "수락한 연결 수")
+metrics.describe("central_connections_reaped_total", "유휴 상태로 끊은 연결 수")
+metrics.gauge("central_connections", lambda: len(connections), "현재 연결 수")
+metrics.gauge("central_connection_last_seen_timestamp_seconds", connections.last_seen_metrics,
+              "연결별 마지막 수신 시각 (epoch 초)")
+metrics.gauge("central_worker_stations", lambda: len(worker_registry), "등록된 작업자 스테이션 수")
+metrics.gauge("central_work_orders_pending", lambda: work_orders.pending_count(), "전송 대기 중인 작업 지시 수")
+metrics.gauge("central_work_orders_inflight", lambda: work_orders.inflight_count(), "완료 응답을 기다리는 작업 지시 수")
+metrics.gauge("central_wal_pending_records", lambda: len(wal.pending) if wal else 0, "디스크에 쓰기 전인 재고 로그 수")
+metrics.gauge("central_order_wal_pending_records", lambda: len(order_wal.pending) if order_wal else 0,
+              "디스크에 쓰기 전인 작업 지시 로그 수")
+metrics.gauge("central_led_writes", lambda: leds.writes, "실제로 출력한 LED 핀 수")
+metrics.gauge("central_led_skipped", lambda: leds.skipped, "상태가 같아 출력하지 않은 LED 갱신 수")
+
+def publish_inventory(updates):
+    """[(구역, 재고), ...]를 공유 재고 표에 기록. 재고 저장소의 잠금 안에서 호출되므로 칸마다 쓰는 쪽은 하나."""
+    if inventory_table is None:
+        return
+    now = time.time()
+    for zone, quantity in updates:
+        inventory_table.write(table_slots[zone], quantity, now)
+
+def record_inventory(zone, quantity):
+    """재고 저장소의 잠금 안에서 호출: 변경을 로그에 남기고 LED와 공유 재고 표를 갱신."""
+    if wal:
+        wal.append(Message(MessageType.INVENTORY_UPDATE_FROM_WARE, SendType.SEND_FROM_CENTRAL,
+                           zone=zone, quantity=quantity))
+    leds.update(zone, quantity)
+    if inventory_table is not None:
+        inventory_table.write(table_slots[zone], quantity)
+
+def record_inventory_batch(updates):
+    if wal:
+        wal.append(Message(MessageType.INVENTORY_BATCH_FROM_WARE, SendType.SEND_FROM_CENTRAL,
+                           items=updates))
+    leds.update_many(updates)
+    publish_inventory(updates)
+
+def restore_inventory(updates):
+    """복구한 재고로 LED와 공유 재고 표를 맞춤 (로그에는 다시 쓰지 않음)."""
+    leds.update_many(updates)
+    publish_inventory(updates)
+
+def open_inventory_table(path, create=True):
+    """
+    공유 재고 표를 만들거나(create) 샤드 모드에서 부모가 만든 표를 엶.
+    열지 못해도 서버는 계속 동작하고 표만 갱신하지 않음.
+    """
+    global inventory_table
+    try:
+        if create:
+            inventory_table = InventoryTable.create(path, zone_registry.ids)
+        else:
+            inventory_table = InventoryTable.open(path, writable=True)
+    except (OSError, ValueError) as e:
+        log.warning("공유 재고 표를 열지 못함", path=path, error=e)
+        return None
+    log.info("공유 재고 표", path=path, zones=len(inventory_table))
+    return inventory_table
+
+def close_inventory_table():
+    global inventory_table
+    if inventory_table is not None:
+        inventory_table.close()
+        inventory_table = None
+
+def inventory_update_fields(msg):
+    """재고 업데이트 메시지의 (구역, 수량)."""
+    if msg.zone is not None and msg.quantity is not None:
+        return msg.zone, msg.quantity
+    # 구역/수량 필드가 없는 이전 형식 메시지는 문자열을 파싱
+    zone, quantity = msg.content.split(":")
+    return zone.strip(), int(quantity.strip())
 
 def handle_inventory_update(msg):
     try:
-        print(f"Received message content: {msg.content}")
-        zone, quantity = msg.content.split(":")
-        zone = zone.strip()
-        quantity = int(quantity.strip())
-
-        if zone in inventory:
-            inventory[zone] = quantity
-            print(f"{zone} 재고 업데이트: {quantity}")
-            update_led(zone)
+        zone, quantity = inventory_update_fields(msg)
+
+        # "A구역", "A 구역" 등 표기가 달라도 같은 구역으로 처리
+        known_zone = zone_registry.get(zone)
+        if known_zone:
+            zone = known_zone.label
+            inventory.set(zone, quantity, on_change=record_inventory)
+            log.debug("재고 업데이트", zone=zone, quantity=quantity)
         else:
-            print(f"알 수 없는 구역: {zone}")
+            log.warning("알 수 없는 구역", zone=zone)
     except Exception as e:
-        print(f"재고 업데이트 처리 오류: {e}")
+        log.warning("재고 업데이트 처리 오류", error=e, content=msg.content)
+
+
+def handle_inventory_batch(msg):
+    """일괄 재고 업데이트: 모든 구역을 원자적으로 반영하고 LED도 한 번에 갱신."""
+    unknown = []
+    resolved = []
+    for zone, quantity in msg.items or ():
+        known_zone = zone_registry.get(zone)
+        if known_zone:
+            resolved.append((known_zone.label, quantity))
+        else:
+            unknown.append(zone)
 
+    updated = inventory.apply(resolved, on_change=record_inventory_batch)
 
-def send_work_order(target_socket, msg):
-    if target_socket:
+    log.debug("일괄 재고 업데이트", zones=len(updated))
+    if unknown:
+        log.warning("알 수 없는 구역", count=len(unknown), zones=",".join(unknown[:5]))
+
+def send_work_order(msg):
+    """작업 지시를 브로커에 접수하고 대기 중인 작업 지시를 우선순위 순으로 전송."""
+    order = work_orders.submit(msg, msg.priority or 0)
+    log.debug("작업 지시 접수", order_id=order.order_id, priority=order.priority, content=msg.content)
+    dispatch_work_orders()
+    return order
+
+def dispatch_work_orders():
+    return work_orders.dispatch_pending(deliver_work_order)
+
+def deliver_work_order(msg):
+    """구역 담당 또는 미완료 작업이 가장 적은 작업자 스테이션으로 전송. 받은 스테이션 ID를 반환."""
+    station = worker_registry.dispatch(msg)
+    if station:
+        log.debug("작업 지시 전송", order_id=msg.order_id, station=station.station_id)
+        return station.station_id
+    log.info("접속한 작업자 스테이션이 없어 작업 지시 보관", order_id=msg.order_id)
+    return None
+
+def handle_work_order_ack(msg):
+    """작업자가 작업을 완료했다는 응답 처리."""
+    order = work_orders.ack(msg.order_id)
+    if order is None:
+        log.warning("이미 처리되었거나 알 수 없는 작업 지시 완료 응답", order_id=msg.order_id)
+        return
+    if order.station_id:
+        worker_registry.complete(order.station_id)
+    log.debug("작업 지시 완료", order_id=order.order_id, station=order.station_id)
+
+def redeliver_expired_orders(stop_event):
+    """
+    완료 응답 제한 시간이 지난 작업 지시를 주기적으로 다시 전송하는 스레드.
+    한 번 실패해도 (이벤트 루프가 닫힌 연결 등) 로그만 남기고 다음 주기에 다시 시도한다.
+    """
+    while not stop_event.wait(REDELIVERY_CHECK_INTERVAL):
         try:
-            target_socket.send(msg.serialize())
-            print(f"작업 지시 전송: {msg.content}")
+            stations = work_orders.requeue_expired()
+            if stations:
+                for station_id in stations:
+                    worker_registry.complete(station_id)
+                log.warning("완료 응답이 없는 작업 지시 재전송", count=len(stations))
+                dispatch_work_orders()
         except Exception as e:
-            print(f"작업 지시 전송 오류: {e}")
+            log.exception("작업 지시 재전송 오류", error=e)
+
+def register_worker(msg, conn):
+    station_id, zones = parse_identification(msg.content)
+    worker_registry.register(station_id, conn, zones)
+    log.info("작업자 스테이션 등록", station=station_id, zones=",".join(zones) or "전체")
+    if shards is not None:
+        # 다른 샤드도 이 스테이션으로 작업 지시를 보낼 수 있도록 알림
+        shards.broadcast((STATION_UP, station_id, shards.index, zones))
+    # 받을 스테이션이 없어 보관 중이던 작업 지시 전송
+    dispatch_work_orders()
+
+def zone_owner(zone):
+    """구역의 담당 샤드. 알 수 없는 구역이면 이 샤드에서 처리 (경고 로그도 여기서 남김)."""
+    known_zone = zone_registry.get(zone) if zone is not None else None
+    return shards.owner_of(known_zone.id) if known_zone else shards.index
+
+def route_to_shard(msg):
+    """
+    샤드 모드에서 다른 샤드가 담당하는 메시지는 그 샤드로 넘기고, 이 샤드에서 처리할 메시지를 반환 (없으면 None).
+    재고와 작업 지시는 구역의 담당 샤드, 완료 응답은 작업 지시 번호를 부여한 샤드가 처리한다.
+    """
+    if msg.type == MessageType.WORK_ORDER_ACK:
+        owner = msg.order_id % shards.count if msg.order_id is not None else shards.index
+    elif msg.type in (MessageType.INVENTORY_UPDATE_FROM_WARE, MessageType.INVENTORY_UPDATE_FROM_WORKER):
+        try:
+            zone, _ = inventory_update_fields(msg)
+        except ValueError:
+            zone = None
+        owner = zone_owner(zone)
+    elif msg.type == MessageType.INVENTORY_BATCH_FROM_WARE:
+        return split_inventory_batch(msg)
+    elif msg.type == MessageType.WORK_ORDER and msg.send_type != SendType.SEND_FROM_WORKER:
+        owner = zone_owner(msg.zone)
     else:
-        print("작업자 소켓이 설정되지 않았습니다. 작업 지시를 보낼 수 없습니다.")
+        return msg  # heartbeat, 작업자 식별 등 연결에 묶인 메시지
+    if owner == shards.index:
+        return msg
+    shards.send(owner, (ROUTE, msg))
+    return None
 
-def receiver_data(client_socket, addr):
-    global worker_socket
-    print(f"연결 수락됨: {addr}")
+def split_inventory_batch(msg):
+    """일괄 재고 업데이트를 담당 샤드별로 나누어 넘기고, 이 샤드 몫을 반환 (구역 전체의 원자성은 샤드 단위로만 보장)."""
+    groups = {}
+    for zone, quantity in msg.items or ():
+        groups.setdefault(zone_owner(zone), []).append((zone, quantity))
+    local = groups.pop(shards.index, None)
+    if not groups:
+        return msg
+    for owner, items in groups.items():
+        shards.send(owner, (ROUTE, Message(msg.type, msg.send_type, items=items)))
+    return Message(msg.type, msg.send_type, items=local) if local else None
+
+def handle_shard_item(item):
+    """다른 샤드가 보낸 항목을 처리 (샤드 수신 스레드에서 호출)."""
+    kind = item[0]
+    if kind == ROUTE:
+        route_message(item[1], None)
+    elif kind == DELIVER:
+        _, station_id, frame = item
+        station = worker_registry.get(station_id)
+        if station is None or isinstance(station.conn, RemoteStation):
+            # 이미 끊긴 스테이션: 담당 샤드가 STATION_DOWN을 받거나 완료 제한 시간이 지나면 재전송
+            log.info("전달할 스테이션이 이 샤드에 없음", station=station_id)
+            return
+        try:
+            station.conn.sendall(frame)
+        except OSError as e:
+            log.warning("작업 지시 전송 오류", station=station_id, error=e)
+    elif kind == STATION_UP:
+        _, station_id, shard, zones = item
+        worker_registry.register(station_id, RemoteStation(shards, shard, station_id), zones)
+        dispatch_work_orders()
+    elif kind == STATION_DOWN:
+        _, station_id, shard = item
+        station = worker_registry.get(station_id)
+        # 그 사이 다른 샤드로 다시 접속했다면 최신 등록을 유지
+        if station is not None and isinstance(station.conn, RemoteStation) and station.conn.shard == shard:
+            drop_connection(station.conn)
+
+def route_message(msg, conn):
+    """수신한 메시지를 종류에 따라 처리. 스레드/asyncio 엔진이 공통으로 사용."""
+    if shards is not None:
+        msg = route_to_shard(msg)
+        if msg is None:
+            return
+    if msg.type == MessageType.HEARTBEAT:
+        # 마지막 수신 시각은 수신 루프에서 이미 갱신됨. 클라이언트도 연결을 확인할 수 있게 응답
+        # (conn은 연결별 CoalescingWriter/AsyncioConnection이라 재전송 스레드 등의 프레임과 섞이지 않음)
+        conn.sendall(HEARTBEAT_FRAME)
+    elif msg.type == MessageType.WORK_ORDER_ACK:
+        handle_work_order_ack(msg)
+    elif msg.send_type == SendType.SEND_FROM_WORKER:
+        register_worker(msg, conn)
+
+    elif msg.type in (MessageType.INVENTORY_UPDATE_FROM_WARE, MessageType.INVENTORY_UPDATE_FROM_WORKER):
+        handle_inventory_update(msg)
+    elif msg.type == MessageType.INVENTORY_BATCH_FROM_WARE:
+        handle_inventory_batch(msg)
+    elif msg.type == MessageType.WORK_ORDER:
+        send_work_order(msg)
+    else:
+        log.warning("알 수 없는 메시지 수신", type=msg.type, content=msg.content)
+
+def process_frames(frames, conn):
+    """
+    수신 버퍼(FrameBuffer)에 완성된 메시지를 꺼내 처리하고 지표를 기록.
+    지연 시간은 데이터를 받은 시점부터 메시지 처리가 끝날 때까지.
+    """
+    received_at = time.perf_counter()
+    try:
+        messages = frames.messages()
+    except Exception:
+        metrics.count("central_decode_errors_total")
+        raise
+    for msg in messages:
+        route_message(msg, conn)
+        labels = (("type", msg.type.name), ("send_type", msg.send_type.name))
+        metrics.count("central_messages_total", labels)
+        metrics.observe("central_route_latency_us", labels, time.perf_counter() - received_at)
+
+def reap_connection(conn):
+    metrics.count("central_connections_reaped_total")
+    drop_connection(conn)
+
+def receiver_data(client_socket, addr, buffer_size=BUFFER_SIZE, flush_policy=DEFAULT_FLUSH_POLICY):
+    log.info("연결 수락됨", addr=addr)
+    # 미리 할당한 버퍼에 recv_into()로 받아 복사 없이 해석
+    reader = ConnectionReader(client_socket, buffer_size)
+
+    def abort(*_):
+        """shutdown으로 recv()를 깨워 이 스레드가 끝나도록 함 (유휴 연결 정리, 지연 전송 실패 시)."""
+        try:
+            client_socket.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+    # 이 연결로 보내는 응답/작업 지시는 모아서 전송. 라우팅과 정리에는 소켓 대신 이 객체를 씀
+    conn = CoalescingWriter(client_socket, flush_policy, on_error=abort)
+    tracked = connections.register(conn, addr, close=abort)
 
     while True:
         try:
-            data = client_socket.recv(1024)
-            if not data:
-                print(f"클라이언트 연결 종료: {addr}")
+            if not reader.recv():
+                log.info("클라이언트 연결 종료", addr=addr)
                 break
 
-            msg = Message.deserialize(data)
+            tracked.touch()
+            process_frames(reader, conn)
+        except Exception as e:
+            log.warning("데이터 수신 오류", addr=addr, error=e)
+            break
+
+    connections.unregister(conn)
+    drop_connection(conn)
+    try:
+        conn.flush()
+    except OSError:
+        pass
+    client_socket.close()
+
+def drop_connection(conn):
+    """끊어진 연결이 작업자 스테이션이었다면 라우팅 대상에서 제거."""
+    station = worker_registry.unregister_connection(conn)
+    if station:
+        log.info("작업자 스테이션 해제", station=station.station_id)
+        if shards is not None and not isinstance(conn, RemoteStation):
+            shards.broadcast((STATION_DOWN, station.station_id, shards.index))
+        # 완료되지 않은 작업 지시는 다른 스테이션으로
+        if work_orders.requeue_station(station.station_id):
+            dispatch_work_orders()
 
-            if msg.send_type == SendType.SEND_FROM_WORKER:
-                worker_socket = client_socket
-                print("작업자 소켓 설정 완료")  # 작업자 소켓 설정
+class AsyncioConnection:
+    """
+    asyncio transport를 소켓처럼 쓰기 위한 어댑터.
+    send_message()가 호출하는 sendall()은 프레임을 모아 두었다가 flush_policy에 따라
+    writelines() 한 번으로 보낸다 (latency가 0이면 현재 루프 차례가 끝날 때).
+    asyncio는 TCP 연결에 TCP_NODELAY를 기본으로 켜므로 묶음 처리는 이 객체가 전담한다.
+    재전송 스레드 등 이벤트 루프 밖에서 호출되면 루프 스레드로 넘겨서 처리.
+    """
+    def __init__(self, transport, flush_policy=DEFAULT_FLUSH_POLICY):
+        self.transport = transport
+        self.flush_policy = flush_policy
+        self.pending = []
+        self.pending_bytes = 0
+        self.loop = asyncio.get_running_loop()
+        self.loop_thread = threading.get_ident()
 
-            elif msg.type in (MessageType.INVENTORY_UPDATE_FROM_WARE, MessageType.INVENTORY_UPDATE_FROM_WORKER):
-                handle_inventory_update(msg)
-            elif msg.type == MessageType.WORK_ORDER:
-                send_work_order(worker_socket, msg)
+    def sendall(self, data):
+        if self.transport.is_closing():
+            raise ConnectionResetError("이미 닫힌 연결")
+        if threading.get_ident() == self.loop_thread:
+            self._queue(data)
+        else:
+            self.loop.call_soon_threadsafe(self._queue, data)
+
+    def _queue(self, data):
+        if not self.pending:
+            if self.flush_policy.latency:
+                self.loop.call_later(self.flush_policy.latency, self.flush)
             else:
-                print(f"알 수 없는 메시지 수신: {msg.content}")
+                self.loop.call_soon(self.flush)
+        self.pending.append(data)
+        self.pending_bytes += len(data)
+        if self.pending_bytes >= self.flush_policy.max_bytes:
+            self.flush()
+
+    def flush(self):
+        if not self.pending:
+            return
+        pending, self.pending, self.pending_bytes = self.pending, [], 0
+        if not self.transport.is_closing():
+            self.transport.writelines(pending)
+
+class CentralProtocol(asyncio.BufferedProtocol):
+    """
+    asyncio 엔진의 연결 하나.
+    이벤트 루프가 FrameBuffer의 빈 공간에 수신 데이터를 바로 쓰고(BufferedProtocol),
+    완성된 프레임은 복사 없이 해석해 처리.
+    """
+    def __init__(self, buffer_size=BUFFER_SIZE, flush_policy=DEFAULT_FLUSH_POLICY):
+        self.frames = FrameBuffer(buffer_size)
+        self.flush_policy = flush_policy
+        self.transport = None
+        self.conn = None
+        self.tracked = None
+        self.addr = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self.addr = transport.get_extra_info("peername")
+        log.info("연결 수락됨", addr=self.addr)
+        self.conn = AsyncioConnection(transport, self.flush_policy)
+        metrics.count("central_connections_accepted_total")
+        # 정리 스레드에서 호출되므로 루프 스레드에서 transport를 끊게 함 (connection_lost에서 정리됨)
+        loop = asyncio.get_running_loop()
+        self.tracked = connections.register(self.conn, self.addr, close=lambda: loop.call_soon_threadsafe(transport.abort))
+
+    def get_buffer(self, sizehint):
+        return self.frames.get_buffer(sizehint)
+
+    def buffer_updated(self, nbytes):
+        self.frames.buffer_updated(nbytes)
+        self.tracked.touch()
+        try:
+            process_frames(self.frames, self.conn)
         except Exception as e:
-            print(f"데이터 수신 오류: {e}")
-            break
+            log.warning("데이터 수신 오류", addr=self.addr, error=e)
+            self.transport.abort()
 
-if __name__ == "__main__":
-    central_socket = None
-    try:
-        central_socket = create_and_bind_socket(CENTRAL_SERVER_PORT)
-        print("서버가 시작되었습니다.")
+    def eof_received(self):
+        log.info("클라이언트 연결 종료", addr=self.addr)
+        return False  # transport를 닫음
+
+    def connection_lost(self, exc):
+        if exc is not None:
+            log.warning("데이터 수신 오류", addr=self.addr, error=exc)
+        connections.unregister(self.conn)
+        drop_connection(self.conn)
 
+def run_threaded_server(port, backlog, buffer_size=BUFFER_SIZE, flush_policy=DEFAULT_FLUSH_POLICY, reuse_port=False):
+    """연결마다 스레드를 하나씩 띄우는 기존 방식의 서버."""
+    central_socket = create_and_bind_socket(port, backlog, nodelay=flush_policy.low_latency, reuse_port=reuse_port)
+    log.info("서버가 시작되었습니다.", engine=ENGINE_THREAD, port=port)
+    try:
         while True:
             try:
                 client_conn, addr = central_socket.accept()
-                threading.Thread(target=receiver_data, args=(client_conn, addr)).start()
+                metrics.count("central_connections_accepted_total")
+                threading.Thread(target=receiver_data, args=(client_conn, addr, buffer_size, flush_policy), daemon=True).start()
             except Exception as e:
-                print(f"연결 처리 오류: {e}")
+                log.error("연결 처리 오류", error=e)
+    finally:
+        central_socket.close()
+        log.info("중앙 서버 소켓 닫힘.")
+
+async def run_asyncio_server(port, backlog, buffer_size=BUFFER_SIZE, flush_policy=DEFAULT_FLUSH_POLICY,
+                             reuse_port=False):
+    """이벤트 루프 하나로 모든 연결을 처리하는 서버. 유휴 연결 수천 개를 스레드 없이 유지."""
+    raise_open_file_limit()
+    central_socket = create_and_bind_socket(port, backlog, reuse_port=reuse_port)
+    central_socket.setblocking(False)
+    loop = asyncio.get_running_loop()
+    server = await loop.create_server(lambda: CentralProtocol(buffer_size, flush_policy), sock=central_socket)
+    log.info("서버가 시작되었습니다.", engine=ENGINE_ASYNCIO, port=port)
+    async with server:
+        await server.serve_forever()
+
+def open_state(data_dir):
+    """스냅숏과 로그 꼬리로 재고와 미완료 작업 지시를 복구하고 로그 기록을 시작."""
+    global wal, order_wal
+    started = time.perf_counter()
+    wal = WriteAheadLog(data_dir)
+    recovered, tail = wal.recover()
+
+    # 복구된 값으로 재고, LED, 공유 재고 표를 한 번에 맞춤 (로그에 다시 쓰지 않음)
+    # 샤드 모드에서는 스냅숏에 담긴 다른 샤드의 구역 값은 쓰지 않음 (그 구역의 표 칸은 담당 샤드만 씀)
+    restored = [(zone, quantity) for zone, quantity in recovered.items()
+                if zone in inventory and (shards is None or shards.is_local(zone_registry.get(zone).id))]
+    inventory.apply(restored, on_change=restore_inventory)
+
+    order_wal = WriteAheadLog(os.path.join(data_dir, "orders"))
+    _, order_tail = order_wal.recover()
+    pending_orders = work_orders.recover(order_tail)
+    work_orders.wal = order_wal
+    log.info("상태 복구 완료", zones=len(restored), replayed=len(tail) + len(order_tail),
+             pending_orders=pending_orders, ms=round((time.perf_counter() - started) * 1000, 1))
+
+    wal.start()
+    order_wal.start()
+    snapshot_schedulers.append(SnapshotScheduler(wal, take_snapshot, SNAPSHOT_INTERVAL, SNAPSHOT_MAX_RECORDS))
+    snapshot_schedulers.append(SnapshotScheduler(order_wal, work_orders.compact, SNAPSHOT_INTERVAL, SNAPSHOT_MAX_RECORDS))
+    for scheduler in snapshot_schedulers:
+        scheduler.start()
+
+def configure_shard(group):
+    """
+    이 프로세스를 샤드 group.index로 설정: 담당 구역의 LED만 제어하고,
+    작업 지시 번호는 샤드 번호로 나머지가 같은 것만 부여.
+    """
+    global shards
+    shards = group
+    work_orders.partition_ids(group.index, group.count)
+    leds.retain({zone.label for zone in zone_registry if group.is_local(zone.id)})
+
+def take_snapshot():
+    """재고 잠금을 잡은 시점의 값과 로그 위치로 스냅숏을 저장."""
+    values, (seq, old_segments) = inventory.snapshot_with(wal.begin_snapshot)
+    wal.finish_snapshot(seq, values, old_segments)
+
+def close_state():
+    """
+    종료 시 마지막 스냅숏을 남겨 다음 시작 때 재생할 로그를 없앰.
+    open_state()가 기록을 시작하기 전에 실패했으면 스냅숏 없이 닫기만 함 (원래 오류를 가리지 않도록).
+    """
+    background_stop.set()
+    for scheduler in snapshot_schedulers:
+        scheduler.stop()
+    snapshot_schedulers.clear()
+    if wal:
+        if wal.running:
+            take_snapshot()
+        wal.close()
+    if order_wal:
+        if order_wal.running:
+            work_orders.compact()
+        order_wal.close()
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="중앙 관리 서버")
+    parser.add_argument("--engine", choices=(ENGINE_THREAD, ENGINE_ASYNCIO), default=ENGINE_THREAD,
+                        help="연결 처리 방식 (기본값: thread)")
+    parser.add_argument("--port", type=int, default=CENTRAL_SERVER_PORT)
+    parser.add_argument("--backlog", type=int, default=DEFAULT_BACKLOG, help="listen() 대기열 크기")
+    parser.add_argument("--recv-buffer", type=int, default=BUFFER_SIZE,
+                        help="연결별 수신 버퍼 크기(바이트). 더 큰 프레임은 필요할 때만 버퍼를 늘려 받음")
+    parser.add_argument("--flush-latency-ms", type=float, default=DEFAULT_FLUSH_POLICY.latency * 1000,
+                        help="보낼 메시지를 모으는 최대 시간(밀리초). 0이면 모으지 않고 바로 전송")
+    parser.add_argument("--flush-bytes", type=int, default=DEFAULT_FLUSH_BYTES,
+                        help="이만큼(바이트) 모이면 대기 시간과 관계없이 바로 전송")
+    parser.add_argument("--low-latency", action="store_true",
+                        help="TCP_NODELAY를 켜고 모으지 않고 바로 전송 (시스템 호출은 늘어남)")
+    parser.add_argument("--data-dir", default=DEFAULT_DATA_DIR, help="재고 로그/스냅숏 저장 위치")
+    parser.add_argument("--idle-timeout", type=float, default=IDLE_TIMEOUT,
+                        help="이 시간(초) 동안 heartbeat를 포함해 아무것도 받지 못한 연결을 끊음")
+    parser.add_argument("--metrics-port", type=int, default=DEFAULT_METRICS_PORT,
+                        help="지표 HTTP 포트 (127.0.0.1:포트/metrics, 0이면 사용 안 함)")
+    parser.add_argument("--hardware", choices=hardware.BACKENDS, default=hardware.DEFAULT_BACKEND,
+                        help="LED 제어 방식 (pi: 실제 GPIO, mock: 가짜 장치, noop: 하드웨어 없음)")
+    parser.add_argument("--log-level", default=DEFAULT_LEVEL, help="로그 레벨 (DEBUG, INFO, WARNING, ERROR)")
+    parser.add_argument("--reap-interval", type=float, default=REAP_INTERVAL, help="유휴 연결 확인 주기(초)")
+    parser.add_argument("--inventory-table", default=DEFAULT_TABLE_PATH,
+                        help="다른 프로세스가 읽는 공유 재고 표 파일 (mmap, 빈 문자열이면 사용 안 함)")
+    parser.add_argument("--processes", type=int, default=1,
+                        help="샤드 프로세스 수 (SO_REUSEPORT로 같은 포트 공유, 구역별 담당 샤드가 처리). "
+                             "샤드마다 --data-dir/shard-N에 상태를 저장하므로 수를 바꾸면 이전 재고는 복구되지 않음")
+    return parser.parse_args()
+
+def run_central(args, data_dir, metrics_port, reuse_port=False, on_ready=None):
+    """상태를 복구하고 백그라운드 스레드를 띄운 뒤 선택한 엔진으로 서버를 실행. 끝나면 상태를 저장."""
+    global background_stop
+    flush_policy = FlushPolicy(args.flush_latency_ms / 1000, args.flush_bytes, args.low_latency)
+    background_stop = threading.Event()
+    try:
+        open_state(data_dir)
+        threading.Thread(target=redeliver_expired_orders, args=(background_stop,), name="redelivery", daemon=True).start()
+        connections.idle_timeout = args.idle_timeout
+        if metrics_port:
+            metrics.serve(metrics_port)
+            log.info("지표 엔드포인트", url=f"http://127.0.0.1:{metrics_port}/metrics")
+        threading.Thread(target=connections.run_reaper, args=(background_stop, args.reap_interval), name="reaper",
+                         daemon=True).start()
+        if on_ready is not None:
+            on_ready()
+        if args.engine == ENGINE_ASYNCIO:
+            asyncio.run(run_asyncio_server(args.port, args.backlog, args.recv_buffer, flush_policy, reuse_port))
+        else:
+            run_threaded_server(args.port, args.backlog, args.recv_buffer, flush_policy, reuse_port)
+    except KeyboardInterrupt:
+        log.info("프로그램 종료 요청.")
     except Exception as main_error:
-        print(f"메인 함수 에러: {main_error}")
+        log.exception("메인 함수 에러", error=main_error)
     finally:
-        if central_socket:
-            central_socket.close()
-            print("중앙 서버 소켓 닫힘.")
-        GPIO.cleanup()
+        close_state()
+        hardware.get_backend().cleanup()
+
+def run_shard(index, inboxes, args):
+    """샤드 프로세스의 진입점. 지표 포트는 샤드마다 --metrics-port + 샤드 번호."""
+    setup_logging(args.log_level)
+    hardware.use_backend(args.hardware)
+    group = ShardGroup(index, inboxes)
+    configure_shard(group)
+    if args.inventory_table:
+        open_inventory_table(args.inventory_table, create=False)
+    log.info("샤드 시작", shard=index, processes=group.count, pid=os.getpid())
+    # 복구가 끝난 뒤에 다른 샤드가 넘긴 메시지를 처리
+    run_central(args, os.path.join(args.data_dir, f"shard-{index}"),
+                args.metrics_port + index if args.metrics_port else 0,
+                reuse_port=True, on_ready=lambda: group.start(handle_shard_item))
+
+if __name__ == "__main__":
+    args = parse_args()
+    setup_logging(args.log_level)
+    if args.processes > 1:
+        # 재고 표는 부모가 한 번 만들고 샤드들은 각자 담당 구역의 칸만 씀
+        if args.inventory_table:
+            open_inventory_table(args.inventory_table)
+            close_inventory_table()
+        run_processes(args.processes, run_shard, (args,))
+    else:
+        hardware.use_backend(args.hardware)
+        if args.inventory_table:
+            open_inventory_table(args.inventory_table)
+        run_central(args, args.data_dir, args.metrics_port)
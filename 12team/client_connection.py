@@ -0,0 +1,246 @@
+import random
+import socket
+import threading
+import time
+from collections import deque
+from common import Message, MessageType, SendType, ConnectionReader, encode_frame, BUFFER_SIZE, HEARTBEAT_INTERVAL, IDLE_TIMEOUT
+from socket_util import create_and_connect_socket
+from socket_writer import CoalescingWriter, DEFAULT_FLUSH_POLICY
+from log_util import get_logger
+
+log = get_logger("connection")
+
+INITIAL_BACKOFF = 0.5    # 첫 재접속 대기 상한(초)
+MAX_BACKOFF = 30.0       # 재접속 대기 상한의 최댓값(초)
+DEFAULT_OUTBOX_SIZE = 4096  # 연결이 끊긴 동안 보관할 최대 프레임 수
+
+def close_socket(sock):
+    """다른 스레드에서 recv() 중이어도 깨어나도록 shutdown 후 닫음."""
+    try:
+        sock.shutdown(socket.SHUT_RDWR)
+    except OSError:
+        pass
+    sock.close()
+
+class ResilientConnection:
+    """
+    끊기면 스스로 다시 접속하는 중앙 서버 연결.
+    send_message()/send_messages()가 호출하는 sendall()을 제공하므로 소켓 대신 그대로 쓸 수 있다.
+
+    - 재접속은 지수 백오프에 지터를 섞어 (여러 노드가 동시에 몰리지 않도록) 시도한다.
+      접속은 됐지만 올바른 메시지를 하나도 받지 못하고 끊긴 경우(잘못된 프레임 등)도 실패로 보고 백오프한다.
+    - 접속할 때마다 hello 메시지(작업자 식별 등)를 먼저 보낸다.
+    - 끊긴 동안 보낸 메시지는 크기가 제한된 outbox에 쌓아 두었다가 재접속 후 한 번에 전송한다.
+      outbox가 가득 차면 가장 오래된 메시지부터 버린다.
+    - 보낼 프레임은 CoalescingWriter로 flush_policy에 따라 묶어서 보낸다.
+      전송에 실패한 프레임은 outbox로 옮겨 재접속 후 다시 보낸다.
+    - 수신도 이 객체의 스레드가 맡아, 받은 메시지마다 on_message(msg)를 호출한다.
+    - heartbeat_interval 동안 보낸 것이 없으면 heartbeat를 보내고,
+      idle_timeout 동안 받은 것이 없으면 (중앙 서버 전원 꺼짐 등) 끊고 다시 접속한다.
+    """
+    def __init__(self, ip, port, hello=(), on_message=None, max_outbox=DEFAULT_OUTBOX_SIZE,
+                 initial_backoff=INITIAL_BACKOFF, max_backoff=MAX_BACKOFF,
+                 heartbeat_interval=HEARTBEAT_INTERVAL, idle_timeout=IDLE_TIMEOUT, flush_policy=DEFAULT_FLUSH_POLICY):
+        self.ip = ip
+        self.port = port
+        self.hello = list(hello)
+        self.on_message = on_message
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.heartbeat_interval = heartbeat_interval
+        self.idle_timeout = idle_timeout
+        self.flush_policy = flush_policy
+        self.heartbeat_frame = encode_frame(Message(MessageType.HEARTBEAT, self._send_type()))
+        self.last_sent = 0.0
+        self.last_received = 0.0
+        self.lock = threading.Lock()
+        self.sock = None
+        self.writer = None
+        self.outbox = deque(maxlen=max_outbox)
+        self.dropped = 0  # outbox가 넘쳐 버린 프레임 수
+        self.attempt = 0  # 연속 실패 횟수 (백오프 계산용, 올바른 메시지를 받으면 0)
+        self.connected = threading.Event()
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self._run, name="central-connection", daemon=True)
+        self.thread.start()
+        return self
+
+    def close(self):
+        self.stop_event.set()
+        with self.lock:
+            sock, self.sock = self.sock, None
+            writer, self.writer = self.writer, None
+        if writer is not None:
+            try:
+                writer.flush()  # 모아 둔 프레임을 보내고 닫음
+            except OSError:
+                pass
+        if sock is not None:
+            close_socket(sock)
+        if self.thread is not None and self.thread is not threading.current_thread():
+            self.thread.join()
+
+    def _send_type(self):
+        """hello 메시지와 같은 발신자 종류로 heartbeat를 보냄 (없으면 창고)."""
+        return self.hello[0].send_type if self.hello else SendType.SEND_FROM_WAREHOUSE
+
+    def wait_connected(self, timeout=None):
+        return self.connected.wait(timeout)
+
+    def sendall(self, data):
+        """연결되어 있으면 writer로 보내고, 아니면 outbox에 보관 (예외를 내지 않음)."""
+        with self.lock:
+            if self.writer is not None:
+                try:
+                    self.writer.sendall(data)
+                    self.last_sent = time.monotonic()
+                except OSError as e:
+                    # 보내지 못한 프레임(data 포함)은 _lose()가 outbox로 옮김
+                    log.warning("중앙 서버 전송 오류", error=e)
+                    self._lose(self.sock)
+                return
+            self._store(data)
+
+    def _store(self, data):
+        if len(self.outbox) == self.outbox.maxlen:
+            self.dropped += 1
+        self.outbox.append(bytes(data))
+
+    def _lose(self, sock):
+        """(lock을 잡은 상태에서) 현재 연결을 끊긴 것으로 표시. 수신 스레드가 재접속함."""
+        if self.sock is sock:
+            for frame in self.writer.take_unsent():
+                if frame is not self.heartbeat_frame:
+                    self._store(frame)
+            self.sock = None
+            self.writer = None
+            self.connected.clear()
+            close_socket(sock)
+
+    def _on_write_error(self, writer):
+        """지연 전송(FlushTimer 스레드)이 실패했을 때 호출."""
+        with self.lock:
+            if self.writer is writer:
+                self._lose(self.sock)
+
+    def _connect(self):
+        """백오프하며 접속을 반복. 성공하면 hello와 outbox를 한 번에 보내고 소켓을 반환."""
+        while not self.stop_event.is_set():
+            try:
+                sock = create_and_connect_socket(self.ip, self.port, nodelay=self.flush_policy.low_latency)
+            except OSError as e:
+                delay = self._backoff()
+                log.warning("중앙 서버 접속 실패", error=e, retry_in=round(delay, 1))
+                self.stop_event.wait(delay)
+                continue
+
+            with self.lock:
+                pending = len(self.outbox)
+                try:
+                    sock.sendall(b"".join([encode_frame(msg) for msg in self.hello] + list(self.outbox)))
+                except OSError as e:
+                    sock.close()
+                    log.warning("재접속 직후 전송 오류", error=e)
+                    continue
+                self.outbox.clear()
+                # recv()가 heartbeat 주기마다 깨어나 연결 상태를 확인하도록
+                sock.settimeout(self.heartbeat_interval)
+                self.last_sent = self.last_received = time.monotonic()
+                self.sock = sock
+                self.writer = CoalescingWriter(sock, self.flush_policy, on_error=self._on_write_error)
+                self.connected.set()
+                if self.dropped:
+                    log.warning("연결이 끊긴 동안 outbox가 가득 차 메시지를 버림", dropped=self.dropped)
+                    self.dropped = 0
+            log.info("중앙 서버에 연결 성공", flushed=pending)
+            return sock
+        return None
+
+    def _backoff(self):
+        """다음 재시도까지 기다릴 시간 (지수 백오프 + 지터)."""
+        delay = random.uniform(0, min(self.max_backoff, self.initial_backoff * (2 ** self.attempt)))
+        self.attempt += 1
+        return delay
+
+    def _run(self):
+        while not self.stop_event.is_set():
+            sock = self._connect()
+            if sock is None:
+                break
+            healthy = False
+            try:
+                healthy = self._receive(sock)
+            except Exception as e:
+                # 어떤 오류로 끝나도 스레드가 죽지 않고 재접속하도록
+                log.exception("중앙 서버 수신 오류", error=e)
+            finally:
+                with self.lock:
+                    self._lose(sock)
+            if self.stop_event.is_set():
+                break
+            if healthy:
+                log.warning("중앙 서버와의 연결이 끊어졌습니다. 다시 연결을 시도합니다.")
+            else:
+                delay = self._backoff()
+                log.warning("중앙 서버와의 연결이 정상 메시지 없이 끊어짐", retry_in=round(delay, 1))
+                self.stop_event.wait(delay)
+
+    def _send_heartbeat(self, sock):
+        """현재 연결로만 heartbeat 전송 (끊긴 동안 outbox에 쌓지 않음). 실패하면 False."""
+        with self.lock:
+            if self.sock is not sock:
+                return False
+            try:
+                self.writer.sendall(self.heartbeat_frame)
+                self.writer.flush()
+            except OSError:
+                return False
+            self.last_sent = time.monotonic()
+            return True
+
+    def _receive(self, sock):
+        """
+        연결이 끊길 때까지 받아 처리. 올바른 메시지를 하나라도 받았으면 True (재접속 백오프 초기화).
+        해석할 수 없는 프레임은 어떤 오류든 연결 고장으로 보고 끊는다 (스트림 위치를 더 이상 믿을 수 없음).
+        """
+        reader = ConnectionReader(sock, BUFFER_SIZE)
+        healthy = False
+        while True:
+            try:
+                received = reader.recv()
+            except socket.timeout:
+                received = None
+            except OSError:
+                return healthy
+            now = time.monotonic()
+            if received is None:
+                if now - self.last_received > self.idle_timeout:
+                    log.warning("중앙 서버로부터 수신 없음", idle_seconds=self.idle_timeout)
+                    return healthy
+            elif not received:
+                return healthy
+            else:
+                self.last_received = now
+            if now - self.last_sent >= self.heartbeat_interval and not self._send_heartbeat(sock):
+                return healthy
+            if received is None:
+                continue
+            try:
+                messages = reader.messages()
+            except Exception as e:
+                log.error("잘못된 프레임 수신", error=e)
+                return healthy
+            if messages and not healthy:
+                healthy = True
+                self.attempt = 0
+            for msg in messages:
+                if msg.type == MessageType.HEARTBEAT:
+                    continue
+                if self.on_message is not None:
+                    try:
+                        self.on_message(msg)
+                    except Exception as e:
+                        log.exception("수신 메시지 처리 오류", error=e)
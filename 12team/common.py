@@ -1,37 +1,349 @@
 import pickle
+import struct
 import binascii
 from enum import Enum
 
 
-BUFFER_SIZE = 256
+BUFFER_SIZE = 8192  # 연결별 수신 버퍼 기본 크기(바이트). 이보다 큰 프레임을 받으면 그때만 늘림
 
 class MessageType(Enum):
     WORK_ORDER = 1
     INVENTORY_UPDATE_FROM_WARE = 2
     INVENTORY_UPDATE_FROM_WORKER = 3
+    INVENTORY_BATCH_FROM_WARE = 4  # 여러 구역의 재고를 한 메시지로 전송
+    WORK_ORDER_ACK = 5             # 작업자가 작업 지시를 완료했음을 알림 (order_id)
+    HEARTBEAT = 6                  # 연결 유지 확인 (클라이언트가 보내면 중앙 서버가 그대로 응답)
 
 class SendType(Enum):
     SEND_FROM_WAREHOUSE = 1
     SEND_FROM_WORKER = 2
     SEND_FROM_CENTRAL = 3
 
+# 직렬화 방식: 고정 레이아웃 바이너리(기본) 또는 pickle(호환용)
+CODEC_BINARY = "binary"
+CODEC_PICKLE = "pickle"
+DEFAULT_CODEC = CODEC_BINARY
+# 현재 코덱 (set_codec()으로 변경). pickle 프레임은 이 값이 CODEC_PICKLE일 때만 받아들임:
+# pickle.loads()는 상대가 보낸 임의 코드를 실행할 수 있으므로 구버전 노드와 통신할 때만 명시적으로 켠다
+current_codec = DEFAULT_CODEC
+
+def set_codec(codec):
+    """보낼 때 쓰는 기본 코덱을 정하고, CODEC_PICKLE이면 pickle 프레임 수신도 허용."""
+    global current_codec
+    if codec not in (CODEC_BINARY, CODEC_PICKLE):
+        raise ValueError(f"알 수 없는 코덱: {codec}")
+    current_codec = codec
+
 class Message:
-    def __init__(self, type, send_type, content):
+    # 이전 버전에서 pickle로 보낸 메시지에는 없는 필드이므로 클래스 기본값을 둔다
+    zone = None
+    quantity = None
+    items = None
+    order_id = None
+    priority = None
+
+    def __init__(self, type, send_type, content=None, zone=None, quantity=None, items=None,
+                 order_id=None, priority=None):
         self.type = type
         self.send_type = send_type
+        self.zone = zone
+        self.quantity = quantity
+        self.items = items  # 일괄 메시지의 [(구역, 수량), ...]
+        self.order_id = order_id  # 중앙 서버가 부여한 작업 지시 번호
+        self.priority = priority  # 작업 지시 우선순위 (클수록 먼저)
+        if content is None and zone is not None:
+            content = f"{zone}: {quantity}"
         self.content = content
 
-    def serialize(self):
-        data = pickle.dumps(self)
-        # print(f"직렬화 후 데이터: {binascii.hexlify(data)}")
+    def serialize(self, codec=None):
         """Serialize the Message object to bytes."""
-        return pickle.dumps(self)
+        if (codec or current_codec) == CODEC_PICKLE:
+            return pickle.dumps(self, protocol=pickle.HIGHEST_PROTOCOL)
+        return encode_binary(self)
 
     @staticmethod
     def deserialize(data):
         # print(f"역직렬화 전 데이터: {binascii.hexlify(data)}")
-        """Deserialize bytes to a Message object."""
-        return pickle.loads(data)
+        """Deserialize bytes to a Message object. 잘못된 데이터는 모두 ValueError."""
+        if not data:
+            raise ValueError("빈 메시지")
+        # pickle 프로토콜 2 이상은 항상 0x80으로 시작 (바이너리 레이아웃의 type 값과 겹치지 않음)
+        if data[0] == PICKLE_MARKER:
+            if current_codec != CODEC_PICKLE:
+                raise ValueError("pickle 메시지는 허용되지 않음 (set_codec(CODEC_PICKLE)로 구버전 호환을 켠 경우만)")
+            return pickle.loads(data)
+        return decode_binary(data)
+
+# 바이너리 레이아웃: type(1) | send_type(1) | flags(1) | [zone] | [quantity] | [content] | [items]
+#                  | [order_id] | [priority]
+PICKLE_MARKER = 0x80
+MESSAGE_HEADER = struct.Struct("!BBB")
+ZONE_LENGTH = struct.Struct("!B")
+QUANTITY = struct.Struct("!i")
+CONTENT_LENGTH = struct.Struct("!H")
+ITEM_COUNT = struct.Struct("!H")
+ORDER_ID = struct.Struct("!Q")
+PRIORITY = struct.Struct("!H")
+MAX_BATCH_ITEMS = 0xFFFF
+MAX_ZONE_BYTES = 0xFF       # 구역 이름 최대 길이 (UTF-8 바이트)
+MAX_CONTENT_BYTES = 0xFFFF  # content 최대 길이 (UTF-8 바이트)
+
+FLAG_ZONE = 0x01
+FLAG_QUANTITY = 0x02
+FLAG_CONTENT = 0x04
+FLAG_ITEMS = 0x08
+FLAG_ORDER_ID = 0x10
+FLAG_PRIORITY = 0x20
+
+# Enum 생성자 호출 대신 값 -> 멤버 사전 조회
+MESSAGE_TYPES = {member.value: member for member in MessageType}
+SEND_TYPES = {member.value: member for member in SendType}
+
+def encode_zone(zone):
+    zone = zone.encode("utf-8")
+    if len(zone) > MAX_ZONE_BYTES:
+        raise ValueError(f"구역 이름이 너무 김: {len(zone)}바이트 (최대 {MAX_ZONE_BYTES})")
+    return ZONE_LENGTH.pack(len(zone)) + zone
+
+def encode_binary(msg):
+    """Message를 고정 레이아웃 바이너리로 변환. 필드 값이 레이아웃 범위를 넘으면 ValueError."""
+    try:
+        return _encode_binary(msg)
+    except struct.error as e:
+        # 수량/작업 지시 번호/우선순위가 필드 크기를 넘는 경우
+        raise ValueError(f"바이너리로 표현할 수 없는 값: {e}") from e
+
+def _encode_binary(msg):
+    flags = 0
+    parts = []
+
+    if msg.zone is not None:
+        flags |= FLAG_ZONE
+        parts.append(encode_zone(msg.zone))
+    if msg.quantity is not None:
+        flags |= FLAG_QUANTITY
+        parts.append(QUANTITY.pack(msg.quantity))
+    # zone/quantity로 복원 가능한 content는 보내지 않음
+    if msg.content is not None and not (
+        msg.zone is not None and msg.content == f"{msg.zone}: {msg.quantity}"
+    ):
+        flags |= FLAG_CONTENT
+        content = msg.content.encode("utf-8")
+        if len(content) > MAX_CONTENT_BYTES:
+            raise ValueError(f"content가 너무 김: {len(content)}바이트 (최대 {MAX_CONTENT_BYTES})")
+        parts.append(CONTENT_LENGTH.pack(len(content)))
+        parts.append(content)
+    if msg.items is not None:
+        flags |= FLAG_ITEMS
+        if len(msg.items) > MAX_BATCH_ITEMS:
+            raise ValueError(f"일괄 메시지 항목 수 초과: {len(msg.items)}")
+        parts.append(ITEM_COUNT.pack(len(msg.items)))
+        for zone, quantity in msg.items:
+            parts.append(encode_zone(zone))
+            parts.append(QUANTITY.pack(quantity))
+    if msg.order_id is not None:
+        flags |= FLAG_ORDER_ID
+        parts.append(ORDER_ID.pack(msg.order_id))
+    if msg.priority is not None:
+        flags |= FLAG_PRIORITY
+        parts.append(PRIORITY.pack(msg.priority))
+
+    return MESSAGE_HEADER.pack(msg.type.value, msg.send_type.value, flags) + b"".join(parts)
+
+ALL_FLAGS = FLAG_ZONE | FLAG_QUANTITY | FLAG_CONTENT | FLAG_ITEMS | FLAG_ORDER_ID | FLAG_PRIORITY
+
+def decode_binary(data):
+    """
+    고정 레이아웃 바이너리를 Message로 복원.
+    알 수 없는 종류/플래그, 길이가 모자라거나 남는 데이터, 잘못된 UTF-8은 모두 ValueError.
+    """
+    try:
+        return _decode_binary(data)
+    except (struct.error, UnicodeDecodeError) as e:
+        raise ValueError(f"잘못된 메시지: {e}") from e
+
+def _decode_binary(data):
+    # 고정 길이 필드는 unpack_from이 길이를 확인하고 (모자라면 struct.error),
+    # 길이가 붙은 필드는 선언된 길이만큼 데이터가 있는지 직접 확인
+    size = len(data)
+    type_value, send_type_value, flags = MESSAGE_HEADER.unpack_from(data, 0)
+    offset = MESSAGE_HEADER.size
+    msg_type = MESSAGE_TYPES.get(type_value)
+    send_type = SEND_TYPES.get(send_type_value)
+    if msg_type is None or send_type is None:
+        raise ValueError(f"알 수 없는 메시지 종류: type={type_value}, send_type={send_type_value}")
+    if flags & ~ALL_FLAGS:
+        raise ValueError(f"알 수 없는 플래그: {flags:#x}")
+    zone = quantity = content = items = order_id = priority = None
+
+    if flags & FLAG_ZONE:
+        (length,) = ZONE_LENGTH.unpack_from(data, offset)
+        offset += ZONE_LENGTH.size
+        zone = str(data[offset:check_length(offset, length, size)], "utf-8")
+        offset += length
+    if flags & FLAG_QUANTITY:
+        (quantity,) = QUANTITY.unpack_from(data, offset)
+        offset += QUANTITY.size
+    if flags & FLAG_CONTENT:
+        (length,) = CONTENT_LENGTH.unpack_from(data, offset)
+        offset += CONTENT_LENGTH.size
+        content = str(data[offset:check_length(offset, length, size)], "utf-8")
+        offset += length
+    if flags & FLAG_ITEMS:
+        (count,) = ITEM_COUNT.unpack_from(data, offset)
+        offset += ITEM_COUNT.size
+        items = []
+        for _ in range(count):
+            (length,) = ZONE_LENGTH.unpack_from(data, offset)
+            offset += ZONE_LENGTH.size
+            item_zone = str(data[offset:check_length(offset, length, size)], "utf-8")
+            offset += length
+            (item_quantity,) = QUANTITY.unpack_from(data, offset)
+            offset += QUANTITY.size
+            items.append((item_zone, item_quantity))
+    if flags & FLAG_ORDER_ID:
+        (order_id,) = ORDER_ID.unpack_from(data, offset)
+        offset += ORDER_ID.size
+    if flags & FLAG_PRIORITY:
+        (priority,) = PRIORITY.unpack_from(data, offset)
+        offset += PRIORITY.size
+    if offset != size:
+        raise ValueError(f"메시지 뒤에 남는 데이터: {size - offset}바이트")
+
+    return Message(msg_type, send_type, content, zone, quantity, items, order_id, priority)
+
+def check_length(offset, length, size):
+    """길이가 붙은 필드가 메시지 안에 다 들어 있는지 확인하고 끝 위치를 반환."""
+    end = offset + length
+    if end > size:
+        raise ValueError(f"잘린 메시지: {offset}에서 {length}바이트 필요, {size - offset}바이트 남음")
+    return end
+
+def make_identification(station_id, zones=()):
+    """작업자 스테이션 식별 메시지 내용 생성: "스테이션ID|구역1,구역2"."""
+    if zones:
+        return f"{station_id}|{','.join(zones)}"
+    return station_id
+
+def parse_identification(content):
+    """식별 메시지 내용을 (스테이션 ID, 담당 구역 목록)으로 분리."""
+    station_id, _, zones = content.partition("|")
+    return station_id.strip(), [zone.strip() for zone in zones.split(",") if zone.strip()]
+
+# 프레임 헤더: 페이로드 길이(4바이트, 네트워크 바이트 순서)
+FRAME_HEADER = struct.Struct("!I")
+MAX_FRAME_SIZE = 1024 * 1024  # 비정상적인 길이 헤더로 메모리를 낭비하지 않도록 제한
+
+# 연결 유지 확인 주기와, 이 시간 동안 아무것도 받지 못하면 연결이 죽은 것으로 보는 기준(초)
+HEARTBEAT_INTERVAL = 10.0
+IDLE_TIMEOUT = 30.0
+
+def encode_frame(msg):
+    """Message를 길이 헤더가 붙은 프레임 바이트로 변환."""
+    payload = msg.serialize()
+    return FRAME_HEADER.pack(len(payload)) + payload
+
+def send_message(sock, msg):
+    """프레임 단위로 메시지를 전송. send()와 달리 전체가 전송될 때까지 보장."""
+    sock.sendall(encode_frame(msg))
+
+def send_messages(sock, messages):
+    """여러 메시지의 프레임을 이어 붙여 한 번의 sendall()로 전송."""
+    sock.sendall(b"".join(encode_frame(msg) for msg in messages))
+
+class FrameBuffer:
+    """
+    미리 할당한 bytearray 하나로 프레임을 받는 수신 버퍼.
+    get_buffer()가 돌려준 빈 공간에 소켓이 직접 쓰고(recv_into, asyncio BufferedProtocol),
+    messages()는 완성된 프레임을 memoryview 조각으로 바로 해석하므로 수신마다 bytes를 만들지 않는다.
+    뒤쪽 공간이 부족해지면 남은 미완성 프레임만 앞으로 옮기고,
+    버퍼보다 큰 프레임이 오면 그 프레임이 들어갈 만큼만 늘렸다가 비면 원래 크기로 돌아간다.
+    """
+    def __init__(self, size=BUFFER_SIZE):
+        self.size = size
+        self.buffer = bytearray(size)
+        self.view = memoryview(self.buffer)
+        self.start = 0  # 아직 처리하지 않은 데이터의 시작
+        self.end = 0    # 받은 데이터의 끝
+
+    def get_buffer(self, sizehint=-1):
+        """다음 수신 데이터를 쓸 빈 공간 (memoryview)."""
+        capacity = len(self.buffer)
+        if self.start and capacity - self.end < capacity // 4:
+            self._compact()
+        if self.end == len(self.buffer):
+            self._grow()
+        return self.view[self.end:]
+
+    def buffer_updated(self, nbytes):
+        self.end += nbytes
+
+    def messages(self):
+        """버퍼에 완성된 프레임을 모두 Message로 해석해 반환."""
+        buffer, view = self.buffer, self.view
+        start, end = self.start, self.end
+        header_size = FRAME_HEADER.size
+        messages = []
+        while end - start >= header_size:
+            (length,) = FRAME_HEADER.unpack_from(buffer, start)
+            if length > MAX_FRAME_SIZE:
+                raise ValueError(f"프레임 길이 초과: {length}")
+            frame_end = start + header_size + length
+            if frame_end > end:
+                break
+            messages.append(Message.deserialize(view[start + header_size:frame_end]))
+            start = frame_end
+
+        if start == end:
+            self.start = self.end = 0
+            if len(self.buffer) > self.size:
+                self._resize(self.size)
+        else:
+            self.start = start
+        return messages
+
+    def _compact(self):
+        pending = self.end - self.start
+        self.view[:pending] = self.view[self.start:self.end]
+        self.start, self.end = 0, pending
+
+    def _grow(self):
+        """버퍼가 가득 찼는데 프레임이 끝나지 않은 경우: 처리 중인 프레임 전체가 들어갈 크기로."""
+        self._compact()
+        needed = len(self.buffer) * 2
+        if self.end >= FRAME_HEADER.size:
+            (length,) = FRAME_HEADER.unpack_from(self.buffer, 0)
+            if length > MAX_FRAME_SIZE:
+                raise ValueError(f"프레임 길이 초과: {length}")
+            needed = max(FRAME_HEADER.size + length, self.end + 1)
+        self._resize(needed)
+
+    def _resize(self, size):
+        # 내보낸 memoryview가 있으면 bytearray 크기를 바꿀 수 없으므로 새로 만들어 옮김
+        pending = self.end - self.start
+        buffer = bytearray(max(size, pending))
+        buffer[:pending] = self.view[self.start:self.end]
+        self.view.release()
+        self.buffer, self.view = buffer, memoryview(buffer)
+        self.start, self.end = 0, pending
+
+class ConnectionReader(FrameBuffer):
+    """소켓 하나에서 recv_into()로 FrameBuffer를 채우는 리더."""
+    def __init__(self, sock, size=BUFFER_SIZE):
+        super().__init__(size)
+        self.sock = sock
+
+    def recv(self):
+        """한 번 수신해 받은 바이트 수를 반환 (0이면 상대가 연결을 닫음)."""
+        nbytes = self.sock.recv_into(self.get_buffer())
+        self.end += nbytes
+        return nbytes
+
+    def read(self):
+        """한 번 수신해 완성된 메시지 목록을 반환. 연결이 닫혔으면 None."""
+        if not self.recv():
+            return None
+        return self.messages()
 
 """
 김예나: 192.168.122.5
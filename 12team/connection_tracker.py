@@ -0,0 +1,85 @@
+import threading
+import time
+from log_util import get_logger
+
+log = get_logger("connection")
+
+def format_addr(addr):
+    if isinstance(addr, tuple) and len(addr) >= 2:
+        return f"{addr[0]}:{addr[1]}"
+    return str(addr)
+
+class TrackedConnection:
+    """연결 하나의 마지막 수신 시각. 수신 루프가 데이터를 받을 때마다 touch()."""
+    def __init__(self, conn, addr, close):
+        self.conn = conn
+        self.addr = addr
+        self.close = close  # 유휴 연결을 끊을 때 호출 (수신 루프를 깨워 정리하게 함)
+        self.connected_at = time.monotonic()
+        self.last_seen = self.connected_at
+
+    def touch(self):
+        self.last_seen = time.monotonic()
+
+class ConnectionTracker:
+    """
+    접속 중인 연결의 마지막 수신 시각을 추적하고,
+    idle_timeout 동안 아무것도 보내지 않은 연결(전원이 꺼진 노드의 half-open 연결 등)을 정리한다.
+    클라이언트는 주기적으로 heartbeat를 보내므로 살아 있는 연결은 유휴 상태가 되지 않는다.
+    """
+    def __init__(self, idle_timeout, on_reap=None):
+        self.idle_timeout = idle_timeout
+        self.on_reap = on_reap  # 끊은 연결을 라우팅 대상에서 제거하는 콜백 (conn)
+        self.lock = threading.Lock()
+        self.connections = {}  # id(conn) -> TrackedConnection
+
+    def register(self, conn, addr, close):
+        tracked = TrackedConnection(conn, addr, close)
+        with self.lock:
+            self.connections[id(conn)] = tracked
+        return tracked
+
+    def unregister(self, conn):
+        with self.lock:
+            return self.connections.pop(id(conn), None)
+
+    def __len__(self):
+        return len(self.connections)
+
+    def last_seen(self):
+        """{주소: 마지막 수신 시각(time.time() 기준)} 목록."""
+        now, wall = time.monotonic(), time.time()
+        with self.lock:
+            return {tracked.addr: wall - (now - tracked.last_seen) for tracked in self.connections.values()}
+
+    def last_seen_metrics(self):
+        """metrics 게이지용 {(("addr", "호스트:포트"),): 마지막 수신 시각} (연결별 한 줄)."""
+        return {(("addr", format_addr(addr)),): round(seen, 3) for addr, seen in self.last_seen().items()}
+
+    def reap(self, now=None):
+        """유휴 시간이 지난 연결을 끊고 라우팅에서 제거. 끊은 연결 목록을 반환."""
+        if now is None:
+            now = time.monotonic()
+        deadline = now - self.idle_timeout
+        with self.lock:
+            stale = [tracked for tracked in self.connections.values() if tracked.last_seen < deadline]
+            for tracked in stale:
+                del self.connections[id(tracked.conn)]
+
+        for tracked in stale:
+            log.warning("유휴 연결 정리", addr=tracked.addr, idle_seconds=round(now - tracked.last_seen))
+            try:
+                tracked.close()
+            except OSError as e:
+                log.warning("유휴 연결 종료 오류", addr=tracked.addr, error=e)
+            if self.on_reap is not None:
+                self.on_reap(tracked.conn)
+        return stale
+
+    def run_reaper(self, stop_event, interval):
+        """interval마다 reap()을 호출 (스레드용). 오류가 나도 스레드는 계속 돈다."""
+        while not stop_event.wait(interval):
+            try:
+                self.reap()
+            except Exception as e:
+                log.exception("유휴 연결 정리 오류", error=e)
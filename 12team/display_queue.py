@@ -0,0 +1,94 @@
+import threading
+import time
+from collections import deque
+from log_util import get_logger
+
+log = get_logger("lcd")
+
+class DisplayQueue:
+    """
+    LCD 출력 요청을 모아 두고 전용 렌더 스레드 하나가 순서대로 표시하는 큐.
+    show()는 I2C 통신이나 sleep 없이 바로 반환하므로 소켓 수신 스레드와
+    GPIO 콜백 스레드가 LCD 때문에 멈추지 않는다.
+    같은 key로 아직 표시되지 않은 메시지가 있으면 새 메시지로 대체(coalescing).
+    lcd 대신 open_lcd를 주면 렌더 스레드가 처음 표시할 때 LCD를 초기화한다 (시작 시 I2C 대기 없음).
+    """
+    def __init__(self, lcd=None, dwell=2.0, max_pending=16, open_lcd=None):
+        self.lcd = lcd
+        self.open_lcd = open_lcd
+        self.dwell = dwell              # 한 메시지를 보여주는 최소 시간(초)
+        self.max_pending = max_pending  # 넘치면 가장 오래된 메시지부터 버림
+        self.pending = deque()          # (key, lines)
+        self.cond = threading.Condition()
+        self.running = False
+        self.thread = None
+
+    def start(self):
+        with self.cond:
+            if self.running:
+                return
+            self.running = True
+        self.thread = threading.Thread(target=self._render_loop, name="lcd-render", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        with self.cond:
+            self.running = False
+            self.cond.notify()
+        if self.thread:
+            self.thread.join()
+
+    def show(self, *lines, key=None):
+        """표시할 줄(최대 2줄)을 큐에 넣고 즉시 반환."""
+        with self.cond:
+            if key is not None:
+                for index, (pending_key, _) in enumerate(self.pending):
+                    if pending_key == key:
+                        del self.pending[index]
+                        break
+            self.pending.append((key, lines))
+            if len(self.pending) > self.max_pending:
+                self.pending.popleft()
+            self.cond.notify()
+
+    def _render_loop(self):
+        while True:
+            with self.cond:
+                while self.running and not self.pending:
+                    self.cond.wait()
+                if not self.running:
+                    return
+                _, lines = self.pending.popleft()
+
+            self._render(lines)
+
+            # 최소 표시 시간이 지날 때까지 대기 (종료 요청이 오면 바로 깨어남)
+            deadline = time.monotonic() + self.dwell
+            with self.cond:
+                while self.running:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self.cond.wait(remaining)
+                idle = not self.pending
+
+            # 다음 메시지가 없으면 화면을 비움
+            if idle and self.lcd is not None:
+                self._safe(self.lcd.clear)
+
+    def _render(self, lines):
+        if self.lcd is None:
+            self._safe(self._open)
+            if self.lcd is None:
+                return
+        self._safe(lambda: self.lcd.display_lines(lines))
+
+    def _open(self):
+        self.lcd = self.open_lcd()
+
+    @staticmethod
+    def _safe(action):
+        try:
+            action()
+        except Exception as e:
+            log.warning("LCD 출력 오류", error=e)
@@ -0,0 +1,87 @@
+"""
+라즈베리 파이 없이 프로그램을 실행하기 위한 가짜 하드웨어 (벤치마크/개발/테스트용).
+hardware.use_backend("mock")(또는 HARDWARE_BACKEND=mock)로 고르면 mock 백엔드가 이 모듈의 공유 객체를 돌려주므로,
+테스트는 fake_hardware.gpio.press(핀), FakeMFRC522.tap(uid)로 프로그램이 실제로 쓰는 장치에 입력을 넣고
+gpio.values로 출력값을 확인할 수 있다.
+"""
+import threading
+import types
+from queue import Queue
+
+class FakeGPIO(types.ModuleType):
+    """RPi.GPIO 대용. 핀 출력값과 쓰기 횟수를 기록하고, press()로 버튼 이벤트를 흉내 냄."""
+    BCM = 11
+    BOARD = 10
+    IN = 1
+    OUT = 0
+    HIGH = 1
+    LOW = 0
+    PUD_UP = 22
+    PUD_DOWN = 21
+    FALLING = 32
+    RISING = 31
+    BOTH = 33
+
+    def __init__(self):
+        super().__init__("RPi.GPIO")
+        self.lock = threading.Lock()
+        self.mode = None
+        self.pins = {}       # 핀 -> 방향
+        self.values = {}     # 핀 -> 마지막 출력값
+        self.callbacks = {}  # 핀 -> 이벤트 콜백
+        self.writes = 0      # output() 호출로 바뀐 핀 수 (같은 값 포함)
+
+    def setwarnings(self, flag):
+        pass
+
+    def setmode(self, mode):
+        self.mode = mode
+
+    def setup(self, pin, direction, pull_up_down=None, initial=None):
+        for channel in pin if isinstance(pin, (list, tuple)) else (pin,):
+            self.pins[channel] = direction
+            if initial is not None:
+                self.values[channel] = initial
+
+    def output(self, pin, value):
+        channels = pin if isinstance(pin, (list, tuple)) else (pin,)
+        values = value if isinstance(value, (list, tuple)) else (value,) * len(channels)
+        with self.lock:
+            for channel, channel_value in zip(channels, values):
+                self.values[channel] = channel_value
+                self.writes += 1
+
+    def input(self, pin):
+        return self.values.get(pin, self.HIGH)
+
+    def add_event_detect(self, pin, edge, callback=None, bouncetime=None):
+        self.callbacks[pin] = callback
+
+    def remove_event_detect(self, pin):
+        self.callbacks.pop(pin, None)
+
+    def press(self, pin):
+        """버튼을 누른 것처럼 등록된 콜백을 호출."""
+        callback = self.callbacks.get(pin)
+        if callback is not None:
+            callback(pin)
+
+    def cleanup(self, pin=None):
+        pass
+
+class FakeMFRC522:
+    """mfrc522.SimpleMFRC522 대용. tap(uid)로 넣은 태그를 read()가 순서대로 돌려줌."""
+    tags = Queue()
+
+    def read(self):
+        return self.tags.get(), ""
+
+    def read_id(self):
+        return self.tags.get()
+
+    @classmethod
+    def tap(cls, uid, text=""):
+        cls.tags.put(uid)
+
+# 프로세스 전체가 함께 쓰는 가짜 GPIO (mock 백엔드가 돌려주는 객체)
+gpio = FakeGPIO()
@@ -0,0 +1,156 @@
+"""
+하드웨어(GPIO, LCD, RFID 리더) 백엔드.
+프로그램 시작 시 use_backend()로 고르고, 각 장치는 처음 쓸 때 초기화한다.
+import만으로는 GPIO 설정이나 I2C 통신이 일어나지 않으므로 벤치마크나 일반 리눅스 서버에서도 쓸 수 있다.
+
+- pi:   실제 라즈베리 파이 (RPi.GPIO, smbus2, mfrc522)
+- mock: 상태를 기록하는 가짜 장치 (fake_hardware, 개발/벤치마크용)
+- noop: 아무 것도 하지 않음 (하드웨어 없는 서버에서 라우팅만 실행)
+"""
+import os
+import threading
+
+BACKEND_PI = "pi"
+BACKEND_MOCK = "mock"
+BACKEND_NOOP = "noop"
+BACKENDS = (BACKEND_PI, BACKEND_MOCK, BACKEND_NOOP)
+DEFAULT_BACKEND = os.environ.get("HARDWARE_BACKEND", BACKEND_PI)
+
+class HardwareBackend:
+    """장치를 처음 요청할 때 한 번만 만들어 돌려주는 백엔드의 공통 부분."""
+    name = None
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self._gpio = None
+        self._lcd = None
+
+    def gpio(self):
+        """BCM 모드로 설정된 GPIO 모듈(또는 대용 객체)."""
+        if self._gpio is None:
+            with self.lock:
+                if self._gpio is None:
+                    gpio = self.open_gpio()
+                    gpio.setwarnings(False)
+                    gpio.setmode(gpio.BCM)
+                    self._gpio = gpio
+        return self._gpio
+
+    def lcd(self):
+        if self._lcd is None:
+            with self.lock:
+                if self._lcd is None:
+                    self._lcd = self.open_lcd()
+        return self._lcd
+
+    def rfid_reader(self):
+        return self.open_rfid()
+
+    def cleanup(self):
+        """GPIO를 쓴 적이 있을 때만 정리."""
+        if self._gpio is not None:
+            self._gpio.cleanup()
+
+    def open_gpio(self):
+        raise NotImplementedError
+
+    def open_lcd(self):
+        raise NotImplementedError
+
+    def open_rfid(self):
+        raise NotImplementedError
+
+class PiBackend(HardwareBackend):
+    name = BACKEND_PI
+
+    def open_gpio(self):
+        import RPi.GPIO as GPIO
+        return GPIO
+
+    def open_lcd(self):
+        from lcd import BufferedLCD
+        return BufferedLCD()
+
+    def open_rfid(self):
+        from mfrc522 import SimpleMFRC522
+        return SimpleMFRC522()
+
+class MockBackend(HardwareBackend):
+    name = BACKEND_MOCK
+
+    def open_gpio(self):
+        # 공유 객체를 돌려줘야 테스트가 fake_hardware.gpio.press()로 프로그램이 등록한 콜백을 부를 수 있음
+        from fake_hardware import gpio
+        return gpio
+
+    def open_lcd(self):
+        from lcd import BufferedLCD, FakeSMBus
+        return BufferedLCD(bus=FakeSMBus())
+
+    def open_rfid(self):
+        from fake_hardware import FakeMFRC522
+        return FakeMFRC522()
+
+class NoopGPIO:
+    """모든 호출을 무시하는 GPIO 대용 (상수만 RPi.GPIO와 같음)."""
+    BCM = 11
+    BOARD = 10
+    IN = 1
+    OUT = 0
+    HIGH = 1
+    LOW = 0
+    PUD_UP = 22
+    PUD_DOWN = 21
+    FALLING = 32
+    RISING = 31
+    BOTH = 33
+
+    def _ignore(self, *args, **kwargs):
+        return None
+
+    setwarnings = setmode = setup = output = add_event_detect = remove_event_detect = cleanup = _ignore
+
+    def input(self, pin):
+        return self.HIGH
+
+class NoopLCD:
+    def display_lines(self, lines):
+        pass
+
+    def clear(self):
+        pass
+
+class NoopRFIDReader:
+    """태그가 절대 감지되지 않는 리더 (read()가 반환하지 않음)."""
+    def read(self):
+        threading.Event().wait()
+
+class NoopBackend(HardwareBackend):
+    name = BACKEND_NOOP
+
+    def open_gpio(self):
+        return NoopGPIO()
+
+    def open_lcd(self):
+        return NoopLCD()
+
+    def open_rfid(self):
+        return NoopRFIDReader()
+
+BACKEND_CLASSES = {BACKEND_PI: PiBackend, BACKEND_MOCK: MockBackend, BACKEND_NOOP: NoopBackend}
+
+current = None
+
+def use_backend(name=DEFAULT_BACKEND):
+    """사용할 백엔드를 선택 (장치는 아직 초기화하지 않음)."""
+    global current
+    if name not in BACKEND_CLASSES:
+        raise ValueError(f"알 수 없는 하드웨어 백엔드: {name} (선택: {', '.join(BACKENDS)})")
+    current = BACKEND_CLASSES[name]()
+    return current
+
+def get_backend():
+    """선택된 백엔드. 아직 고르지 않았으면 기본값(HARDWARE_BACKEND 환경 변수, 없으면 pi)."""
+    if current is None:
+        return use_backend()
+    return current
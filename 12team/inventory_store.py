@@ -0,0 +1,95 @@
+import threading
+
+DEFAULT_STRIPES = 16
+
+class InventoryStore:
+    """
+    구역별 재고를 보관하는 스레드 안전 저장소.
+    구역 이름의 해시로 잠금을 나눠(lock striping) 서로 다른 구역의 갱신은 동시에 진행되고,
+    on_change 콜백(LED 갱신 등)은 값을 바꾼 잠금 안에서 호출되어 값과 항상 일치한다.
+    """
+    def __init__(self, zones, initial=0, stripes=DEFAULT_STRIPES):
+        self.values = {zone: initial for zone in zones}
+        self.locks = [threading.Lock() for _ in range(stripes)]
+
+    def _stripe(self, zone):
+        return hash(zone) % len(self.locks)
+
+    def __contains__(self, zone):
+        return zone in self.values
+
+    def __len__(self):
+        return len(self.values)
+
+    def get(self, zone):
+        return self.values[zone]
+
+    def snapshot(self):
+        """모든 구역의 재고 사본 (잠금을 전부 잡아 한 시점의 일관된 값)."""
+        return self.snapshot_with(lambda: None)[0]
+
+    def snapshot_with(self, action):
+        """
+        잠금을 전부 잡은 상태에서 재고 사본을 만들고 action()도 실행.
+        (재고 사본, action 반환값)을 반환. 로그 시퀀스 등을 같은 시점으로 맞출 때 사용.
+        """
+        for lock in self.locks:
+            lock.acquire()
+        try:
+            return dict(self.values), action()
+        finally:
+            for lock in reversed(self.locks):
+                lock.release()
+
+    def set(self, zone, quantity, on_change=None):
+        """재고를 quantity로 설정하고 이전 값을 반환."""
+        if zone not in self.values:
+            raise KeyError(zone)
+        with self.locks[self._stripe(zone)]:
+            previous = self.values[zone]
+            self.values[zone] = quantity
+            if on_change:
+                on_change(zone, quantity)
+            return previous
+
+    def compare_and_set(self, zone, expected, quantity, on_change=None):
+        """현재 값이 expected일 때만 quantity로 바꿈. 성공 여부를 반환."""
+        if zone not in self.values:
+            raise KeyError(zone)
+        with self.locks[self._stripe(zone)]:
+            if self.values[zone] != expected:
+                return False
+            self.values[zone] = quantity
+            if on_change:
+                on_change(zone, quantity)
+            return True
+
+    def add(self, zone, delta, on_change=None):
+        """재고를 delta만큼 증감하고 새 값을 반환."""
+        if zone not in self.values:
+            raise KeyError(zone)
+        with self.locks[self._stripe(zone)]:
+            quantity = self.values[zone] + delta
+            self.values[zone] = quantity
+            if on_change:
+                on_change(zone, quantity)
+            return quantity
+
+    def apply(self, updates, on_change=None):
+        """
+        [(구역, 재고), ...]를 원자적으로 반영. 필요한 잠금만 번호 순서대로 잡아 교착 상태를 피함.
+        on_change는 반영된 [(구역, 재고), ...] 목록으로 한 번 호출.
+        """
+        updates = [(zone, quantity) for zone, quantity in updates if zone in self.values]
+        stripes = sorted({self._stripe(zone) for zone, _ in updates})
+        for index in stripes:
+            self.locks[index].acquire()
+        try:
+            for zone, quantity in updates:
+                self.values[zone] = quantity
+            if on_change and updates:
+                on_change(updates)
+            return updates
+        finally:
+            for index in reversed(stripes):
+                self.locks[index].release()
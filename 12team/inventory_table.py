@@ -0,0 +1,180 @@
+"""
+다른 프로세스가 소켓 없이 읽을 수 있는 공유 메모리 재고 표.
+
+중앙 서버가 재고를 바꿀 때마다 mmap한 파일(기본값은 /dev/shm 아래라 디스크에 쓰지 않음)의
+구역별 칸에 수량, 버전, 갱신 시각을 기록하고, 대시보드/LED 드라이버/보고 도구는 같은 파일을 mmap해서
+잠금이나 시스템 호출 없이 읽는다. 읽기가 많아져도 중앙 서버의 라우팅에는 부하가 가지 않는다.
+
+레이아웃 (리틀 엔디언, 칸마다 64바이트 = 캐시 라인 하나):
+    헤더  magic(4) | 레이아웃 버전(2) | 칸 크기(2) | 칸 수(4) | 패딩
+    칸    seq(8) | version(8) | quantity(8) | updated(8, epoch 초) | CRC32(4) | 구역 ID(28, UTF-8)
+
+칸마다 seqlock으로 보호한다. 칸의 쓰는 쪽은 항상 하나(재고 저장소의 구역 잠금 안, 샤드 모드에서는 담당 샤드)이고,
+seq를 홀수로 만든 뒤 값을 쓰고 seq = 2 * version(짝수)으로 끝낸다.
+읽는 쪽은 seq가 짝수이고 읽기 전후로 같으며 2 * version과 일치하고, version/quantity/updated의 CRC32가
+함께 기록된 값과 맞을 때만 값을 받아들이고, 아니면 다시 읽는다.
+CPython에는 메모리 배리어가 없어 ARM(라즈베리 파이)처럼 메모리 순서가 약한 CPU에서는 seq가 그대로 짝수로 보이는데도
+새 quantity와 이전 version이 섞여 보일 수 있다. seq 검사만으로는 이를 막지 못하므로 CRC32로 걸러낸다
+(우연히 일치할 확률은 2^-32).
+"""
+import mmap
+import os
+import struct
+import sys
+import time
+import zlib
+
+TABLE_MAGIC = b"INVT"
+LAYOUT_VERSION = 2
+HEADER = struct.Struct("<4sHHI")
+HEADER_SIZE = 64
+SLOT = struct.Struct("<QQqdI28s")
+SLOT_SIZE = 64
+SEQ = struct.Struct("<Q")
+VALUE = struct.Struct("<Qqd")  # version, quantity, updated
+VALUE_OFFSET = SEQ.size
+CHECKSUM = struct.Struct("<I")  # VALUE 바이트의 CRC32
+CHECKSUM_OFFSET = VALUE_OFFSET + VALUE.size
+ZONE_ID_SIZE = 28
+READ_SPINS = 100       # 쓰는 중인 칸을 바로 다시 읽어 보는 횟수 (이후에는 잠깐씩 양보)
+READ_TIMEOUT = 1.0     # 이 시간(초) 동안 일관된 값을 읽지 못하면 포기
+
+DEFAULT_TABLE_PATH = "/dev/shm/logistics_inventory" if os.path.isdir("/dev/shm") else os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "data", "inventory_table")
+
+class InventoryTable:
+    """
+    mmap한 재고 표. create()는 중앙 서버가 새 표를 만들 때, open()은 이미 있는 표를 읽거나(기본) 쓸 때 사용.
+    """
+    def __init__(self, path, file, buffer, zone_ids, writable):
+        self.path = path
+        self.file = file
+        self.buffer = buffer
+        self.zone_ids = zone_ids
+        self.slots = {zone_id: index for index, zone_id in enumerate(zone_ids)}
+        self.writable = writable
+        self.inode = os.fstat(file.fileno()).st_ino
+
+    @classmethod
+    def create(cls, path, zone_ids):
+        """
+        구역 목록으로 새 표를 만들어 쓰기용으로 엶. 임시 파일을 채운 뒤 이름을 바꾸므로
+        이전 표를 mmap하고 있던 읽기 프로세스는 옛 파일을 계속 안전하게 읽는다 (replaced()로 확인 후 다시 열면 됨).
+        """
+        encoded = [zone_id.encode("utf-8") for zone_id in zone_ids]
+        for zone_id, raw in zip(zone_ids, encoded):
+            if len(raw) > ZONE_ID_SIZE:
+                raise ValueError(f"구역 ID가 너무 김 ({ZONE_ID_SIZE}바이트 초과): {zone_id}")
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as f:
+            data = bytearray(HEADER_SIZE + SLOT_SIZE * len(zone_ids))
+            HEADER.pack_into(data, 0, TABLE_MAGIC, LAYOUT_VERSION, SLOT_SIZE, len(zone_ids))
+            for index, raw in enumerate(encoded):
+                SLOT.pack_into(data, HEADER_SIZE + index * SLOT_SIZE, 0, 0, 0, 0.0,
+                               zlib.crc32(VALUE.pack(0, 0, 0.0)), raw)
+            f.write(data)
+        os.replace(temp_path, path)
+        return cls.open(path, writable=True)
+
+    @classmethod
+    def open(cls, path, writable=False):
+        file = open(path, "r+b" if writable else "rb")
+        try:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            file.close()
+            raise
+        magic, layout, slot_size, count = HEADER.unpack_from(buffer, 0)
+        if magic != TABLE_MAGIC or layout != LAYOUT_VERSION or slot_size != SLOT_SIZE:
+            buffer.close()
+            file.close()
+            raise ValueError(f"재고 표 형식이 다름: {path}")
+        zone_ids = [
+            SLOT.unpack_from(buffer, HEADER_SIZE + index * SLOT_SIZE)[5].rstrip(b"\0").decode("utf-8")
+            for index in range(count)
+        ]
+        return cls(path, file, buffer, zone_ids, writable)
+
+    def __len__(self):
+        return len(self.zone_ids)
+
+    def __contains__(self, zone_id):
+        return zone_id in self.slots
+
+    def write(self, index, quantity, updated=None):
+        """칸 index에 재고를 기록 (쓰는 쪽은 칸마다 하나여야 함)."""
+        offset = HEADER_SIZE + index * SLOT_SIZE
+        buffer = self.buffer
+        (seq,) = SEQ.unpack_from(buffer, offset)
+        version = seq // 2 + 1
+        value = VALUE.pack(version, quantity, time.time() if updated is None else updated)
+        SEQ.pack_into(buffer, offset, seq + 1)  # 홀수: 쓰는 중
+        buffer[offset + VALUE_OFFSET:offset + CHECKSUM_OFFSET] = value
+        CHECKSUM.pack_into(buffer, offset + CHECKSUM_OFFSET, zlib.crc32(value))
+        SEQ.pack_into(buffer, offset, 2 * version)
+
+    def read(self, index):
+        """
+        칸 index의 (quantity, version, updated). 한 번도 기록되지 않았으면 version이 0.
+        쓰는 중이면 다시 읽는다. 코어가 하나뿐이면 쓰는 프로세스가 중간에 선점되었을 수 있으므로
+        몇 번 실패한 뒤부터는 CPU를 양보하고, READ_TIMEOUT 동안 실패하면 RuntimeError (쓰는 쪽이 중간에 죽은 경우).
+        """
+        offset = HEADER_SIZE + index * SLOT_SIZE
+        buffer = self.buffer
+        attempts = 0
+        deadline = None
+        while True:
+            (before,) = SEQ.unpack_from(buffer, offset)
+            if not before & 1:
+                value = buffer[offset + VALUE_OFFSET:offset + CHECKSUM_OFFSET]
+                (checksum,) = CHECKSUM.unpack_from(buffer, offset + CHECKSUM_OFFSET)
+                (after,) = SEQ.unpack_from(buffer, offset)
+                version, quantity, updated = VALUE.unpack(value)
+                if before == after and before == 2 * version and zlib.crc32(value) == checksum:
+                    return quantity, version, updated
+            attempts += 1
+            if attempts >= READ_SPINS:
+                now = time.monotonic()
+                if deadline is None:
+                    deadline = now + READ_TIMEOUT
+                elif now > deadline:
+                    raise RuntimeError(f"재고 표 칸을 읽지 못함: {self.zone_ids[index]}")
+                time.sleep(0)
+
+    def get(self, zone_id):
+        return self.read(self.slots[zone_id])
+
+    def snapshot(self):
+        """{구역 ID: (quantity, version, updated)}. 칸마다 일관된 값이지만 칸끼리는 서로 다른 시점일 수 있음."""
+        return {zone_id: self.read(index) for index, zone_id in enumerate(self.zone_ids)}
+
+    def replaced(self):
+        """중앙 서버가 재시작하며 표를 새로 만들었는지 (그러면 다시 open()해야 최신 값을 읽음)."""
+        try:
+            return os.stat(self.path).st_ino != self.inode
+        except FileNotFoundError:
+            return True
+
+    def close(self):
+        self.buffer.close()
+        self.file.close()
+
+def main():
+    """현재 재고 표를 출력하는 간단한 보고 도구: python inventory_table.py [경로]"""
+    path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_TABLE_PATH
+    table = InventoryTable.open(path)
+    try:
+        for zone_id, (quantity, version, updated) in table.snapshot().items():
+            if version:
+                stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(updated))
+                print(f"{zone_id}\t{quantity}\tv{version}\t{stamp}")
+            else:
+                print(f"{zone_id}\t-\t기록 없음")
+    finally:
+        table.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+import time
+
+LCD_WIDTH = 16
+LCD_LINES = 2
+LINE_ADDRESSES = (0x80, 0xC0)  # 각 줄의 DDRAM 시작 주소 명령
+
+ENABLE = 0x04
+BACKLIGHT = 0x08
+MODE_COMMAND = 0x00
+MODE_CHARACTER = 0x01
+
+I2C_BLOCK_MAX = 32  # SMBus 블록 쓰기 한 번에 보낼 수 있는 최대 데이터 바이트 수
+
+def open_bus(bus):
+    """버스 번호면 smbus2.SMBus를 열고, 이미 버스 객체면 그대로 사용."""
+    if isinstance(bus, int):
+        from smbus2 import SMBus
+        return SMBus(bus)
+    return bus
+
+# LCD 클래스 정의
+class LCD:
+    def __init__(self, addr=0x27, bus=1):
+        self.addr = addr
+        self.bus = open_bus(bus)
+        self.lcd_init()
+
+    def lcd_init(self):
+        self.lcd_write(0x33)
+        self.lcd_write(0x32)
+        self.lcd_write(0x06)
+        self.lcd_write(0x0C)
+        self.lcd_write(0x28)
+        self.lcd_write(0x01)
+        time.sleep(0.05)
+
+    def lcd_write(self, cmd, mode=0):
+        high = mode | (cmd & 0xF0) | 0x08
+        low = mode | ((cmd << 4) & 0xF0) | 0x08
+        self.bus.write_byte(self.addr, high)
+        self.lcd_toggle_enable(high)
+        self.bus.write_byte(self.addr, low)
+        self.lcd_toggle_enable(low)
+
+    def lcd_toggle_enable(self, data):
+        time.sleep(0.0005)
+        self.bus.write_byte(self.addr, (data | 0x04))
+        time.sleep(0.0005)
+        self.bus.write_byte(self.addr, (data & ~0x04))
+        time.sleep(0.0005)
+
+    def lcd_display_string(self, string, line):
+        if line == 1:
+            self.lcd_write(0x80)
+        elif line == 2:
+            self.lcd_write(0xC0)
+        for char in string:
+            self.lcd_write(ord(char), 0x01)
+
+    def clear(self):
+        self.lcd_write(0x01)
+
+    def display_lines(self, lines):
+        """화면을 지우고 주어진 줄들을 표시."""
+        self.clear()
+        for line_number, text in enumerate(lines[:LCD_LINES], start=1):
+            self.lcd_display_string(text, line_number)
+
+class BufferedLCD(LCD):
+    """
+    2x16 화면 내용을 메모리(shadow)에 두고 바뀐 칸만 다시 쓰는 LCD 드라이버.
+    - 니블마다 write_byte + sleep 하던 것을 write_i2c_block_data 한 번에 묶어 전송
+      (I2C 한 바이트 전송 시간이 HD44780의 Enable 펄스/명령 실행 시간보다 길어 sleep 불필요)
+    - 느린 clear(0x01) 명령 대신 바뀐 칸만 공백으로 덮어씀
+    """
+    def __init__(self, addr=0x27, bus=1):
+        self.shadow = [[" "] * LCD_WIDTH for _ in range(LCD_LINES)]
+        super().__init__(addr, bus)
+
+    def lcd_init(self):
+        super().lcd_init()
+        # 초기화 명령의 0x01이 화면을 비우므로 shadow도 공백 상태와 일치
+        self.shadow = [[" "] * LCD_WIDTH for _ in range(LCD_LINES)]
+
+    def lcd_display_string(self, string, line):
+        text = string[:LCD_WIDTH].ljust(LCD_WIDTH)
+        self._flush(self._diff(line - 1, text))
+
+    def clear(self):
+        self.display_lines(())
+
+    def display_lines(self, lines):
+        """화면 전체를 주어진 줄들로 맞추되 바뀐 칸만 한 번의 배치로 전송."""
+        data = []
+        for row in range(LCD_LINES):
+            text = lines[row] if row < len(lines) else ""
+            data += self._diff(row, text[:LCD_WIDTH].ljust(LCD_WIDTH))
+        self._flush(data)
+
+    def _diff(self, row, text):
+        """shadow와 비교해 바뀐 구간마다 주소 설정 + 문자 쓰기 바이트열을 생성."""
+        shadow = self.shadow[row]
+        data = []
+        cursor = None  # LCD 커서가 현재 가리키는 칸 (문자를 쓰면 자동 증가)
+        for col, char in enumerate(text):
+            if shadow[col] == char:
+                continue
+            if cursor != col:
+                data += self._expand(LINE_ADDRESSES[row] + col, MODE_COMMAND)
+            data += self._expand(ord(char), MODE_CHARACTER)
+            shadow[col] = char
+            cursor = col + 1
+        return data
+
+    @staticmethod
+    def _expand(value, mode):
+        """한 바이트를 PCF8574 출력 시퀀스(상위/하위 니블 × 데이터, EN↑, EN↓)로 변환."""
+        high = mode | (value & 0xF0) | BACKLIGHT
+        low = mode | ((value << 4) & 0xF0) | BACKLIGHT
+        return [high, high | ENABLE, high & ~ENABLE, low, low | ENABLE, low & ~ENABLE]
+
+    def _flush(self, data):
+        # 블록 쓰기의 명령 바이트도 PCF8574에는 출력 바이트로 전달되므로 블록당 최대 33바이트
+        step = I2C_BLOCK_MAX + 1
+        for start in range(0, len(data), step):
+            chunk = data[start:start + step]
+            self.bus.write_i2c_block_data(self.addr, chunk[0], chunk[1:])
+
+class FakeSMBus:
+    """실제 I2C 없이 트랜잭션 수와 전송 바이트 수만 세는 SMBus 대용 (벤치마크/개발용)."""
+    def __init__(self, bus=1):
+        self.transactions = 0
+        self.bytes_written = 0
+
+    def write_byte(self, addr, value):
+        self.transactions += 1
+        self.bytes_written += 1
+
+    def write_i2c_block_data(self, addr, register, data):
+        self.transactions += 1
+        self.bytes_written += 1 + len(data)
+
+    def reset(self):
+        self.transactions = 0
+        self.bytes_written = 0
+
+    def close(self):
+        pass
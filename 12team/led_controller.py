@@ -0,0 +1,117 @@
+import threading
+from log_util import get_logger
+
+log = get_logger("led")
+
+DEFAULT_LOW_STOCK = 3       # 재고가 이 값보다 적으면 LED 켜짐
+DEFAULT_LED_HYSTERESIS = 0  # 켜진 LED는 재고가 low_stock + 이 값 이상이 되어야 꺼짐
+
+def check_number(zone, name, value):
+    """설정값이 0 이상의 숫자인지 확인 (JSON에 문자열 등이 들어오면 갱신 때마다가 아니라 읽을 때 실패하도록)."""
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+        raise ValueError(f"{zone}의 {name}는 0 이상의 숫자여야 함: {value!r}")
+    return value
+
+class ZoneLED:
+    def __init__(self, zone, pin, low_stock=DEFAULT_LOW_STOCK, hysteresis=DEFAULT_LED_HYSTERESIS):
+        self.zone = zone
+        self.pin = pin
+        self.low_stock = check_number(zone, "low_stock", low_stock)
+        self.hysteresis = check_number(zone, "led_hysteresis", hysteresis)
+        self.lit = False  # 마지막으로 출력한 상태
+
+    def wants_lit(self, quantity, lit=None):
+        """
+        재고에 맞는 LED 상태. 켜져 있으면(lit, 기본값은 마지막 출력 상태) low_stock + hysteresis까지는 켜 둠
+        (기준값 근처에서 깜박이지 않도록).
+        """
+        if self.lit if lit is None else lit:
+            return quantity < self.low_stock + self.hysteresis
+        return quantity < self.low_stock
+
+class LEDController:
+    """
+    구역별 재고 부족 LED.
+    - 핀마다 마지막으로 출력한 상태를 기억해 바뀔 때만 GPIO.output을 호출 (같은 값이면 시스템 호출도 로그도 없음)
+    - 구역마다 기준값(low_stock)과 히스테리시스(led_hysteresis)를 zones.json에서 설정
+    - 여러 구역을 한 번에 갱신하면 바뀐 핀만 모아 GPIO.output 한 번으로 출력
+    GPIO는 처음 출력할 때 열고 모든 핀을 꺼진 상태로 설정한다 (import 시점에는 하드웨어를 건드리지 않음).
+    """
+    def __init__(self, leds, open_gpio):
+        self.leds = {led.zone: led for led in leds}
+        self.open_gpio = open_gpio
+        self.gpio = None
+        self.lock = threading.Lock()
+        self.writes = 0   # 실제로 출력한 핀 수
+        self.skipped = 0  # 상태가 같아 출력하지 않은 갱신 수
+
+    @classmethod
+    def from_registry(cls, registry, open_gpio):
+        """LED 핀이 있는 구역만 등록. 구역 라벨("A 구역")로 갱신한다."""
+        leds = [
+            ZoneLED(zone.label, zone.led_pin,
+                    zone.options.get("low_stock", DEFAULT_LOW_STOCK),
+                    zone.options.get("led_hysteresis", DEFAULT_LED_HYSTERESIS))
+            for zone in registry if zone.led_pin is not None
+        ]
+        return cls(leds, open_gpio)
+
+    def retain(self, zones):
+        """지정한 구역의 LED만 남김 (샤드 모드에서 담당 구역만 제어할 때). GPIO를 열기 전에 호출."""
+        self.leds = {zone: led for zone, led in self.leds.items() if zone in zones}
+
+    def __contains__(self, zone):
+        return zone in self.leds
+
+    def __len__(self):
+        return len(self.leds)
+
+    def update(self, zone, quantity):
+        """구역 하나의 재고로 LED 상태를 갱신. 상태가 바뀌었으면 True."""
+        led = self.leds.get(zone)
+        if led is None:
+            return False
+        with self.lock:
+            lit = led.wants_lit(quantity)
+            if lit == led.lit:
+                self.skipped += 1
+                return False
+            gpio = self._open()
+            gpio.output(led.pin, gpio.HIGH if lit else gpio.LOW)
+            led.lit = lit
+            self.writes += 1
+        log.debug("LED 켜짐" if lit else "LED 꺼짐", zone=zone, quantity=quantity)
+        return True
+
+    def update_many(self, updates):
+        """[(구역, 재고), ...]로 LED를 갱신. 바뀐 핀만 GPIO.output 한 번으로 출력하고 그 수를 반환."""
+        with self.lock:
+            changed = {}  # 핀 -> (ZoneLED, 상태). 같은 구역이 여러 번 나오면 마지막 값
+            for zone, quantity in updates:
+                led = self.leds.get(zone)
+                if led is None:
+                    continue
+                previous = changed.get(led.pin)
+                # 히스테리시스는 이 묶음 안에서 앞서 정해진 상태를 기준으로 판단
+                changed[led.pin] = (led, led.wants_lit(quantity, previous[1] if previous else None))
+            transitions = [(led, lit) for led, lit in changed.values() if lit != led.lit]
+            self.skipped += len(changed) - len(transitions)
+            if not transitions:
+                return 0
+            gpio = self._open()
+            gpio.output([led.pin for led, _ in transitions], [gpio.HIGH if lit else gpio.LOW for _, lit in transitions])
+            for led, lit in transitions:
+                led.lit = lit
+            self.writes += len(transitions)
+        log.debug("LED 일괄 갱신", count=len(transitions))
+        return len(transitions)
+
+    def _open(self):
+        """(lock을 잡은 상태에서) GPIO를 열고 모든 LED 핀을 출력, 꺼짐으로 설정 (최초 1회)."""
+        if self.gpio is None:
+            gpio = self.open_gpio()
+            for led in self.leds.values():
+                gpio.setup(led.pin, gpio.OUT)
+                gpio.output(led.pin, gpio.LOW)  # 초기 LED 꺼짐 상태
+            self.gpio = gpio
+        return self.gpio
@@ -0,0 +1,155 @@
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
+
+DEFAULT_LEVEL = os.environ.get("LOG_LEVEL", "INFO")
+RATE_LIMIT_PER_SECOND = 50.0  # 같은 위치의 로그를 초당 이만큼까지만 출력
+RATE_LIMIT_BURST = 200        # 순간적으로 허용하는 최대 개수
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s %(message)s"
+
+DEBUG = logging.DEBUG
+INFO = logging.INFO
+WARNING = logging.WARNING
+ERROR = logging.ERROR
+
+class StructuredLogger:
+    """
+    키=값 필드를 붙여 기록하는 로거.
+    log.debug("재고 업데이트", zone=zone, quantity=quantity)처럼 쓰고,
+    해당 레벨이 꺼져 있으면 레벨 확인 한 번만 하고 바로 반환한다 (문자열을 만들지 않음).
+    """
+    def __init__(self, logger):
+        self.logger = logger
+
+    def isEnabledFor(self, level):
+        return self.logger.isEnabledFor(level)
+
+    def debug(self, msg, **fields):
+        if self.logger.isEnabledFor(DEBUG):
+            self.logger._log(DEBUG, msg, (), extra={"fields": fields})
+
+    def info(self, msg, **fields):
+        if self.logger.isEnabledFor(INFO):
+            self.logger._log(INFO, msg, (), extra={"fields": fields})
+
+    def warning(self, msg, **fields):
+        if self.logger.isEnabledFor(WARNING):
+            self.logger._log(WARNING, msg, (), extra={"fields": fields})
+
+    def error(self, msg, **fields):
+        if self.logger.isEnabledFor(ERROR):
+            self.logger._log(ERROR, msg, (), extra={"fields": fields})
+
+    def exception(self, msg, **fields):
+        """except 블록 안에서 호출: 예외 정보를 함께 기록."""
+        if self.logger.isEnabledFor(ERROR):
+            self.logger._log(ERROR, msg, (), extra={"fields": fields}, exc_info=True)
+
+def get_logger(name):
+    return StructuredLogger(logging.getLogger(name))
+
+def format_value(value):
+    text = str(value)
+    if not text or any(ch.isspace() or ch in '"=' for ch in text):
+        return '"' + text.replace('"', '\\"') + '"'
+    return text
+
+class KeyValueFormatter(logging.Formatter):
+    """메시지 뒤에 필드를 key=value 형태로 붙임 (공백이 있는 값은 따옴표로 감쌈)."""
+    def formatMessage(self, record):
+        line = super().formatMessage(record)
+        fields = getattr(record, "fields", None)
+        if fields:
+            line += " " + " ".join(f"{key}={format_value(value)}" for key, value in fields.items())
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            line += f" suppressed={suppressed}"
+        return line
+
+class RateLimitFilter(logging.Filter):
+    """
+    로그 호출 위치(로거 이름 + 메시지)마다 토큰 버킷으로 출력 빈도를 제한.
+    버려진 개수는 다음에 통과하는 기록에 suppressed=N으로 붙인다.
+    ERROR 이상은 제한하지 않는다.
+    """
+    def __init__(self, rate=RATE_LIMIT_PER_SECOND, burst=RATE_LIMIT_BURST):
+        super().__init__()
+        self.rate = rate
+        self.burst = burst
+        self.lock = threading.Lock()
+        self.buckets = {}  # (이름, 메시지) -> [토큰, 마지막 갱신 시각, 버린 개수]
+
+    def filter(self, record):
+        if record.levelno >= ERROR:
+            return True
+        key = (record.name, record.msg)
+        now = time.monotonic()
+        with self.lock:
+            bucket = self.buckets.get(key)
+            if bucket is None:
+                bucket = self.buckets[key] = [self.burst, now, 0]
+            tokens = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            if tokens < 1:
+                bucket[0] = tokens
+                bucket[2] += 1
+                return False
+            bucket[0] = tokens - 1
+            record.suppressed, bucket[2] = bucket[2], 0
+        return True
+
+class BackgroundQueueHandler(logging.handlers.QueueHandler):
+    """
+    기록을 큐에 넣기만 하는 핸들러. 문자열 조립은 출력 스레드에서 하고,
+    호출한 스레드에서는 나중에 바뀔 수 있는 것(예외 정보, % 인자)만 미리 문자열로 만든다.
+    """
+    def prepare(self, record):
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+listener = None
+
+def setup_logging(level=DEFAULT_LEVEL, stream=None, rate=RATE_LIMIT_PER_SECOND, burst=RATE_LIMIT_BURST):
+    """
+    루트 로거를 큐 기반으로 설정: 호출한 스레드는 큐에 넣기만 하고,
+    출력(콘솔/journald 등 느린 장치)은 백그라운드 스레드 하나가 맡는다.
+    """
+    global listener
+    if listener is not None:
+        listener.stop()
+
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(KeyValueFormatter(LOG_FORMAT))
+
+    log_queue = queue.SimpleQueue()
+    handler = BackgroundQueueHandler(log_queue)
+    handler.addFilter(RateLimitFilter(rate, burst))
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(level.upper() if isinstance(level, str) else level)
+
+    listener = logging.handlers.QueueListener(log_queue, output)
+    listener.start()
+    return listener
+
+def shutdown_logging():
+    """큐에 남은 로그를 모두 출력하고 백그라운드 스레드를 멈춤."""
+    global listener
+    if listener is not None:
+        listener.stop()
+        listener = None
+
+atexit.register(shutdown_logging)
@@ -0,0 +1,168 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# 히스토그램 정밀도: 값의 상위 PRECISION_BITS 비트만 구분 (상대 오차 약 1/2^(PRECISION_BITS-1))
+PRECISION_BITS = 6
+MAX_VALUE_BITS = 40  # 마이크로초 단위로 약 12일까지 기록
+DEFAULT_PERCENTILES = (0.5, 0.9, 0.99, 0.999)
+
+class LatencyHistogram:
+    """
+    HDR 히스토그램 방식의 지연 시간 분포 (마이크로초 단위 정수로 기록).
+    작은 값은 1 단위로, 큰 값은 2의 거듭제곱 구간마다 같은 개수의 칸으로 나누어
+    값의 크기와 관계없이 일정한 상대 오차로 백분위수를 구한다. 기록은 O(1).
+    """
+    HALF = 1 << (PRECISION_BITS - 1)
+
+    def __init__(self):
+        self.counts = [0] * (2 * self.HALF + (MAX_VALUE_BITS - PRECISION_BITS) * self.HALF)
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def index_of(self, value):
+        if value < 2 * self.HALF:
+            return value
+        shift = value.bit_length() - PRECISION_BITS
+        return 2 * self.HALF + (shift - 1) * self.HALF + ((value >> shift) - self.HALF)
+
+    def value_of(self, index):
+        """칸의 상한값 (백분위수를 보수적으로 보고)."""
+        if index < 2 * self.HALF:
+            return index
+        shift, offset = divmod(index - 2 * self.HALF, self.HALF)
+        shift += 1
+        return ((self.HALF + offset + 1) << shift) - 1
+
+    def record(self, value):
+        value = max(0, int(value))
+        index = min(self.index_of(value), len(self.counts) - 1)
+        self.counts[index] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other):
+        """다른 히스토그램의 기록을 합침 (여러 스레드/노드의 분포를 모을 때)."""
+        for index, count in enumerate(other.counts):
+            if count:
+                self.counts[index] += count
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self, q):
+        if not self.count:
+            return 0
+        target = max(1, int(q * self.count + 0.5))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return min(self.value_of(index), self.max)
+        return self.max
+
+class Metrics:
+    """
+    카운터, 지연 시간 히스토그램, 게이지를 모아 텍스트(Prometheus 형식)로 내보낸다.
+    카운터/히스토그램 이름과 라벨 조합은 처음 기록될 때 만들어진다.
+    게이지는 값을 가져오는 함수를 등록해 두고 내보낼 때만 호출한다.
+    함수가 {라벨: 값} dict를 반환하면 라벨 조합마다 한 줄씩 내보낸다 (연결별 값 등).
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = {}    # (이름, 라벨) -> 값
+        self.histograms = {}  # (이름, 라벨) -> LatencyHistogram
+        self.gauges = {}      # 이름 -> 함수
+        self.help = {}
+
+    def describe(self, name, text):
+        self.help[name] = text
+
+    def count(self, name, labels=(), amount=1):
+        key = (name, labels)
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def observe(self, name, labels, seconds):
+        """지연 시간(초)을 마이크로초로 바꿔 히스토그램에 기록."""
+        key = (name, labels)
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = LatencyHistogram()
+            histogram.record(seconds * 1000000)
+
+    def gauge(self, name, read, text=None):
+        self.gauges[name] = read
+        if text:
+            self.describe(name, text)
+
+    def render(self):
+        lines = []
+        with self.lock:
+            counters = sorted(self.counters.items())
+            histograms = [(key, histogram.count, histogram.total, histogram.max,
+                           [(q, histogram.percentile(q)) for q in DEFAULT_PERCENTILES])
+                          for key, histogram in sorted(self.histograms.items(), key=lambda item: item[0])]
+
+        described = set()
+        def header(name, kind):
+            if name not in described:
+                described.add(name)
+                if name in self.help:
+                    lines.append(f"# HELP {name} {self.help[name]}")
+                lines.append(f"# TYPE {name} {kind}")
+
+        for (name, labels), value in counters:
+            header(name, "counter")
+            lines.append(f"{name}{format_labels(labels)} {value}")
+        for (name, labels), count, total, maximum, percentiles in histograms:
+            header(name, "summary")
+            for q, value in percentiles:
+                lines.append(f"{name}{format_labels(labels + (('quantile', q),))} {value}")
+            lines.append(f"{name}_max{format_labels(labels)} {maximum}")
+            lines.append(f"{name}_sum{format_labels(labels)} {total}")
+            lines.append(f"{name}_count{format_labels(labels)} {count}")
+        for name, read in sorted(self.gauges.items()):
+            header(name, "gauge")
+            try:
+                value = read()
+                if isinstance(value, dict):
+                    for labels, item in sorted(value.items()):
+                        lines.append(f"{name}{format_labels(labels)} {item}")
+                else:
+                    lines.append(f"{name} {value}")
+            except Exception as e:
+                lines.append(f"# {name} 읽기 오류: {e}")
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port, host="127.0.0.1"):
+        """/metrics 경로로 render() 결과를 내보내는 HTTP 서버를 백그라운드 스레드로 시작."""
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # 수집 요청마다 로그를 남기지 않음
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+        return server
+
+def format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{value}"' for key, value in labels) + "}"
@@ -0,0 +1,54 @@
+import numpy as np
+
+UNKNOWN = -1  # 아직 읽지 않은 값
+
+class ReconcileResult:
+    """한 번의 대조 결과. 배열 인덱스는 ZoneRegistry의 구역 인덱스."""
+    def __init__(self, changed, mismatched, updated, difference):
+        self.changed = changed        # 이전 대비 센서/수기 값이 바뀐 구역 인덱스
+        self.mismatched = mismatched  # 바뀐 구역 중 센서와 수기 값이 다른 구역 인덱스
+        self.updated = updated        # mismatched 구역의 새 재고 (min(센서, 수기))
+        self.difference = difference  # mismatched 구역의 |센서 - 수기|
+
+class ReconciliationEngine:
+    """
+    모든 구역의 센서/수기/이전 값을 NumPy 배열로 보관하고
+    변화 감지와 불일치 계산을 구역 수와 관계없이 한 번의 벡터 연산으로 처리.
+    """
+    def __init__(self, registry):
+        self.registry = registry
+        size = len(registry)
+        self.sensor = np.full(size, UNKNOWN, dtype=np.int64)
+        self.manual = np.full(size, UNKNOWN, dtype=np.int64)
+        self.previous_sensor = np.full(size, UNKNOWN, dtype=np.int64)
+        self.previous_manual = np.full(size, UNKNOWN, dtype=np.int64)
+
+    def load(self, sensor_values=None, manual_values=None):
+        """구역 순서대로 정렬된 전체 값을 한 번에 반영."""
+        if sensor_values is not None:
+            self.sensor[:] = sensor_values
+        if manual_values is not None:
+            self.manual[:] = manual_values
+
+    def update(self, zone, sensor_data=None, manual_data=None):
+        """구역 하나의 값만 바뀌었을 때 (push 이벤트 등)."""
+        index = self.registry.index_of(zone)
+        if sensor_data is not None:
+            self.sensor[index] = sensor_data
+        if manual_data is not None:
+            self.manual[index] = manual_data
+
+    def reconcile(self):
+        """이전 대조 이후 바뀐 구역을 찾아 불일치 구역과 새 재고를 계산."""
+        changed_mask = (self.sensor != self.previous_sensor) | (self.manual != self.previous_manual)
+        changed_mask &= (self.sensor != UNKNOWN) & (self.manual != UNKNOWN)
+        mismatch_mask = changed_mask & (self.sensor != self.manual)
+
+        changed = np.flatnonzero(changed_mask)
+        mismatched = np.flatnonzero(mismatch_mask)
+        sensor = self.sensor[mismatched]
+        manual = self.manual[mismatched]
+
+        self.previous_sensor[changed] = self.sensor[changed]
+        self.previous_manual[changed] = self.manual[changed]
+        return ReconcileResult(changed, mismatched, np.minimum(sensor, manual), np.abs(sensor - manual))
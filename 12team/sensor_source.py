@@ -0,0 +1,122 @@
+import heapq
+import queue
+import threading
+import time
+
+class SensorSource:
+    """구역별 재고 값을 제공하는 공급원 인터페이스."""
+    def read(self, zone):
+        raise NotImplementedError
+
+    def read_all(self, zones):
+        """여러 구역을 한 번에 읽음. 일괄 조회가 가능한 공급원은 재정의해서 사용."""
+        return [self.read(zone) for zone in zones]
+
+    def subscribe(self, callback):
+        """
+        값이 바뀔 때 callback(zone, value)를 호출하도록 등록.
+        push를 지원하지 않는 공급원은 False를 반환하고 주기적 읽기(polling)로만 감지됨.
+        """
+        return False
+
+class FunctionSource(SensorSource):
+    """get_sensor_data 같은 읽기 함수를 공급원으로 감싼 것 (polling 전용)."""
+    def __init__(self, read_fn):
+        self.read_fn = read_fn
+
+    def read(self, zone):
+        return self.read_fn(zone)
+
+class PushSource(SensorSource):
+    """센서 드라이버나 입력 화면이 publish()로 값을 밀어 넣는 공급원."""
+    def __init__(self, initial=None):
+        self.values = dict(initial or {})
+        self.callbacks = []
+        self.lock = threading.Lock()
+
+    def read(self, zone):
+        return self.values.get(zone)
+
+    def subscribe(self, callback):
+        with self.lock:
+            self.callbacks.append(callback)
+        return True
+
+    def publish(self, zone, value):
+        if self.values.get(zone) == value:
+            return
+        self.values[zone] = value
+        with self.lock:
+            callbacks = list(self.callbacks)
+        for callback in callbacks:
+            callback(zone, value)
+
+class ZoneMonitor:
+    """
+    구역별 센서/수기 데이터의 변화를 감지해 on_change(zone, sensor, manual)를 호출.
+    - push 공급원은 값이 들어오는 즉시 해당 구역만 확인
+    - polling 간격은 구역마다 따로: 값이 바뀌면 min_interval로 줄이고,
+      변화가 없으면 backoff 배씩 늘려 max_interval까지
+    - 한 번 읽은 값을 on_change에 그대로 넘겨 같은 주기에 다시 읽지 않음
+    """
+    def __init__(self, zones, sensor_source, manual_source, on_change,
+                 min_interval=0.5, max_interval=5.0, backoff=2.0):
+        self.zones = list(zones)
+        self.sensor_source = sensor_source
+        self.manual_source = manual_source
+        self.on_change = on_change
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+
+        self.previous = {zone: (None, None) for zone in self.zones}  # zone -> (sensor, manual)
+        self.intervals = {zone: min_interval for zone in self.zones}
+        self.schedule = [(0.0, zone) for zone in self.zones]  # (다음 확인 시각, zone)
+        self.events = queue.Queue()  # push로 들어온 (zone, sensor, manual)
+        self.stop_event = threading.Event()
+
+        sensor_source.subscribe(lambda zone, value: self.events.put((zone, value, None)))
+        manual_source.subscribe(lambda zone, value: self.events.put((zone, None, value)))
+
+    def check(self, zone, sensor_data=None, manual_data=None):
+        """구역 값을 확인하고 바뀌었으면 on_change 호출. 변화 여부를 반환."""
+        if sensor_data is None:
+            sensor_data = self.sensor_source.read(zone)
+        if manual_data is None:
+            manual_data = self.manual_source.read(zone)
+
+        if (sensor_data, manual_data) == self.previous.get(zone):
+            return False
+        self.previous[zone] = (sensor_data, manual_data)
+        self.on_change(zone, sensor_data, manual_data)
+        return True
+
+    def poll_due(self, now):
+        """확인 시각이 된 구역들을 읽고 다음 확인 시각을 조정."""
+        while self.schedule and self.schedule[0][0] <= now:
+            _, zone = heapq.heappop(self.schedule)
+            if self.check(zone):
+                interval = self.min_interval
+            else:
+                interval = min(self.intervals[zone] * self.backoff, self.max_interval)
+            self.intervals[zone] = interval
+            heapq.heappush(self.schedule, (now + interval, zone))
+
+    def run(self):
+        """stop()이 호출될 때까지 push 이벤트와 polling 일정을 처리."""
+        while not self.stop_event.is_set():
+            now = time.monotonic()
+            self.poll_due(now)
+            timeout = max(0.0, self.schedule[0][0] - time.monotonic()) if self.schedule else self.max_interval
+
+            try:
+                zone, sensor_data, manual_data = self.events.get(timeout=timeout)
+            except queue.Empty:
+                continue
+            if zone in self.previous:
+                self.check(zone, sensor_data, manual_data)
+                self.intervals[zone] = self.min_interval
+
+    def stop(self):
+        self.stop_event.set()
+        self.events.put((None, None, None))
@@ -0,0 +1,126 @@
+"""
+중앙 서버를 여러 프로세스(샤드)로 나누어 실행하기 위한 도구.
+
+- 모든 샤드가 SO_REUSEPORT로 같은 포트에서 연결을 받고, 커널이 연결을 샤드에 나누어 준다.
+- 구역마다 담당 샤드가 하나 있다 (구역 ID 해시). 재고와 작업 지시는 담당 샤드만 처리하고,
+  다른 샤드로 들어온 메시지는 로컬 IPC 큐로 담당 샤드에 넘긴다.
+- 작업자 스테이션은 연결된 샤드에만 소켓이 있으므로, 등록/해제를 모든 샤드에 알리고
+  다른 샤드는 RemoteStation을 통해 작업 지시를 그 샤드로 보내 전달을 맡긴다.
+- 작업 지시 번호는 샤드별로 겹치지 않게 부여하므로 (번호 % 샤드 수 = 담당 샤드)
+  완료 응답은 번호만 보고 담당 샤드로 넘긴다.
+"""
+import multiprocessing
+import signal
+import threading
+import zlib
+from log_util import get_logger
+
+log = get_logger("shard")
+
+# 샤드 사이에 주고받는 항목 종류
+ROUTE = "route"                # (ROUTE, Message): 담당 샤드에서 처리할 메시지
+DELIVER = "deliver"            # (DELIVER, station_id, frame): 이 샤드에 연결된 스테이션으로 보낼 프레임
+STATION_UP = "station_up"      # (STATION_UP, station_id, shard, zones)
+STATION_DOWN = "station_down"  # (STATION_DOWN, station_id, shard)
+
+def shard_of(zone_id, count):
+    """구역 ID의 담당 샤드 번호. 프로세스와 실행에 관계없이 같은 값이 나오도록 crc32 사용."""
+    return zlib.crc32(zone_id.encode("utf-8")) % count
+
+class ShardGroup:
+    """
+    한 샤드 프로세스에서 본 샤드 묶음: 자신의 번호와 다른 샤드의 수신 큐.
+    start(handler)로 자신의 큐를 읽는 스레드를 띄우고, 받은 항목마다 handler(item)을 호출한다.
+    """
+    def __init__(self, index, inboxes):
+        self.index = index
+        self.inboxes = inboxes
+        self.count = len(inboxes)
+        self.forwarded = 0  # 다른 샤드로 넘긴 항목 수
+        self.thread = None
+
+    def owner_of(self, zone_id):
+        return shard_of(zone_id, self.count)
+
+    def is_local(self, zone_id):
+        return shard_of(zone_id, self.count) == self.index
+
+    def send(self, shard, item):
+        self.inboxes[shard].put(item)
+        self.forwarded += 1
+
+    def broadcast(self, item):
+        for shard in range(self.count):
+            if shard != self.index:
+                self.send(shard, item)
+
+    def start(self, handler):
+        self.thread = threading.Thread(target=self._run, args=(handler,), name=f"shard-{self.index}-inbox",
+                                       daemon=True)
+        self.thread.start()
+        return self
+
+    def _run(self, handler):
+        inbox = self.inboxes[self.index]
+        while True:
+            item = inbox.get()
+            try:
+                handler(item)
+            except Exception as e:
+                log.exception("샤드 간 메시지 처리 오류", kind=item[0], error=e)
+
+class RemoteStation:
+    """
+    다른 샤드에 연결된 작업자 스테이션. WorkerRegistry에 소켓 대신 등록해 두면
+    send_message()가 호출하는 sendall()이 프레임을 그 샤드로 넘긴다.
+    """
+    def __init__(self, group, shard, station_id):
+        self.group = group
+        self.shard = shard
+        self.station_id = station_id
+
+    def sendall(self, data):
+        self.group.send(self.shard, (DELIVER, self.station_id, bytes(data)))
+
+def raise_keyboard_interrupt(signum, frame):
+    # 한 번만: systemd/timeout처럼 프로세스 그룹 전체에 보낸 신호가 부모를 거쳐 다시 와도 정리를 끊지 않도록
+    signal.signal(signum, signal.SIG_IGN)
+    raise KeyboardInterrupt
+
+def run_shard_process(target, index, inboxes, args):
+    """
+    샤드 프로세스의 시작 함수. 종료는 부모가 SIGTERM으로 한 번만 알리므로
+    터미널의 Ctrl+C(SIGINT)는 무시하고, SIGTERM을 KeyboardInterrupt로 바꿔 평소처럼 상태를 저장하고 끝낸다.
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, raise_keyboard_interrupt)
+    target(index, inboxes, *args)
+
+def run_processes(count, target, args=()):
+    """
+    샤드 프로세스 count개를 띄우고 모두 끝날 때까지 기다림.
+    각 프로세스는 target(index, inboxes, *args)를 실행한다.
+    Ctrl+C나 SIGTERM을 받으면 샤드들에 SIGTERM을 보내고 정리가 끝나기를 기다린다.
+    """
+    inboxes = [multiprocessing.Queue() for _ in range(count)]
+    processes = [
+        multiprocessing.Process(target=run_shard_process, args=(target, index, inboxes, tuple(args)),
+                                name=f"central-shard-{index}")
+        for index in range(count)
+    ]
+    previous = signal.signal(signal.SIGTERM, raise_keyboard_interrupt)
+    try:
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        log.info("샤드 종료 요청", processes=count)
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+        for process in processes:
+            process.join()
+    finally:
+        signal.signal(signal.SIGTERM, previous)
+    return [process.exitcode for process in processes]
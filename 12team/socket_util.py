@@ -1,15 +1,54 @@
 import socket
+import resource
+from log_util import get_logger
 
-def create_and_bind_socket(port):
-    """서버 소켓을 생성하고 바인딩"""
+log = get_logger("socket")
+
+DEFAULT_BACKLOG = 128  # 센서 노드가 한꺼번에 재접속해도 연결이 거절되지 않도록 여유 있게
+DEFAULT_CONNECT_TIMEOUT = 5.0  # 접속 대기 상한(초). SYN이 버려져도 OS 기본값(약 2분)까지 기다리지 않도록
+
+def create_and_bind_socket(port, backlog=DEFAULT_BACKLOG, nodelay=False, reuse_port=False):
+    """
+    서버 소켓을 생성하고 바인딩. nodelay면 수락한 연결에 TCP_NODELAY가 적용됨 (리눅스는 상속)
+    reuse_port면 여러 프로세스가 같은 포트에 바인딩하고, 커널이 새 연결을 프로세스들에 나누어 줌
+    """
     server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
     server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)  # 포트 재사용 옵션 설정
+    if reuse_port:
+        if not hasattr(socket, "SO_REUSEPORT"):
+            server_socket.close()
+            raise OSError("이 운영체제는 SO_REUSEPORT를 지원하지 않음")
+        server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    if nodelay:
+        server_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
     server_socket.bind(('', port))
-    server_socket.listen(5)
+    server_socket.listen(backlog)
     return server_socket
 
-def create_and_connect_socket(ip, port):
-    """클라이언트 소켓을 생성하고 서버에 연결"""
+def create_and_connect_socket(ip, port, nodelay=False, timeout=DEFAULT_CONNECT_TIMEOUT):
+    """
+    클라이언트 소켓을 생성하고 서버에 연결. nodelay면 작은 메시지도 Nagle 알고리즘으로 지연시키지 않음
+    timeout(초) 안에 연결되지 않으면 socket.timeout(OSError). 연결된 소켓은 블로킹 모드로 반환
+    """
     client_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    client_socket.connect((ip, port))
+    try:
+        if nodelay:
+            client_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        client_socket.settimeout(timeout)
+        client_socket.connect((ip, port))
+        client_socket.settimeout(None)
+    except OSError:
+        client_socket.close()
+        raise
     return client_socket
+
+def raise_open_file_limit():
+    """열 수 있는 파일 디스크립터 수를 하드 리밋까지 올림 (연결 수천 개 유지용)."""
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if hard == resource.RLIM_INFINITY or soft < hard:
+        target = hard if hard != resource.RLIM_INFINITY else max(soft, 65536)
+        try:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+        except (ValueError, OSError) as e:
+            log.warning("파일 디스크립터 한도 변경 실패", error=e)
+    return resource.getrlimit(resource.RLIMIT_NOFILE)[0]
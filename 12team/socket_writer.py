@@ -0,0 +1,242 @@
+"""
+연결별 송신 묶음 처리.
+보낼 프레임을 바로 send()하지 않고 잠깐 모았다가 sendmsg() 한 번(writev)으로 보낸다.
+얼마나 기다릴지(flush 지연)와 얼마나 모이면 바로 보낼지(flush 크기)는 FlushPolicy로 정하고,
+저지연 모드에서는 TCP_NODELAY를 켜고 기다리지 않고 보낸다 (동시에 들어온 것만 묶임).
+지연 전송은 모든 연결이 함께 쓰는 스레드 하나가 맡으므로 그 스레드에서는 절대 블록하지 않는다
+(상대가 읽지 않는 연결 하나 때문에 다른 연결의 전송이 멈추지 않도록).
+"""
+import heapq
+import select
+import socket
+import threading
+import time
+from log_util import get_logger
+
+log = get_logger("socket")
+
+DEFAULT_FLUSH_LATENCY = 0.002     # 첫 프레임이 들어온 뒤 최대 대기 시간(초)
+DEFAULT_FLUSH_BYTES = 64 * 1024   # 이만큼 모이면 대기 시간과 관계없이 전송
+IOV_MAX = 1024                    # sendmsg() 한 번에 넘기는 최대 버퍼 수 (리눅스 IOV_MAX)
+STALL_RETRY_INTERVAL = 0.01       # 송신 버퍼가 차 있을 때 지연 전송을 다시 시도하는 간격(초)
+SEND_STALL_TIMEOUT = 10.0         # 이 시간(초) 동안 한 바이트도 보내지 못하면 연결 오류로 처리
+
+class FlushPolicy:
+    """
+    송신 묶음 기준.
+    - latency: 첫 프레임을 모으기 시작한 뒤 이 시간(초)이 지나면 전송. 0이면 바로 전송
+    - max_bytes: 모인 크기가 이 이상이면 바로 전송
+    - low_latency: TCP_NODELAY를 켜고 latency를 0으로 (Nagle 알고리즘의 지연도 없앰)
+    """
+    def __init__(self, latency=DEFAULT_FLUSH_LATENCY, max_bytes=DEFAULT_FLUSH_BYTES, low_latency=False):
+        if latency < 0 or max_bytes < 1:
+            raise ValueError(f"잘못된 송신 묶음 설정: latency={latency}, max_bytes={max_bytes}")
+        self.latency = 0.0 if low_latency else latency
+        self.max_bytes = max_bytes
+        self.low_latency = low_latency
+
+    def __repr__(self):
+        return f"FlushPolicy(latency={self.latency}, max_bytes={self.max_bytes}, low_latency={self.low_latency})"
+
+DEFAULT_FLUSH_POLICY = FlushPolicy()
+LOW_LATENCY_POLICY = FlushPolicy(low_latency=True)
+
+def set_nodelay(sock, enabled=True):
+    """TCP_NODELAY 설정 (TCP가 아닌 소켓이면 무시)."""
+    try:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1 if enabled else 0)
+    except OSError:
+        pass
+
+class FlushTimer:
+    """
+    모든 CoalescingWriter가 함께 쓰는 지연 전송 스레드 (연결마다 스레드를 만들지 않음).
+    전송 시각 순서로 힙에 넣어 두고, 시각이 되면 flush()를 호출한다.
+    """
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.heap = []
+        self.sequence = 0  # 같은 시각끼리 비교할 때 writer를 비교하지 않도록
+        self.thread = None
+
+    def schedule(self, writer, deadline):
+        with self.condition:
+            self.sequence += 1
+            heapq.heappush(self.heap, (deadline, self.sequence, writer))
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, name="socket-flush", daemon=True)
+                self.thread.start()
+            elif self.heap[0][2] is writer:
+                self.condition.notify()
+
+    def _run(self):
+        while True:
+            with self.condition:
+                while not self.heap:
+                    self.condition.wait()
+                deadline = self.heap[0][0]
+                delay = deadline - time.monotonic()
+                if delay > 0:
+                    self.condition.wait(delay)
+                    continue
+                _, _, writer = heapq.heappop(self.heap)
+            writer.flush_quietly()
+
+flush_timer = FlushTimer()
+
+class CoalescingWriter:
+    """
+    소켓 하나의 송신을 묶어 보내는 객체. sendall()을 제공하므로 send_message() 등에 소켓 대신 넘길 수 있다.
+
+    sendall()은 프레임을 모아 두기만 하고, 모인 크기가 max_bytes 이상이거나 latency가 0이면
+    호출한 스레드에서 바로 전송한다 (이때 전송 오류는 OSError로 올라옴).
+    그렇지 않으면 latency 뒤에 FlushTimer 스레드가 블록하지 않고 보낼 수 있는 만큼만 보내고,
+    남은 것은 잠시 뒤 다시 시도한다. SEND_STALL_TIMEOUT 동안 전혀 보내지 못하거나 오류가 나면
+    이 writer만 오류 상태로 만들고 on_error(writer)를 호출한다.
+    오류가 난 뒤 보내지 못한 프레임은 take_unsent()로 꺼낼 수 있다 (재접속 후 다시 보내는 용도).
+    """
+    def __init__(self, sock, policy=DEFAULT_FLUSH_POLICY, on_error=None):
+        self.sock = sock
+        self.policy = policy
+        self.on_error = on_error
+        self.lock = threading.Lock()       # pending 보호
+        self.send_lock = threading.Lock()  # 전송 순서 보장 (한 번에 한 스레드만 전송)
+        self.pending = []
+        self.pending_bytes = 0
+        self.sent_offset = 0  # pending[0] 중 이미 보낸 바이트 수 (블록하지 않는 전송이 중간에 멈춘 경우)
+        self.stalled_since = None  # 지연 전송이 한 바이트도 보내지 못하기 시작한 시각
+        self.unsent = []
+        self.error = None
+        self.flushes = 0  # 전송 시스템 호출 횟수 (묶음 효과 확인용)
+        self.frames = 0
+        if policy.low_latency:
+            set_nodelay(sock)
+
+    def sendall(self, data):
+        with self.lock:
+            if self.error is not None:
+                # 오류 뒤에 들어온 프레임도 버리지 않고 unsent에 쌓음
+                self.unsent.append(data)
+                raise ConnectionResetError(f"이미 전송 오류가 난 연결: {self.error}")
+            first = not self.pending
+            self.pending.append(data)
+            self.pending_bytes += len(data)
+            self.frames += 1
+            flush_now = self.policy.latency == 0 or self.pending_bytes >= self.policy.max_bytes
+        if flush_now:
+            self.flush()
+        elif first:
+            flush_timer.schedule(self, time.monotonic() + self.policy.latency)
+
+    def flush(self, block=True):
+        """
+        모인 프레임을 전송. 실패하면 OSError를 올리고, 보내지 못한 프레임은 unsent에 남김.
+        block=False면 송신 버퍼에 들어가는 만큼만 보내고 나머지는 pending 앞에 되돌려 둔다.
+        모두 보냈으면 True.
+        """
+        with self.send_lock:
+            with self.lock:
+                if not self.pending or self.error is not None:
+                    return True
+                frames, offset = self.pending, self.sent_offset
+                self.pending, self.pending_bytes, self.sent_offset = [], 0, 0
+            buffers = list(frames)
+            if offset:
+                buffers[0] = memoryview(buffers[0])[offset:]
+            try:
+                self._send_buffers(buffers, block)
+            except OSError as e:
+                with self.lock:
+                    self.error = e
+                    # buffers에 남은 개수만큼 뒤에서부터가 다 보내지 못한 프레임 (잘린 프레임도 원본으로)
+                    self.unsent = frames[len(frames) - len(buffers):] + self.pending
+                    self.pending, self.pending_bytes = [], 0
+                raise
+            if not buffers:
+                return True
+            with self.lock:
+                rest = frames[len(frames) - len(buffers):]
+                self.sent_offset = len(rest[0]) - len(buffers[0])
+                self.pending = rest + self.pending
+                self.pending_bytes += sum(len(buffer) for buffer in buffers)
+            return False
+
+    def flush_quietly(self):
+        """
+        FlushTimer에서 호출: 블록하지 않고 전송하고, 다 보내지 못하면 다시 예약.
+        오류는 올리는 대신 on_error로 알림.
+        """
+        try:
+            if self.flush(block=False):
+                return
+        except OSError as e:
+            log.warning("지연 전송 오류", error=e)
+            self._notify_error()
+            return
+        now = time.monotonic()
+        if self.stalled_since is None:
+            self.stalled_since = now
+        elif now - self.stalled_since >= SEND_STALL_TIMEOUT:
+            log.warning("상대가 읽지 않아 전송 중단", seconds=round(now - self.stalled_since, 1))
+            with self.lock:
+                if self.error is None:
+                    self.error = TimeoutError("송신 버퍼가 비워지지 않음")
+                    self.unsent = self.unsent + self.pending
+                    self.pending, self.pending_bytes, self.sent_offset = [], 0, 0
+            self._notify_error()
+            return
+        flush_timer.schedule(self, now + max(self.policy.latency, STALL_RETRY_INTERVAL))
+
+    def _notify_error(self):
+        if self.on_error is not None:
+            self.on_error(self)
+
+    def take_unsent(self):
+        """
+        보내지 못한 프레임(오류로 실패한 것과 아직 모으는 중이던 것)을 꺼냄.
+        부분 전송된 프레임은 처음부터 포함하고, 이후 이 writer로는 더 보내지 않는다.
+        """
+        with self.lock:
+            if self.error is None:
+                self.error = ConnectionResetError("연결을 더 이상 쓰지 않음")
+            unsent = self.unsent + self.pending
+            self.unsent, self.pending, self.pending_bytes, self.sent_offset = [], [], 0, 0
+            return unsent
+
+    def _writable(self):
+        """송신 버퍼에 자리가 있는지 (기다리지 않고 확인)."""
+        poller = select.poll()
+        poller.register(self.sock, select.POLLOUT)
+        return bool(poller.poll(0))
+
+    def _send_buffers(self, buffers, block=True):
+        """
+        buffers를 전송하고 보낸 만큼 앞에서 제거. block=False면 송신 버퍼가 차는 즉시 멈춘다.
+        (타임아웃이 설정된 소켓은 MSG_DONTWAIT만으로는 타임아웃까지 기다리므로 먼저 poll로 확인)
+        """
+        if not hasattr(self.sock, "sendmsg"):
+            if not block and not self._writable():
+                return
+            self.sock.sendall(b"".join(buffers))
+            self.flushes += 1
+            del buffers[:]
+            return
+        flags = 0 if block else socket.MSG_DONTWAIT
+        while buffers:
+            if not block and not self._writable():
+                return
+            try:
+                sent = self.sock.sendmsg(buffers[:IOV_MAX], [], flags)
+            except BlockingIOError:
+                return
+            self.flushes += 1
+            if sent:
+                self.stalled_since = None
+            # 다 보낸 버퍼는 빼고, 일부만 보낸 버퍼는 남은 부분부터 다시
+            done = 0
+            while done < len(buffers) and sent >= len(buffers[done]):
+                sent -= len(buffers[done])
+                done += 1
+            del buffers[:done]
+            if sent:
+                buffers[0] = memoryview(buffers[0])[sent:]
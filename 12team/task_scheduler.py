@@ -0,0 +1,126 @@
+import threading
+
+DEFAULT_TASK_TIME = 60.0  # 완료 기록이 없는 작업자의 작업당 예상 소요 시간(초)
+DURATION_SMOOTHING = 0.2  # 작업 시간 이동 평균 가중치
+
+class IndexedMinHeap:
+    """항목별 위치를 기억해 키 변경/삭제도 O(log N)에 처리하는 최소 힙."""
+    def __init__(self):
+        self.heap = []      # [(key, item)]
+        self.position = {}  # item -> heap 인덱스
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __contains__(self, item):
+        return item in self.position
+
+    def peek(self):
+        return self.heap[0][1] if self.heap else None
+
+    def push(self, item, key):
+        """없으면 추가하고, 있으면 키를 바꿈."""
+        if item in self.position:
+            self.update(item, key)
+            return
+        self.heap.append((key, item))
+        self.position[item] = len(self.heap) - 1
+        self._sift_up(len(self.heap) - 1)
+
+    def update(self, item, key):
+        index = self.position[item]
+        old_key = self.heap[index][0]
+        self.heap[index] = (key, item)
+        if key < old_key:
+            self._sift_up(index)
+        else:
+            self._sift_down(index)
+
+    def remove(self, item):
+        index = self.position.pop(item)
+        last = self.heap.pop()
+        if index < len(self.heap):
+            self.heap[index] = last
+            self.position[last[1]] = index
+            self._sift_up(index)
+            self._sift_down(self.position[last[1]])
+
+    def _swap(self, i, j):
+        self.heap[i], self.heap[j] = self.heap[j], self.heap[i]
+        self.position[self.heap[i][1]] = i
+        self.position[self.heap[j][1]] = j
+
+    def _sift_up(self, index):
+        while index > 0:
+            parent = (index - 1) >> 1
+            if self.heap[index][0] >= self.heap[parent][0]:
+                break
+            self._swap(index, parent)
+            index = parent
+
+    def _sift_down(self, index):
+        size = len(self.heap)
+        while True:
+            smallest = index
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < size and self.heap[child][0] < self.heap[smallest][0]:
+                    smallest = child
+            if smallest == index:
+                return
+            self._swap(index, smallest)
+            index = smallest
+
+class WorkerScheduler:
+    """
+    출근한 작업자 중 예상 완료 시각이 가장 이른(= 남은 작업 × 평균 작업 시간이 가장 작은)
+    작업자에게 업무를 배정. 출근/퇴근, 배정, 완료 모두 O(log N).
+    """
+    def __init__(self, default_task_time=DEFAULT_TASK_TIME):
+        self.default_task_time = default_task_time
+        self.lock = threading.Lock()
+        self.heap = IndexedMinHeap()  # 출근한 작업자만 포함
+        self.outstanding = {}         # 작업자 -> 남은 작업 수
+        self.task_time = {}           # 작업자 -> 평균 작업 시간(초)
+
+    def _key(self, name):
+        outstanding = self.outstanding.get(name, 0)
+        estimated = outstanding * self.task_time.get(name, self.default_task_time)
+        return (estimated, outstanding, name)
+
+    def check_in(self, name):
+        with self.lock:
+            self.heap.push(name, self._key(name))
+
+    def check_out(self, name):
+        """퇴근 처리. 남은 작업은 호출한 쪽이 다른 작업자에게 넘기므로 남은 작업 수도 0으로."""
+        with self.lock:
+            if name in self.heap:
+                self.heap.remove(name)
+            self.outstanding.pop(name, None)
+
+    def is_available(self, name):
+        return name in self.heap
+
+    def available_count(self):
+        return len(self.heap)
+
+    def assign(self):
+        """업무를 받을 작업자를 골라 남은 작업 수를 늘림. 출근한 작업자가 없으면 None."""
+        with self.lock:
+            name = self.heap.peek()
+            if name is None:
+                return None
+            self.outstanding[name] = self.outstanding.get(name, 0) + 1
+            self.heap.update(name, self._key(name))
+            return name
+
+    def complete(self, name, duration=None):
+        """작업 하나를 끝냄. duration(초)이 있으면 평균 작업 시간에 반영."""
+        with self.lock:
+            if self.outstanding.get(name, 0) > 0:
+                self.outstanding[name] -= 1
+            if duration is not None and duration > 0:
+                previous = self.task_time.get(name, duration)
+                self.task_time[name] = previous + DURATION_SMOOTHING * (duration - previous)
+            if name in self.heap:
+                self.heap.update(name, self._key(name))
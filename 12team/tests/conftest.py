@@ -0,0 +1,7 @@
+import os
+import sys
+
+# 12team의 모듈은 패키지가 아니라 같은 디렉터리에서 바로 import하므로 상위 디렉터리를 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# 테스트는 라즈베리 파이 없이 가짜 하드웨어로 실행
+os.environ.setdefault("HARDWARE_BACKEND", "mock")
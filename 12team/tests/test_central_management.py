@@ -0,0 +1,57 @@
+import pytest
+import central_management as central
+from common import Message, MessageType, SendType
+from fake_hardware import FakeGPIO
+from inventory_store import InventoryStore
+from led_controller import LEDController
+
+def batch(*items):
+    return Message(MessageType.INVENTORY_BATCH_FROM_WARE, SendType.SEND_FROM_WAREHOUSE, items=list(items))
+
+@pytest.fixture
+def gpio(monkeypatch):
+    """재고와 LED를 새로 만들고, LED 출력은 이 테스트 전용 가짜 GPIO로."""
+    gpio = FakeGPIO()
+    monkeypatch.setattr(central, "inventory", InventoryStore(zone.label for zone in central.zone_registry))
+    monkeypatch.setattr(central, "leds", LEDController.from_registry(central.zone_registry, lambda: gpio))
+    monkeypatch.setattr(central, "wal", None)
+    return gpio
+
+def test_inventory_batch_updates_known_zones_and_leds_in_one_output(gpio, monkeypatch):
+    central.handle_inventory_batch(batch(("A구역", 10), ("B 구역", 1), ("Z구역", 5)))
+    assert central.inventory.snapshot() == {"A 구역": 10, "B 구역": 1}
+    # A는 재고가 충분해 꺼진 그대로, B만 재고 부족으로 켜짐
+    assert central.leds.writes == 1
+    assert gpio.values == {27: gpio.LOW, 5: gpio.HIGH}
+
+    outputs = []
+    monkeypatch.setattr(gpio, "output", lambda pins, values: outputs.append((pins, values)))
+    central.handle_inventory_batch(batch(("A구역", 0), ("B구역", 20)))
+    assert outputs == [([27, 5], [gpio.HIGH, gpio.LOW])]
+
+class TwoShards:
+    """A 구역은 샤드 0, 나머지는 샤드 1이 담당. 이 프로세스는 샤드 0."""
+    index = 0
+    count = 2
+
+    def __init__(self):
+        self.sent = []
+
+    def owner_of(self, zone_id):
+        return 0 if zone_id == "A" else 1
+
+    def send(self, owner, item):
+        self.sent.append((owner, item))
+
+def test_inventory_batch_is_split_between_shards(monkeypatch):
+    shards = TwoShards()
+    monkeypatch.setattr(central, "shards", shards)
+
+    local = central.route_to_shard(batch(("A구역", 1), ("B구역", 2), ("A 구역", 3)))
+    assert local.items == [("A구역", 1), ("A 구역", 3)]
+    [(owner, (_, forwarded))] = shards.sent
+    assert owner == 1 and forwarded.items == [("B구역", 2)]
+
+    shards.sent.clear()
+    assert central.route_to_shard(batch(("B구역", 4))) is None
+    assert shards.sent[0][1][1].items == [("B구역", 4)]
@@ -0,0 +1,53 @@
+import socket
+import struct
+import threading
+import pytest
+from common import Message, MessageType, SendType, encode_frame
+from client_connection import ResilientConnection
+
+@pytest.fixture
+def server():
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.bind(("127.0.0.1", 0))
+    listener.listen(4)
+    listener.settimeout(5)
+    yield listener
+    listener.close()
+
+def accept_and_read_hello(listener):
+    conn, _ = listener.accept()
+    conn.settimeout(5)
+    assert conn.recv(4096)  # hello
+    return conn
+
+@pytest.mark.parametrize("garbage", [
+    struct.pack("!I", 3) + bytes([99, 1, 0]),           # 알 수 없는 메시지 종류
+    struct.pack("!I", 4) + bytes([2, 1, 0x01, 9]),      # 잘린 구역 이름
+    struct.pack("!I", 2) + bytes([2, 1]),               # 잘린 헤더
+])
+def test_malformed_frame_triggers_reconnect(server, garbage):
+    received = []
+    delivered = threading.Event()
+    hello = Message(MessageType.WORK_ORDER, SendType.SEND_FROM_WORKER, content="station-1")
+    client = ResilientConnection(*server.getsockname(), hello=[hello], initial_backoff=0.05, max_backoff=0.1,
+                                 on_message=lambda msg: (received.append(msg), delivered.set()))
+    client.start()
+    try:
+        first = accept_and_read_hello(server)
+        first.sendall(garbage)
+        # 클라이언트가 망가진 연결을 끊고
+        assert first.recv(4096) == b""
+        first.close()
+
+        # 백오프 후 다시 접속해 정상 메시지를 받음
+        second = accept_and_read_hello(server)
+        order = Message(MessageType.WORK_ORDER, SendType.SEND_FROM_CENTRAL, content="A구역 재고 부족", order_id=1)
+        second.sendall(encode_frame(order))
+        assert delivered.wait(5)
+        assert received[0].order_id == 1
+        assert client.thread.is_alive()
+        assert client.connected.is_set()
+        assert client.attempt == 0
+        second.close()
+    finally:
+        client.close()
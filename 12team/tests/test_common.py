@@ -0,0 +1,88 @@
+import pickle
+import struct
+import pytest
+from common import (Message, MessageType, SendType, CODEC_BINARY, CODEC_PICKLE, MAX_BATCH_ITEMS, FrameBuffer,
+                    encode_frame, set_codec)
+
+def inventory(zone="A 구역", quantity=3):
+    return Message(MessageType.INVENTORY_UPDATE_FROM_WARE, SendType.SEND_FROM_WAREHOUSE, zone=zone, quantity=quantity)
+
+@pytest.fixture
+def pickle_codec():
+    set_codec(CODEC_PICKLE)
+    yield
+    set_codec(CODEC_BINARY)
+
+@pytest.mark.parametrize("msg", [
+    inventory(),
+    inventory(quantity=-5),
+    Message(MessageType.WORK_ORDER, SendType.SEND_FROM_CENTRAL, content="A구역 재고 부족", zone="A",
+            order_id=2 ** 40, priority=7),
+    Message(MessageType.INVENTORY_BATCH_FROM_WARE, SendType.SEND_FROM_WAREHOUSE, items=[("A 구역", 1), ("B 구역", 0)]),
+    Message(MessageType.HEARTBEAT, SendType.SEND_FROM_CENTRAL),
+])
+def test_binary_round_trip(msg):
+    decoded = Message.deserialize(msg.serialize())
+    for field in ("type", "send_type", "content", "zone", "quantity", "items", "order_id", "priority"):
+        assert getattr(decoded, field) == getattr(msg, field)
+
+@pytest.mark.parametrize("data", [
+    b"",
+    bytes([99, 1, 0]),                                # 알 수 없는 type
+    bytes([1, 9, 0]),                                 # 알 수 없는 send_type
+    bytes([1, 1, 0x40]),                              # 알 수 없는 플래그
+    bytes([2, 1]),                                    # 헤더가 잘림
+    bytes([2, 1, 0x01, 5]) + b"A",                    # 구역 길이 5인데 1바이트
+    bytes([2, 1, 0x02, 0, 0]),                        # 수량이 잘림
+    bytes([1, 1, 0x04, 0, 9]) + b"abc",               # content가 잘림
+    bytes([4, 1, 0x08, 0, 2, 1]) + b"A" + struct.pack("!i", 1),  # 항목 수보다 데이터가 적음
+    bytes([2, 1, 0x01, 1]) + b"\xff",                 # 잘못된 UTF-8
+    inventory().serialize() + b"\x00",                # 뒤에 남는 데이터
+])
+def test_malformed_input_raises_value_error(data):
+    with pytest.raises(ValueError):
+        Message.deserialize(data)
+
+class Exploit:
+    def __reduce__(self):
+        return (exec, ("raise SystemExit('pickle payload executed')",))
+
+def test_pickle_frames_rejected_by_default():
+    with pytest.raises(ValueError):
+        Message.deserialize(pickle.dumps(Exploit(), protocol=pickle.HIGHEST_PROTOCOL))
+    with pytest.raises(ValueError):
+        Message.deserialize(inventory().serialize(CODEC_PICKLE))
+
+def test_pickle_accepted_when_legacy_codec_enabled(pickle_codec):
+    data = inventory(quantity=9).serialize()
+    assert data[0] == 0x80
+    assert Message.deserialize(data).quantity == 9
+
+@pytest.mark.parametrize("kwargs", [dict(zone="z" * 256), dict(content="c" * 65536), dict(zone="A", quantity=2 ** 40)])
+def test_unencodable_values_raise_value_error(kwargs):
+    with pytest.raises(ValueError):
+        Message(MessageType.WORK_ORDER, SendType.SEND_FROM_CENTRAL, **kwargs).serialize()
+
+def test_batch_carries_many_zones_and_rejects_too_many_items():
+    items = [(f"{index} 구역", index - 500) for index in range(1024)]
+    batch = Message(MessageType.INVENTORY_BATCH_FROM_WARE, SendType.SEND_FROM_WAREHOUSE, items=items)
+    assert Message.deserialize(batch.serialize()).items == items
+
+    batch.items = [("A 구역", 0)] * (MAX_BATCH_ITEMS + 1)
+    with pytest.raises(ValueError):
+        batch.serialize()
+
+def test_frame_buffer_reassembles_split_and_large_frames():
+    frames = [encode_frame(inventory(quantity=i)) for i in range(50)]
+    frames.append(encode_frame(Message(MessageType.WORK_ORDER, SendType.SEND_FROM_CENTRAL, content="x" * 3000)))
+    stream = b"".join(frames)
+    buffer = FrameBuffer(size=64)
+    received = []
+    for start in range(0, len(stream), 7):
+        chunk = stream[start:start + 7]
+        space = buffer.get_buffer()
+        space[:len(chunk)] = chunk
+        buffer.buffer_updated(len(chunk))
+        received.extend(buffer.messages())
+    assert [msg.quantity for msg in received[:50]] == list(range(50))
+    assert received[50].content == "x" * 3000
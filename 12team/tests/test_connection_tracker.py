@@ -0,0 +1,25 @@
+from connection_tracker import ConnectionTracker
+
+def test_reap_closes_only_idle_connections_and_reports_them():
+    closed, reaped = [], []
+    tracker = ConnectionTracker(idle_timeout=30, on_reap=reaped.append)
+    idle = tracker.register("idle", ("10.0.0.1", 5000), lambda: closed.append("idle"))
+    busy = tracker.register("busy", ("10.0.0.2", 5000), lambda: closed.append("busy"))
+    idle.last_seen -= 60
+
+    assert tracker.reap(now=busy.last_seen + 1) == [idle]
+    assert closed == ["idle"] and reaped == ["idle"]
+    assert len(tracker) == 1
+    assert tracker.reap(now=busy.last_seen + 1) == []  # 이미 정리한 연결은 다시 끊지 않음
+
+def test_reap_continues_when_close_fails():
+    reaped = []
+    tracker = ConnectionTracker(idle_timeout=1, on_reap=reaped.append)
+
+    def broken_close():
+        raise OSError("already closed")
+
+    first = tracker.register("first", "a", broken_close)
+    tracker.register("second", "b", lambda: None)
+    assert len(tracker.reap(now=first.last_seen + 5)) == 2
+    assert sorted(reaped) == ["first", "second"]
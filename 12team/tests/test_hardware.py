@@ -0,0 +1,13 @@
+import fake_hardware
+import hardware
+
+def test_mock_backend_hands_out_the_shared_fake_devices():
+    backend = hardware.use_backend(hardware.BACKEND_MOCK)
+    assert backend.gpio() is fake_hardware.gpio
+    pressed = []
+    backend.gpio().add_event_detect(26, fake_hardware.gpio.FALLING, callback=pressed.append)
+    fake_hardware.gpio.press(26)
+    assert pressed == [26]
+
+    fake_hardware.FakeMFRC522.tap(1234)
+    assert backend.rfid_reader().read() == (1234, "")
@@ -0,0 +1,33 @@
+import random
+from task_scheduler import IndexedMinHeap, WorkerScheduler
+
+def test_indexed_heap_matches_sorted_order_after_updates_and_removals():
+    rng = random.Random(1)
+    heap = IndexedMinHeap()
+    keys = {}
+    for step in range(2000):
+        item = rng.randrange(50)
+        if item in keys and rng.random() < 0.3:
+            heap.remove(item)
+            del keys[item]
+        else:
+            keys[item] = rng.random()
+            heap.push(item, keys[item])
+        if keys:
+            assert heap.peek() == min(keys, key=keys.get)
+    assert len(heap) == len(keys)
+
+def test_scheduler_prefers_faster_worker_and_forgets_checked_out_load():
+    scheduler = WorkerScheduler(default_task_time=60.0)
+    scheduler.check_in("fast")
+    scheduler.check_in("slow")
+    scheduler.complete("fast", 10.0)
+    scheduler.complete("slow", 100.0)
+    assigned = [scheduler.assign() for _ in range(6)]
+    assert assigned.count("fast") > assigned.count("slow")
+
+    scheduler.check_out("fast")
+    assert scheduler.outstanding.get("fast") is None
+    assert scheduler.assign() == "slow"
+    scheduler.check_out("slow")
+    assert scheduler.assign() is None
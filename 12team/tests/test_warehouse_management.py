@@ -0,0 +1,9 @@
+from common import Message, MessageType
+import warehouse_management as warehouse
+
+def test_inventory_batches_are_split_by_batch_size(monkeypatch):
+    monkeypatch.setattr(warehouse, "BATCH_SIZE", 2)
+    batches = warehouse.make_inventory_batches([("A", 1), ("B", 2), ("C", 3)])
+    assert all(batch.type == MessageType.INVENTORY_BATCH_FROM_WARE for batch in batches)
+    assert [batch.items for batch in batches] == [[("A구역", 1), ("B구역", 2)], [("C구역", 3)]]
+    assert warehouse.make_inventory_batches([]) == []
@@ -0,0 +1,65 @@
+from common import Message, MessageType, SendType
+from work_order_broker import WorkOrderBroker
+from write_ahead_log import WriteAheadLog
+
+def order(content, zone="A 구역"):
+    return Message(MessageType.WORK_ORDER, SendType.SEND_FROM_WAREHOUSE, content, zone=zone)
+
+def deliver(broker, station_id="station"):
+    """대기 중인 작업 지시를 모두 station_id로 전달하고 전달한 메시지 목록을 반환."""
+    sent = []
+    broker.dispatch_pending(lambda msg: sent.append(msg) or station_id)
+    return sent
+
+def test_orders_are_dispatched_by_priority_then_arrival():
+    broker = WorkOrderBroker()
+    broker.submit(order("low"), 1)
+    broker.submit(order("high"), 9)
+    broker.submit(order("low again"), 1)
+    assert [msg.content for msg in deliver(broker)] == ["high", "low", "low again"]
+    assert broker.inflight_count() == 3 and broker.pending_count() == 0
+
+def test_unacked_order_is_redelivered_after_timeout_but_acked_one_is_not():
+    broker = WorkOrderBroker(ack_timeout=10)
+    first = broker.submit(order("first"))
+    second = broker.submit(order("second"))
+    deliver(broker)
+
+    assert broker.ack(first.order_id) is first
+    assert broker.ack(first.order_id) is None  # 중복 응답
+    assert broker.requeue_expired(now=second.deadline - 1) == []
+    assert broker.requeue_expired(now=second.deadline) == ["station"]
+    assert [msg.order_id for msg in deliver(broker, "other")] == [second.order_id]
+    assert second.attempts == 2
+
+def test_orders_of_disconnected_station_are_requeued():
+    broker = WorkOrderBroker()
+    broker.submit(order("kept"))
+    deliver(broker, "gone")
+    broker.submit(order("elsewhere"))
+    deliver(broker, "alive")
+    assert broker.requeue_station("gone") == 1
+    assert [msg.content for msg in deliver(broker, "alive")] == ["kept"]
+
+def test_send_without_station_keeps_order_pending():
+    broker = WorkOrderBroker()
+    broker.submit(order("waiting"))
+    assert broker.dispatch_pending(lambda msg: None) == 0
+    assert broker.pending_count() == 1
+
+def test_unacked_orders_are_recovered_from_log(tmp_path):
+    wal = WriteAheadLog(str(tmp_path))
+    wal.recover()
+    wal.start()
+    broker = WorkOrderBroker(wal)
+    done = broker.submit(order("done"))
+    broker.submit(order("open"), 5)
+    broker.ack(done.order_id)
+    wal.close()
+
+    wal = WriteAheadLog(str(tmp_path))
+    _, records = wal.recover()
+    restarted = WorkOrderBroker(wal)
+    assert restarted.recover(records) == 1
+    assert [msg.content for msg in deliver(restarted)] == ["open"]
+    assert restarted.submit(order("new")).order_id == 3  # 번호는 이어서 부여
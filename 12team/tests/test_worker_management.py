@@ -0,0 +1,99 @@
+import threading
+import pytest
+import worker_management as wm
+import bench_e2e
+from task_scheduler import WorkerScheduler
+
+@pytest.fixture
+def station(monkeypatch):
+    """workers.json 명단으로 작업자 상태를 초기화 (모두 퇴근, 업무 없음)."""
+    monkeypatch.setattr(wm, "scheduler", WorkerScheduler())
+    monkeypatch.setattr(wm, "central_connection", None)
+    wm.unassigned_tasks.clear()
+    wm.received_orders.clear()
+    for _, worker in wm.roster:
+        wm.attendance_states[worker["uid"]] = False
+        worker["last_press_time"] = 0
+        while not worker["queue"].empty():
+            worker["queue"].get_nowait()
+    return [(name, worker) for name, worker in wm.roster]
+
+def queued(worker):
+    return [order_id for order_id, _, _ in list(worker["queue"].queue)]
+
+def test_tasks_go_to_least_loaded_worker(station):
+    (_, first), (_, second) = station[:2]
+    wm.toggle_work_state(first["uid"])
+    wm.toggle_work_state(second["uid"])
+    for order_id in range(6):
+        wm.assign_task(f"task {order_id}", order_id)
+    assert len(queued(first)) == len(queued(second)) == 3
+
+def test_duplicate_order_is_ignored(station):
+    (_, first) = station[0]
+    wm.toggle_work_state(first["uid"])
+    wm.assign_task("task", 7)
+    wm.assign_task("task", 7)
+    assert queued(first) == [7]
+
+def test_check_out_reassigns_queued_tasks(station):
+    (_, first), (_, second) = station[:2]
+    wm.toggle_work_state(first["uid"])
+    wm.toggle_work_state(second["uid"])
+    for order_id in range(4):
+        wm.assign_task(f"task {order_id}", order_id)
+
+    wm.toggle_work_state(first["uid"])  # 퇴근
+    assert queued(first) == []
+    assert sorted(queued(second)) == [0, 1, 2, 3]
+
+    wm.toggle_work_state(second["uid"])  # 마지막 작업자도 퇴근하면 대기 목록으로
+    assert sorted(order_id for order_id, _ in wm.unassigned_tasks) == [0, 1, 2, 3]
+
+    wm.toggle_work_state(first["uid"])  # 다시 출근하면 대기 업무를 받음
+    assert sorted(queued(first)) == [0, 1, 2, 3]
+    assert not wm.unassigned_tasks
+
+def test_button_press_completes_task_and_does_not_block_on_empty_queue(station, monkeypatch):
+    name, worker = station[0]
+    acked = []
+    monkeypatch.setattr(wm, "acknowledge_order", acked.append)
+    wm.toggle_work_state(worker["uid"])
+    wm.assign_task("task", 3)
+
+    wm.handle_button_press(worker["button_pin"])
+    assert acked == [3]
+
+    # 큐가 빈 상태의 버튼 입력은 바로 돌아와야 함 (블록하면 모든 버튼 콜백이 멈춤)
+    worker["last_press_time"] = 0
+    presser = threading.Thread(target=wm.handle_button_press, args=(worker["button_pin"],), daemon=True)
+    presser.start()
+    presser.join(2)
+    assert not presser.is_alive()
+
+def test_assignment_racing_check_in_leaves_nothing_waiting(station):
+    (_, first) = station[0]
+    total = 2000
+    started = threading.Event()
+
+    def assign_all():
+        started.set()
+        for order_id in range(total):
+            wm.assign_task("task", order_id)
+
+    assigner = threading.Thread(target=assign_all)
+    assigner.start()
+    started.wait()
+    wm.toggle_work_state(first["uid"])  # 배정 도중 출근
+    assigner.join()
+    # 출근 전에 대기 목록에 들어간 업무도 출근하면서 모두 배정되어야 함
+    assert not wm.unassigned_tasks
+    assert len(queued(first)) == total
+
+def test_mock_hardware_station_acks_order_end_to_end(station, tmp_path):
+    port = bench_e2e.free_port()
+    server = bench_e2e.LocalCentral(bench_e2e.central.ENGINE_THREAD, port, str(tmp_path), bench_e2e.DEFAULT_FLUSH_POLICY)
+    try:
+        assert bench_e2e.check_hardware_station(server, port, bench_e2e.DEFAULT_FLUSH_POLICY, orders=2)
+    finally:
+        server.stop()
@@ -0,0 +1,83 @@
+import json
+import os
+import threading
+import pytest
+from worker_roster import WorkerRoster
+
+def write_roster(path, workers):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"workers": workers}, f)
+    # 수정 시각 해상도가 낮은 파일 시스템에서도 바뀐 것으로 보이도록
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+@pytest.fixture
+def roster_path(tmp_path):
+    path = str(tmp_path / "workers.json")
+    write_roster(path, [{"name": "a", "uid": 1, "button_pin": 18}, {"name": "b", "uid": 2, "button_pin": 19}])
+    return path
+
+def test_reload_keeps_state_of_remaining_workers(roster_path):
+    roster = WorkerRoster.load(roster_path)
+    worker = roster.get("a")
+    worker["queue"].put((1, "task", 0))
+    write_roster(roster_path, [{"name": "a", "uid": 5, "button_pin": 20}, {"name": "c", "uid": 3, "button_pin": 21}])
+    change = roster.reload()
+    assert roster.get("a") is worker and worker["queue"].qsize() == 1
+    assert roster.find_by_uid(5) == ("a", worker) and roster.find_by_uid(1) is None
+    assert roster.find_by_pin(20) == ("a", worker)
+    assert change.added == ["c"] and list(change.removed) == ["b"]
+    assert change.uid_changes == {"a": (1, 5)}
+    assert sorted(change.added_pins) == [20, 21] and sorted(change.removed_pins) == [18, 19]
+
+@pytest.mark.parametrize("workers", [
+    [{"name": "a", "uid": 5, "button_pin": 18}, {"name": "b", "uid": 5, "button_pin": 19}],   # UID 중복
+    [{"name": "a", "uid": 1, "button_pin": 18}, {"name": "a", "uid": 2, "button_pin": 19}],   # 이름 중복
+    [{"name": "a", "uid": 1, "button_pin": 18}, {"name": "b", "uid": 2, "button_pin": 18}],   # 핀 중복
+    [{"name": "a", "uid": None, "button_pin": 18}],                                           # UID 없음
+    [{"name": "a", "uid": "abc", "button_pin": 18}],
+    [{"name": "a", "uid": 1, "button_pin": "18"}],
+    [{"uid": 1}],
+    ["a"],
+])
+def test_invalid_roster_is_rejected_without_touching_workers(roster_path, workers):
+    roster = WorkerRoster.load(roster_path)
+    before = {name: dict(worker) for name, worker in roster}
+    by_uid, by_pin = dict(roster.by_uid), dict(roster.by_pin)
+    write_roster(roster_path, workers)
+    with pytest.raises(ValueError):
+        roster.reload()
+    assert {name: dict(worker) for name, worker in roster} == before
+    assert roster.by_uid == by_uid and roster.by_pin == by_pin
+
+def test_watcher_survives_invalid_file_and_applies_next_valid_one(roster_path):
+    roster = WorkerRoster.load(roster_path)
+    changes = []
+    applied = threading.Event()
+    stop = threading.Event()
+    watcher = threading.Thread(target=roster.watch,
+                               args=(lambda change: (changes.append(change), applied.set()), stop, 0.01),
+                               daemon=True)
+    watcher.start()
+    try:
+        write_roster(roster_path, [{"name": "a", "uid": None, "button_pin": 18}])
+        assert not applied.wait(0.2)
+        assert watcher.is_alive()
+        assert roster.find_by_uid(1) is not None
+
+        write_roster(roster_path, [{"name": "a", "uid": 1, "button_pin": 18}])
+        assert applied.wait(2)
+        assert list(changes[0].removed) == ["b"]
+    finally:
+        stop.set()
+        watcher.join(1)
+
+def test_attendance_follows_swapped_cards(roster_path, monkeypatch):
+    import worker_management as wm
+    roster = WorkerRoster.load(roster_path)
+    monkeypatch.setattr(wm, "roster", roster)
+    monkeypatch.setattr(wm, "attendance_states", {1: True, 2: False})
+    write_roster(roster_path, [{"name": "a", "uid": 2, "button_pin": 18}, {"name": "b", "uid": 1, "button_pin": 19}])
+    wm.apply_roster_change(roster.reload())
+    # a는 출근 상태 그대로 새 카드(2)로, b는 퇴근 상태로 새 카드(1)로
+    assert wm.attendance_states == {2: True, 1: False}
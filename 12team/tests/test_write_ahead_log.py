@@ -0,0 +1,77 @@
+import os
+import pytest
+from common import Message, MessageType, SendType
+from write_ahead_log import WriteAheadLog
+
+def update(zone, quantity):
+    return Message(MessageType.INVENTORY_UPDATE_FROM_WARE, SendType.SEND_FROM_CENTRAL, zone=zone, quantity=quantity)
+
+def open_wal(directory):
+    """재시작한 서버처럼 복구한 뒤 기록을 시작."""
+    wal = WriteAheadLog(str(directory))
+    recovered = wal.recover()
+    wal.start()
+    return wal, recovered
+
+def segment_paths(directory):
+    return sorted(path for path in directory.iterdir() if path.name.startswith("wal-"))
+
+def test_records_survive_restart(tmp_path):
+    wal, _ = open_wal(tmp_path)
+    wal.append(update("A 구역", 5))
+    wal.append(Message(MessageType.INVENTORY_BATCH_FROM_WARE, SendType.SEND_FROM_CENTRAL,
+                       items=[("A 구역", 7), ("B 구역", 2)]), wait=True)
+    wal.close()
+
+    wal, (inventory, tail) = open_wal(tmp_path)
+    assert inventory == {"A 구역": 7, "B 구역": 2}
+    assert [seq for seq, _ in tail] == [1, 2]
+    assert wal.append(update("B 구역", 1)) == 3  # 시퀀스는 이어서 부여
+    wal.close()
+
+@pytest.mark.parametrize("garbage", [
+    b"\x00\x00\x00",                                    # 헤더도 다 쓰지 못함
+    b"\x00\x00\x00\x10" + b"\x00" * 12 + b"short",      # 길이만큼 쓰지 못함
+    b"\x00\x00\x00\x01" + b"\xff" * 12 + b"x",          # CRC 불일치
+])
+def test_torn_tail_is_truncated_and_new_records_recovered(tmp_path, garbage):
+    wal, _ = open_wal(tmp_path)
+    wal.append(update("A 구역", 5), wait=True)
+    wal.close()
+    [segment] = segment_paths(tmp_path)
+    intact = segment.stat().st_size
+    with open(segment, "ab") as f:
+        f.write(garbage)
+
+    wal, (inventory, tail) = open_wal(tmp_path)
+    assert inventory == {"A 구역": 5} and len(tail) == 1
+    assert segment.stat().st_size == intact
+    wal.append(update("A 구역", 6), wait=True)
+    wal.close()
+
+    wal, (inventory, tail) = open_wal(tmp_path)
+    wal.close()
+    assert inventory == {"A 구역": 6}
+    assert [seq for seq, _ in tail] == [1, 2]
+
+def test_snapshot_replaces_old_segments(tmp_path):
+    wal, _ = open_wal(tmp_path)
+    for quantity in range(3):
+        wal.append(update("A 구역", quantity))
+    seq, old_segments = wal.begin_snapshot()
+    wal.finish_snapshot(seq, {"A 구역": 2}, old_segments)
+    wal.append(update("B 구역", 9), wait=True)
+    wal.close()
+
+    assert not any(os.path.exists(path) for path in old_segments)
+    wal, (inventory, tail) = open_wal(tmp_path)
+    wal.close()
+    assert inventory == {"A 구역": 2, "B 구역": 9}
+    assert [seq for seq, _ in tail] == [4]
+
+def test_close_before_start_does_not_fail(tmp_path):
+    wal = WriteAheadLog(str(tmp_path))
+    wal.recover()
+    wal.append(update("A 구역", 1))
+    wal.close()
+    assert segment_paths(tmp_path) == []
@@ -1,7 +1,19 @@
-import socket
+import argparse
 import time
-from common import Message, MessageType, SendType, CENTRAL_SERVER_IP, CENTRAL_SERVER_PORT
-from socket_util import create_and_connect_socket
+from common import Message, MessageType, SendType, send_message, send_messages, CENTRAL_SERVER_IP, CENTRAL_SERVER_PORT
+from client_connection import ResilientConnection
+from socket_writer import FlushPolicy, DEFAULT_FLUSH_POLICY, DEFAULT_FLUSH_BYTES
+from sensor_source import FunctionSource, ZoneMonitor
+from zone_registry import ZoneRegistry, DEFAULT_ZONES_CONFIG
+from log_util import get_logger, setup_logging, DEFAULT_LEVEL
+
+log = get_logger("warehouse")
+
+# 구역별 polling 간격 범위(초)
+MIN_POLL_INTERVAL = 0.5
+MAX_POLL_INTERVAL = 5.0
+BULK_POLL_INTERVAL = 5.0  # 일괄 대조 모드의 전체 구역 확인 주기
+BATCH_SIZE = 1024  # 일괄 재고 업데이트 메시지 하나에 담는 최대 구역 수
 
 
 # 예제 데이터: 각 구역별 센서와 수기 입력 데이터를 가져오는 함수
@@ -20,15 +32,37 @@ def update_inventory(server_socket, zone, updated_inventory):
     msg = Message(
         type=MessageType.INVENTORY_UPDATE_FROM_WARE,
         send_type=SendType.SEND_FROM_WAREHOUSE,
-        content=f"{zone}구역: {updated_inventory}",
+        zone=f"{zone}구역",
+        quantity=updated_inventory,
     )
-    server_socket.send(msg.serialize())
-    print(f"{zone}구역 재고 업데이트 완료")
+    send_message(server_socket, msg)
+    log.debug("재고 업데이트 전송", zone=zone, quantity=updated_inventory)
 
-def compare_inventory_and_notify(server_socket, zone):
-    """특정 구역의 센서 데이터와 수기 데이터를 비교하고, 더 작은 재고로 업데이트 후 업무 지시."""
-    sensor_data = get_sensor_data(zone)
-    manual_data = get_manual_data(zone)
+def mismatch_priority(difference):
+    """재고 차이가 클수록 작업 지시 우선순위를 높게 (0 ~ 65535)."""
+    return min(abs(int(difference)), 0xFFFF)
+
+def make_inventory_batches(updates):
+    """[(구역, 재고), ...]를 BATCH_SIZE 단위의 일괄 재고 업데이트 메시지들로 묶음."""
+    items = [(f"{zone}구역", quantity) for zone, quantity in updates]
+    return [
+        Message(
+            type=MessageType.INVENTORY_BATCH_FROM_WARE,
+            send_type=SendType.SEND_FROM_WAREHOUSE,
+            items=items[start:start + BATCH_SIZE],
+        )
+        for start in range(0, len(items), BATCH_SIZE)
+    ]
+
+def compare_inventory_and_notify(server_socket, zone, sensor_data=None, manual_data=None):
+    """
+    특정 구역의 센서 데이터와 수기 데이터를 비교하고, 더 작은 재고로 업데이트 후 업무 지시.
+    이미 읽은 값이 있으면 넘겨받아 다시 읽지 않음.
+    """
+    if sensor_data is None:
+        sensor_data = get_sensor_data(zone)
+    if manual_data is None:
+        manual_data = get_manual_data(zone)
 
     if sensor_data != manual_data:
         # 더 작은 값으로 재고 업데이트
@@ -43,42 +77,93 @@ def compare_inventory_and_notify(server_socket, zone):
             type=MessageType.WORK_ORDER,
             send_type=SendType.SEND_FROM_WAREHOUSE,
             content=message_content,
+            zone=f"{zone}구역",
+            priority=mismatch_priority(sensor_data - manual_data),
         )
-        server_socket.send(msg.serialize())
-        print(f"업무 지시 전송 완료")
+        send_message(server_socket, msg)
+        log.info("업무 지시 전송", zone=zone, sensor=sensor_data, manual=manual_data)
     else:
-        print(f"{zone}구역 재고 데이터가 일치합니다. 추가 작업 필요 없음.")
+        log.debug("재고 데이터 일치", zone=zone, quantity=sensor_data)
 
-if __name__ == "__main__":
-    server_socket = create_and_connect_socket(CENTRAL_SERVER_IP, CENTRAL_SERVER_PORT)
-    
-    # 각 구역의 이전 상태를 저장할 변수
-    previous_sensor_data = {"A": None, "B": None}
-    previous_manual_data = {"A": None, "B": None}
+def run_bulk_reconciliation(server_socket, registry, sensor_source, manual_source, interval=BULK_POLL_INTERVAL):
+    """
+    구역이 많은 창고용: 모든 구역을 한 번에 읽어 배열로 대조하고,
+    불일치 구역에 대해서만 재고 업데이트와 업무 지시를 전송.
+    """
+    # NumPy는 일괄 대조 모드에서만 필요
+    from reconciliation import ReconciliationEngine
 
-    try:
-        while True:
-            # A구역과 B구역의 재고를 각각 확인
-            for zone in ["A", "B"]:
-                # 현재 센서 및 수기 데이터를 가져오기
-                sensor_data = get_sensor_data(zone)
-                manual_data = get_manual_data(zone)
+    engine = ReconciliationEngine(registry)
+    zone_ids = registry.ids
+
+    while True:
+        engine.load(sensor_source.read_all(zone_ids), manual_source.read_all(zone_ids))
+        result = engine.reconcile()
+
+        mismatched_zones = [zone_ids[index] for index in result.mismatched.tolist()]
+        if mismatched_zones:
+            # 재고는 일괄 메시지로, 업무 지시는 구역별로 만들어 한 번에 전송
+            messages = make_inventory_batches(zip(mismatched_zones, result.updated.tolist()))
+            messages += [
+                Message(
+                    type=MessageType.WORK_ORDER,
+                    send_type=SendType.SEND_FROM_WAREHOUSE,
+                    content=f"{zone}구역 재고 불일치",
+                    zone=f"{zone}구역",
+                    priority=mismatch_priority(difference),
+                )
+                for zone, difference in zip(mismatched_zones, result.difference.tolist())
+            ]
+            send_messages(server_socket, messages)
+        if len(result.changed):
+            log.info("일괄 대조", changed=len(result.changed), mismatched=len(result.mismatched))
 
-                # 이전 상태와 비교하여 변화가 있는지 확인
-                if (sensor_data != previous_sensor_data[zone] or 
-                    manual_data != previous_manual_data[zone]):
-                    compare_inventory_and_notify(server_socket, zone)
+        time.sleep(interval)
 
-                    # 이전 상태를 업데이트
-                    previous_sensor_data[zone] = sensor_data
-                    previous_manual_data[zone] = manual_data
+def parse_args():
+    parser = argparse.ArgumentParser(description="창고 재고 관리")
+    parser.add_argument("--zones-config", default=DEFAULT_ZONES_CONFIG, help="구역 설정 파일 (JSON)")
+    parser.add_argument("--log-level", default=DEFAULT_LEVEL, help="로그 레벨 (DEBUG, INFO, WARNING, ERROR)")
+    parser.add_argument("--flush-latency-ms", type=float, default=DEFAULT_FLUSH_POLICY.latency * 1000,
+                        help="재고 업데이트와 업무 지시를 모아 보내는 최대 시간(밀리초). 0이면 바로 전송")
+    parser.add_argument("--flush-bytes", type=int, default=DEFAULT_FLUSH_BYTES,
+                        help="이만큼(바이트) 모이면 대기 시간과 관계없이 바로 전송")
+    parser.add_argument("--low-latency", action="store_true",
+                        help="TCP_NODELAY를 켜고 모으지 않고 바로 전송")
+    parser.add_argument("--bulk", action="store_true", help="모든 구역을 배열로 한 번에 대조 (구역이 많을 때)")
+    return parser.parse_args()
 
-            # 주기적으로 감지 (5초 대기)
-            time.sleep(5)
+if __name__ == "__main__":
+    args = parse_args()
+    setup_logging(args.log_level)
+    registry = ZoneRegistry.load(args.zones_config)
+    # 끊기면 자동 재접속. 끊긴 동안의 재고/업무 지시 메시지는 보관했다가 재접속 후 전송
+    # 한 구역의 재고 업데이트와 업무 지시처럼 연달아 보내는 메시지는 flush_policy에 따라 묶어서 전송
+    flush_policy = FlushPolicy(args.flush_latency_ms / 1000, args.flush_bytes, args.low_latency)
+    server_socket = ResilientConnection(CENTRAL_SERVER_IP, CENTRAL_SERVER_PORT, flush_policy=flush_policy).start()
+
+    # 센서/수기 데이터 공급원. push를 지원하는 공급원으로 바꾸면 변화 즉시 감지됨
+    sensor_source = FunctionSource(get_sensor_data)
+    manual_source = FunctionSource(get_manual_data)
 
+    try:
+        if args.bulk:
+            run_bulk_reconciliation(server_socket, registry, sensor_source, manual_source)
+        else:
+            monitor = ZoneMonitor(
+                registry.ids,
+                sensor_source,
+                manual_source,
+                on_change=lambda zone, sensor_data, manual_data: compare_inventory_and_notify(
+                    server_socket, zone, sensor_data, manual_data),
+                min_interval=MIN_POLL_INTERVAL,
+                max_interval=MAX_POLL_INTERVAL,
+            )
+            # 구역별로 변화가 감지될 때만 비교 및 전송
+            monitor.run()
     except KeyboardInterrupt:
-        print("프로그램 종료 요청.")
+        log.info("프로그램 종료 요청.")
     except Exception as e:
-        print(f"오류 발생: {e}")
+        log.exception("오류 발생", error=e)
     finally:
         server_socket.close()
@@ -0,0 +1,164 @@
+import heapq
+import itertools
+import threading
+import time
+from common import Message, MessageType, SendType
+
+MAX_PRIORITY = 0xFFFF
+
+class WorkOrder:
+    def __init__(self, order_id, msg, priority):
+        self.order_id = order_id
+        self.msg = msg
+        self.priority = priority
+        self.station_id = None  # 현재 전달된 스테이션
+        self.deadline = None    # 이 시각까지 완료 응답이 없으면 재전송
+        self.attempts = 0
+
+class WorkOrderBroker:
+    """
+    중앙 서버의 작업 지시 브로커.
+    - 우선순위가 높은 작업 지시부터 전달 (같으면 먼저 들어온 순서)
+    - 작업자가 완료 응답(WORK_ORDER_ACK)을 보낼 때까지 보관하고,
+      제한 시간이 지나거나 스테이션 연결이 끊기면 다시 전달 (at-least-once)
+    - 접수/완료를 WriteAheadLog에 기록해 재시작 후에도 미완료 작업을 복구
+    """
+    def __init__(self, wal=None, ack_timeout=600.0):
+        self.wal = wal
+        self.ack_timeout = ack_timeout
+        self.lock = threading.Lock()
+        self.orders = {}     # order_id -> WorkOrder (대기 + 전달됨)
+        self.pending = []    # (-priority, 순번, order_id) 힙
+        self.sequence = itertools.count()
+        # 작업 지시 번호는 id_step 간격으로 부여 (번호 % id_step == id_offset). 샤드마다 번호가 겹치지 않게 할 때 사용
+        self.id_offset = 0
+        self.id_step = 1
+        self.next_id = 1
+
+    def partition_ids(self, offset, step):
+        """이 브로커가 부여할 번호를 번호 % step == offset인 것으로 제한 (접수 전에 호출)."""
+        with self.lock:
+            self.id_offset = offset
+            self.id_step = step
+            self.next_id = self._align(self.next_id)
+
+    def _align(self, order_id):
+        """order_id 이상이면서 이 브로커가 부여할 수 있는 가장 작은 번호."""
+        return order_id + (self.id_offset - order_id) % self.id_step
+
+    def recover(self, records):
+        """로그 레코드 [(seq, Message), ...]로 미완료 작업 지시를 복구."""
+        with self.lock:
+            for _, msg in records:
+                if msg.order_id is None:
+                    continue
+                if msg.type == MessageType.WORK_ORDER:
+                    if msg.order_id not in self.orders:
+                        self.orders[msg.order_id] = WorkOrder(msg.order_id, msg, msg.priority or 0)
+                elif msg.type == MessageType.WORK_ORDER_ACK:
+                    self.orders.pop(msg.order_id, None)
+                self.next_id = max(self.next_id, self._align(msg.order_id + 1))
+            for order in self.orders.values():
+                self._push(order)
+            return len(self.orders)
+
+    def submit(self, msg, priority=0):
+        """새 작업 지시를 접수하고 번호를 부여."""
+        priority = max(0, min(int(priority), MAX_PRIORITY))
+        with self.lock:
+            order_id = self.next_id
+            self.next_id += self.id_step
+            order_msg = Message(MessageType.WORK_ORDER, SendType.SEND_FROM_CENTRAL, msg.content,
+                                zone=msg.zone, order_id=order_id, priority=priority)
+            order = WorkOrder(order_id, order_msg, priority)
+            self.orders[order_id] = order
+            if self.wal:
+                self.wal.append(order_msg)
+            self._push(order)
+        return order
+
+    def ack(self, order_id):
+        """완료 응답 처리. 처리한 WorkOrder를 반환 (이미 완료됐거나 모르는 번호면 None)."""
+        with self.lock:
+            order = self.orders.pop(order_id, None)
+            if order is not None and self.wal:
+                self.wal.append(Message(MessageType.WORK_ORDER_ACK, SendType.SEND_FROM_CENTRAL, order_id=order_id))
+        return order
+
+    def dispatch_pending(self, send):
+        """
+        대기 중인 작업 지시를 우선순위 순으로 send(msg)에 넘김.
+        send는 전달한 스테이션 ID를 반환하고, 받을 곳이 없으면 None을 반환 (그러면 중단).
+        전달한 작업 지시 수를 반환.
+        """
+        sent = 0
+        while True:
+            with self.lock:
+                order = self._pop()
+                if order is None:
+                    return sent
+            station_id = send(order.msg)
+            with self.lock:
+                if station_id is None:
+                    self._push(order)
+                    return sent
+                if order.order_id in self.orders:
+                    order.station_id = station_id
+                    order.deadline = time.monotonic() + self.ack_timeout
+                    order.attempts += 1
+            sent += 1
+
+    def requeue_expired(self, now=None):
+        """
+        제한 시간 안에 완료되지 않은 작업 지시를 다시 대기열에 넣음.
+        해당 작업 지시를 받았던 스테이션 ID 목록을 반환.
+        """
+        now = time.monotonic() if now is None else now
+        with self.lock:
+            expired = [order for order in self.orders.values()
+                       if order.deadline is not None and order.deadline <= now]
+            stations = [order.station_id for order in expired]
+            for order in expired:
+                self._requeue(order)
+        return stations
+
+    def requeue_station(self, station_id):
+        """연결이 끊긴 스테이션에 전달했던 미완료 작업 지시를 다시 대기열에 넣음."""
+        with self.lock:
+            orders = [order for order in self.orders.values() if order.station_id == station_id]
+            for order in orders:
+                self._requeue(order)
+        return len(orders)
+
+    def pending_count(self):
+        with self.lock:
+            return sum(1 for order in self.orders.values() if order.deadline is None)
+
+    def inflight_count(self):
+        with self.lock:
+            return sum(1 for order in self.orders.values() if order.deadline is not None)
+
+    def compact(self):
+        """미완료 작업 지시만 새 로그 세그먼트에 다시 기록하고 이전 세그먼트를 삭제."""
+        with self.lock:
+            seq, old_segments = self.wal.begin_snapshot()
+            for order in self.orders.values():
+                self.wal.append(order.msg)
+        self.wal.finish_snapshot(seq, {}, old_segments)
+
+    def _requeue(self, order):
+        order.station_id = None
+        order.deadline = None
+        self._push(order)
+
+    def _push(self, order):
+        heapq.heappush(self.pending, (-order.priority, next(self.sequence), order.order_id))
+
+    def _pop(self):
+        # 완료되었거나 이미 전달된 항목은 힙에 남아 있어도 건너뜀
+        while self.pending:
+            _, _, order_id = heapq.heappop(self.pending)
+            order = self.orders.get(order_id)
+            if order is not None and order.deadline is None:
+                return order
+        return None
@@ -1,244 +1,271 @@
-import RPi.GPIO as GPIO
-from mfrc522 import SimpleMFRC522
-from queue import Queue
+from collections import deque
+from queue import Empty
 import threading
 import socket
-from smbus2 import SMBus
 import time
-from common import Message, MessageType, SendType, CENTRAL_SERVER_IP, CENTRAL_SERVER_PORT
-from socket_util import create_and_connect_socket
-
-# GPIO 초기화
-GPIO.setwarnings(False)
-GPIO.setmode(GPIO.BCM)
-
-# 작업자 정보
-workers = {
-    "worker1": {"uid": 849156397443, "queue": Queue(), "is_working": False, "button_pin": 18, "last_press_time": 0},
-    "worker2": {"uid": 543047530896, "queue": Queue(), "is_working": False, "button_pin": 19, "last_press_time": 0},
-}
+from common import Message, MessageType, SendType, send_message, make_identification, CENTRAL_SERVER_IP, CENTRAL_SERVER_PORT
+from client_connection import ResilientConnection
+from display_queue import DisplayQueue
+from task_scheduler import WorkerScheduler
+from worker_roster import WorkerRoster, DEFAULT_ROSTER
+from log_util import get_logger, setup_logging
+import hardware
+
+log = get_logger("worker")
+
+# 작업자 스테이션 식별 정보 (중앙 서버의 작업 지시 라우팅에 사용)
+STATION_ID = socket.gethostname()
+STATION_ZONES = []  # 담당 구역 (비어 있으면 모든 구역의 작업 지시를 받음)
+
+# 작업자 정보 (명단 파일에서 읽고, 파일이 바뀌면 다시 읽음)
+roster = WorkerRoster.load(DEFAULT_ROSTER)
+
+# 출근한 작업자 중 가장 빨리 끝낼 작업자에게 업무 배정
+scheduler = WorkerScheduler()
+# 출근한 작업자가 없을 때 받은 업무 (누군가 출근하면 배정)
+unassigned_tasks = deque()
+# 배정/대기 목록과 출퇴근 처리를 함께 보호 (대기 목록에 넣는 사이 출근 처리가 목록을 비워 업무가 남지 않도록)
+assignment_lock = threading.RLock()
+
+# 중앙 서버 연결 (끊기면 자동 재접속, 작업 완료 응답 전송에도 사용)
+central_connection = None
+# 받아서 아직 완료하지 않은 작업 지시 번호 (재전송된 중복 지시 무시용)
+received_orders = set()
 
 # 출근 상태 저장 (True: 출근, False: 퇴근)
-attendance_states = {worker["uid"]: False for worker in workers.values()}
-
-# 버튼 핀 설정
-for worker in workers.values():
-    GPIO.setup(worker["button_pin"], GPIO.IN, pull_up_down=GPIO.PUD_UP)
-
-# LCD 클래스 정의
-class LCD:
-    def __init__(self, addr=0x27, bus=1):
-        self.addr = addr
-        self.bus = SMBus(bus)
-        self.lcd_init()
-
-    def lcd_init(self):
-        self.lcd_write(0x33)
-        self.lcd_write(0x32)
-        self.lcd_write(0x06)
-        self.lcd_write(0x0C)
-        self.lcd_write(0x28)
-        self.lcd_write(0x01)
-        time.sleep(0.05)
-
-    def lcd_write(self, cmd, mode=0):
-        high = mode | (cmd & 0xF0) | 0x08
-        low = mode | ((cmd << 4) & 0xF0) | 0x08
-        self.bus.write_byte(self.addr, high)
-        self.lcd_toggle_enable(high)
-        self.bus.write_byte(self.addr, low)
-        self.lcd_toggle_enable(low)
-
-    def lcd_toggle_enable(self, data):
-        time.sleep(0.0005)
-        self.bus.write_byte(self.addr, (data | 0x04))
-        time.sleep(0.0005)
-        self.bus.write_byte(self.addr, (data & ~0x04))
-        time.sleep(0.0005)
-
-    def lcd_display_string(self, string, line):
-        if line == 1:
-            self.lcd_write(0x80)
-        elif line == 2:
-            self.lcd_write(0xC0)
-        for char in string:
-            self.lcd_write(ord(char), 0x01)
-
-    def clear(self):
-        self.lcd_write(0x01)
-
-# LCD 객체 생성
-lcd = LCD()
+attendance_states = {worker["uid"]: False for _, worker in roster}
+
+# LCD 출력은 렌더 스레드 하나가 전담 (메시지당 최소 표시 시간)
+# LCD는 렌더 스레드가 처음 표시할 때 초기화
+LCD_DWELL_TIME = 2.0
+display = DisplayQueue(dwell=LCD_DWELL_TIME, open_lcd=lambda: hardware.get_backend().lcd())
 
 def handle_button_press(channel):
     """
     버튼이 눌리면 호출되는 함수. 출근 상태와 큐 상태에 따라 메시지를 출력.
     """
     current_time = time.time()
-    for worker_name, worker_data in workers.items():
-        if channel == worker_data["button_pin"]:
-            # 버튼 중복 입력 방지 (0.3초 이내 재입력 무시)
-            if current_time - worker_data["last_press_time"] < 0.3:
-                return
-            worker_data["last_press_time"] = current_time
-
-            if not attendance_states[worker_data["uid"]]:
-                # 출근하지 않은 경우
-                lcd.clear()
-                lcd_message = "He didn't come"
-                lcd.lcd_display_string(lcd_message, 1)
-                print(f"{worker_name}: Didn't come")
-                time.sleep(2)
-                lcd.clear()
+    entry = roster.find_by_pin(channel)
+    if entry is None:
+        return
+    worker_name, worker_data = entry
+
+    # 버튼 중복 입력 방지 (0.3초 이내 재입력 무시)
+    if current_time - worker_data["last_press_time"] < 0.3:
+        return
+    worker_data["last_press_time"] = current_time
+
+    if not attendance_states.get(worker_data["uid"], False):
+        # 출근하지 않은 경우
+        display.show("He didn't come", key=f"{worker_name}:button")
+        log.info("출근하지 않은 작업자의 버튼 입력", worker=worker_name)
+    else:
+        # 출근한 상태. 퇴근/명단 변경이 같은 큐를 비울 수 있으므로 잠금 안에서 블록하지 않고 꺼냄
+        # (버튼 콜백은 모든 버튼이 한 스레드를 쓰므로 여기서 멈추면 모든 버튼이 멈춤)
+        with assignment_lock:
+            try:
+                task = worker_data["queue"].get_nowait()
+            except Empty:
+                task = None
+        if task is not None:
+            # 업무가 있는 경우
+            order_id, oldest_task, assigned_time = task
+            # 작업 시간: 배정 시각과 직전 작업 완료 시각 중 늦은 때부터
+            duration = current_time - max(assigned_time, worker_data["last_done_time"])
+            worker_data["last_done_time"] = current_time
+            scheduler.complete(worker_name, duration)
+            log.debug("작업 완료", worker=worker_name, task=oldest_task, order_id=order_id, seconds=round(duration, 1))
+            acknowledge_order(order_id)
+
+            if worker_data["queue"].empty():
+                display.show(f"{worker_name}: done", f"{worker_name}: no task", key=f"{worker_name}:button")
+                log.debug("남은 작업 없음", worker=worker_name)
             else:
-                # 출근한 상태
-                if not worker_data["queue"].empty():
-                    # 업무가 있는 경우
-                    oldest_task = worker_data["queue"].get()
-                    lcd.clear()
-                    lcd_message = f"{worker_name}: done"
-                    lcd.lcd_display_string(lcd_message, 1)
-                    print(f"{worker_name} completed task: {oldest_task}")
-                    time.sleep(2)
-                    lcd.clear()
-
-                    if worker_data["queue"].empty():
-                        lcd.clear()
-                        lcd_message = f"{worker_name}: no task"
-                        lcd.lcd_display_string(lcd_message, 1)
-                        print(f"{worker_name}: No task to complete")
-                        time.sleep(2)
-                        lcd.clear()
-                else:
-                    # 업무가 없는 경우
-                    lcd.clear()
-                    lcd_message = f"{worker_name}: no task"
-                    lcd.lcd_display_string(lcd_message, 1)
-                    print(f"{worker_name}: No task to complete")
-                    time.sleep(2)
-                    lcd.clear()
-
-# 버튼 이벤트 핸들러 설정
-for worker in workers.values():
-    GPIO.add_event_detect(worker["button_pin"], GPIO.FALLING, callback=handle_button_press, bouncetime=300)
-
-def assign_task(task):
+                display.show(f"{worker_name}: done", key=f"{worker_name}:button")
+        else:
+            # 업무가 없는 경우
+            display.show(f"{worker_name}: no task", key=f"{worker_name}:button")
+            log.debug("남은 작업 없음", worker=worker_name)
+
+def watch_button(pin):
+    gpio = hardware.get_backend().gpio()
+    gpio.setup(pin, gpio.IN, pull_up_down=gpio.PUD_UP)
+    gpio.add_event_detect(pin, gpio.FALLING, callback=handle_button_press, bouncetime=300)
+
+def setup_buttons():
+    """명단에 있는 모든 작업자의 버튼 핀 설정과 이벤트 핸들러 등록 (main()에서 호출)."""
+    for _, worker in roster:
+        watch_button(worker["button_pin"])
+
+def apply_roster_change(change):
     """
-    작업자에게 업무를 할당하고 LCD에 작업자를 표시.
+    명단이 바뀌면 버튼 이벤트를 다시 설정하고, 빠진 작업자는 퇴근 처리.
+    빠진 작업자에게 배정됐던 업무는 대기 목록으로 돌려 다른 작업자에게 배정.
+    카드(UID)가 바뀐 작업자는 출근 상태를 새 UID로 옮김 (스케줄러는 이름 기준이라 그대로).
     """
-    worker1_tasks = workers["worker1"]["queue"].qsize()
-    worker2_tasks = workers["worker2"]["queue"].qsize()
-
-    if worker1_tasks <= worker2_tasks:
-        workers["worker1"]["queue"].put(task)
-        assigned_worker = "worker1"
-    else:
-        workers["worker2"]["queue"].put(task)
-        assigned_worker = "worker2"
-
-    lcd.clear()
-    lcd_message = f"{assigned_worker}: + task"
-    lcd.lcd_display_string(lcd_message, 1)
-    print(f"{assigned_worker} assigned task: {task}")
-    time.sleep(2)
-    lcd.clear()
+    gpio = hardware.get_backend().gpio()
+    for pin in change.removed_pins:
+        gpio.remove_event_detect(pin)
+    for pin in change.added_pins:
+        watch_button(pin)
+
+    with assignment_lock:
+        orphaned = []
+        for worker_name, worker_data in change.removed.items():
+            orphaned.extend(release_worker(worker_name, worker_data))
+        # 먼저 모두 꺼낸 뒤 옮김 (두 작업자가 카드를 서로 바꾼 경우에도 섞이지 않도록)
+        carried = {new_uid: attendance_states.pop(old_uid, False)
+                   for old_uid, new_uid in change.uid_changes.values()}
+        attendance_states.update(carried)
+    known_uids = set(roster.by_uid)
+    for uid in list(attendance_states):
+        if uid not in known_uids:
+            del attendance_states[uid]
+    for uid in known_uids:
+        attendance_states.setdefault(uid, False)
+    log.info("작업자 명단 갱신", added=",".join(change.added), removed=",".join(change.removed))
+    reassign_tasks(orphaned)
+
+def release_worker(worker_name, worker_data):
+    """작업자를 배정 대상에서 빼고, 큐에 남은 업무 [(order_id, task), ...]를 꺼내 반환."""
+    scheduler.check_out(worker_name)
+    released = []
+    while not worker_data["queue"].empty():
+        order_id, task, _ = worker_data["queue"].get()
+        released.append((order_id, task))
+    return released
+
+def reassign_tasks(tasks):
+    """다른 작업자에게 다시 배정 (이미 받은 작업 지시이므로 중복 검사 없이)."""
+    for order_id, task in tasks:
+        assign_task(task, order_id, check_duplicate=False)
+
+def acknowledge_order(order_id):
+    """작업 완료를 중앙 서버에 알려 작업 지시가 재전송되지 않도록 함."""
+    if order_id is None:
+        return
+    received_orders.discard(order_id)
+    if central_connection is None:
+        return
+    # 연결이 끊겨 있으면 재접속 후 한꺼번에 전송됨
+    send_message(central_connection, Message(
+        type=MessageType.WORK_ORDER_ACK,
+        send_type=SendType.SEND_FROM_WORKER,
+        order_id=order_id,
+    ))
+
+def assign_task(task, order_id=None, check_duplicate=True):
+    """
+    출근한 작업자 중 가장 빨리 끝낼 작업자에게 업무를 할당하고 LCD에 작업자를 표시.
+    중앙 서버가 같은 작업 지시를 다시 보낸 경우(완료 응답 유실 등)에는 무시.
+    """
+    if order_id is not None and check_duplicate:
+        if order_id in received_orders:
+            log.debug("이미 받은 작업 지시", order_id=order_id)
+            return
+        received_orders.add(order_id)
+
+    with assignment_lock:
+        assigned_worker = scheduler.assign()
+        if assigned_worker is None:
+            unassigned_tasks.append((order_id, task))
+            display.show("No worker: wait", key="unassigned")
+            log.info("출근한 작업자가 없어 업무 대기", task=task, waiting=len(unassigned_tasks))
+            return
+        roster.get(assigned_worker)["queue"].put((order_id, task, time.time()))
+    display.show(f"{assigned_worker}: + task", key=f"{assigned_worker}:task")
+    log.debug("업무 배정", worker=assigned_worker, task=task, order_id=order_id)
 
 def toggle_work_state(uid):
     """
     RFID 태그를 통해 출퇴근 상태를 변경하고 LCD에 출력.
     """
-    worker_name = None
-    for name, data in workers.items():
-        if data["uid"] == uid:
-            worker_name = name
-            break
-
-    if not worker_name:
-        lcd.clear()
-        lcd.lcd_display_string("Unknown card", 1)
-        print(f"Unknown UID: {uid}")
-        time.sleep(2)
-        lcd.clear()
+    entry = roster.find_by_uid(uid)
+    if entry is None:
+        display.show("Unknown card", key="unknown_card")
+        log.warning("등록되지 않은 카드", uid=uid)
         return
-
-    attendance_states[uid] = not attendance_states[uid]  # 출근/퇴근 상태 변경
-
-    if attendance_states[uid]:
-        lcd.clear()
-        lcd.lcd_display_string(f"{worker_name}: start", 1)
-        print(f"{worker_name} - Work start for UID: {uid}")
-    else:
-        lcd.clear()
-        lcd.lcd_display_string(f"{worker_name}: finish", 1)
-        print(f"{worker_name} - Work finish for UID: {uid}")
-
-    time.sleep(2)
-    lcd.clear()
+    worker_name, worker_data = entry
+
+    with assignment_lock:
+        attendance_states[uid] = not attendance_states.get(uid, False)  # 출근/퇴근 상태 변경
+
+        if attendance_states[uid]:
+            scheduler.check_in(worker_name)
+            display.show(f"{worker_name}: start", key=f"{worker_name}:attendance")
+            log.info("출근", worker=worker_name, uid=uid)
+            # 대기 중이던 업무를 출근한 작업자들에게 배정
+            waiting = list(unassigned_tasks)
+            unassigned_tasks.clear()
+            reassign_tasks(waiting)
+        else:
+            # 퇴근한 작업자가 끝내지 못한 업무는 다른 작업자에게 (없으면 대기 목록으로)
+            released = release_worker(worker_name, worker_data)
+            display.show(f"{worker_name}: finish", key=f"{worker_name}:attendance")
+            log.info("퇴근", worker=worker_name, uid=uid, reassigned=len(released))
+            reassign_tasks(released)
 
 def read_tags():
     """
     RFID 태그를 지속적으로 읽음.
     """
     try:
-        reader = SimpleMFRC522()
+        reader = hardware.get_backend().rfid_reader()
         while True:
-            print("Waiting for an RFID card...")
+            log.debug("RFID 카드 대기 중")
             uid, text = reader.read()
-            print(f"Card detected! UID: {uid}")
+            log.debug("카드 감지", uid=uid)
             toggle_work_state(uid)
             time.sleep(1)
     except KeyboardInterrupt:
-        print("\nProgram interrupted.")
+        log.info("프로그램 중단됨.")
     finally:
-        GPIO.cleanup()
+        hardware.get_backend().cleanup()
 
-def receiver_thread(server_socket):
+def handle_server_message(msg):
     """
-    중앙 서버로부터 데이터를 수신하는 스레드.
+    중앙 서버로부터 받은 메시지 처리 (연결 객체의 수신 스레드에서 호출).
     """
-    while True:
-        try:
-            data = server_socket.recv(1024)
-            if not data:
-                print("서버 연결 종료")
-                break
-
-            msg = Message.deserialize(data)
-            if msg.type == MessageType.WORK_ORDER:
-                assign_task(msg.content)
-        except ConnectionResetError:
-            print("서버와의 연결이 끊어졌습니다. 다시 연결을 시도합니다.")
-            break
-        except Exception as e:
-            print(f"수신 스레드 오류: {e}")
-            break
-
-def main():
+    if msg.type == MessageType.WORK_ORDER:
+        assign_task(msg.content, msg.order_id)
+
+def main(tag_reader=read_tags):
+    global central_connection
+    stop_event = threading.Event()
+    setup_logging()
+    display.start()
     try:
-        central_socket = create_and_connect_socket(CENTRAL_SERVER_IP, CENTRAL_SERVER_PORT)
-        print("중앙 서버에 연결 성공")
+        setup_buttons()
 
+        # 접속할 때마다 (재접속 포함) 식별 메시지를 먼저 보내 작업 지시 라우팅 대상으로 등록
         identification_msg = Message(
             type=MessageType.WORK_ORDER,
             send_type=SendType.SEND_FROM_WORKER,
-            content="worker_management"
+            content=make_identification(STATION_ID, STATION_ZONES)
         )
-        central_socket.send(identification_msg.serialize())
-        print("작업자 식별 메시지 전송 완료")
+        central_connection = ResilientConnection(
+            CENTRAL_SERVER_IP, CENTRAL_SERVER_PORT,
+            hello=[identification_msg],
+            on_message=handle_server_message,
+        ).start()
 
-        tag_thread = threading.Thread(target=read_tags, daemon=True)
-        tag_thread.start()
+        roster_thread = threading.Thread(target=roster.watch, args=(apply_roster_change, stop_event), daemon=True)
+        roster_thread.start()
 
-        recv_thread = threading.Thread(target=receiver_thread, args=(central_socket,))
-        recv_thread.start()
-
-        recv_thread.join()
+        tag_thread = threading.Thread(target=tag_reader, daemon=True)
+        tag_thread.start()
         tag_thread.join()
-        central_socket.close()
+        # 태그 읽기가 끝나도 이전처럼 중앙 서버 연결이 살아 있는 동안은 작업 지시를 계속 받음
+        log.warning("RFID 태그 읽기 종료, 중앙 서버 연결은 유지")
+        central_connection.thread.join()
     except Exception as e:
-        print(f"메인 함수 오류: {e}")
+        log.exception("메인 함수 오류", error=e)
     finally:
-        GPIO.cleanup()
+        stop_event.set()
+        if central_connection is not None:
+            central_connection.close()
+        display.stop()
+        hardware.get_backend().cleanup()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,104 @@
+import threading
+from common import send_message
+from zone_registry import zone_key
+from log_util import get_logger
+
+log = get_logger("central")
+
+class WorkerStation:
+    """중앙 서버에 접속한 작업자 스테이션 하나의 상태."""
+    def __init__(self, station_id, conn, zones=()):
+        self.station_id = station_id
+        self.conn = conn
+        self.zones = frozenset(zone_key(zone) for zone in zones)
+        self.outstanding = 0  # 보냈지만 아직 완료되지 않은 작업 지시 수
+
+class WorkerRegistry:
+    """
+    접속 중인 작업자 스테이션 목록.
+    스테이션 ID와 연결 객체로 O(1) 조회가 가능하고,
+    작업 지시는 담당 구역이 맞는 스테이션 중 미완료 작업이 가장 적은 곳으로 보낸다.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.stations = {}       # station_id -> WorkerStation
+        self.by_connection = {}  # id(conn) -> station_id
+        self.zone_index = {}     # zone -> {station_id: WorkerStation}
+
+    def register(self, station_id, conn, zones=()):
+        """스테이션을 등록. 같은 ID로 다시 접속하면 이전 연결을 대체."""
+        station = WorkerStation(station_id, conn, zones)
+        with self.lock:
+            self._remove(station_id)
+            self.stations[station_id] = station
+            self.by_connection[id(conn)] = station_id
+            for zone in station.zones:
+                self.zone_index.setdefault(zone, {})[station_id] = station
+        return station
+
+    def unregister(self, station_id):
+        with self.lock:
+            return self._remove(station_id)
+
+    def unregister_connection(self, conn):
+        """연결이 끊겼을 때 해당 연결로 등록된 스테이션을 제거."""
+        with self.lock:
+            station_id = self.by_connection.get(id(conn))
+            if station_id is None:
+                return None
+            return self._remove(station_id)
+
+    def _remove(self, station_id):
+        station = self.stations.pop(station_id, None)
+        if station is None:
+            return None
+        self.by_connection.pop(id(station.conn), None)
+        for zone in station.zones:
+            members = self.zone_index.get(zone)
+            if members is not None:
+                members.pop(station_id, None)
+                if not members:
+                    del self.zone_index[zone]
+        return station
+
+    def get(self, station_id):
+        return self.stations.get(station_id)
+
+    def __len__(self):
+        return len(self.stations)
+
+    def select(self, zone=None):
+        """작업 지시를 받을 스테이션을 고르고 미완료 작업 수를 하나 늘림."""
+        with self.lock:
+            candidates = self.zone_index.get(zone_key(zone)) if zone is not None else None
+            if not candidates:
+                candidates = self.stations
+            if not candidates:
+                return None
+            station = min(candidates.values(), key=lambda s: s.outstanding)
+            station.outstanding += 1
+            return station
+
+    def complete(self, station_id):
+        """스테이션이 작업을 하나 끝냈을 때 호출."""
+        with self.lock:
+            station = self.stations.get(station_id)
+            if station is not None and station.outstanding > 0:
+                station.outstanding -= 1
+
+    def dispatch(self, msg):
+        """
+        작업 지시를 스테이션 하나에 전송. 전송에 실패한 스테이션은 제거하고 다음 후보로 재시도.
+        전송한 스테이션을 반환하고, 받을 스테이션이 없으면 None.
+        """
+        while True:
+            station = self.select(msg.zone)
+            if station is None:
+                return None
+            try:
+                send_message(station.conn, msg)
+                return station
+            except OSError as e:
+                log.warning("작업 지시 전송 오류", station=station.station_id, error=e)
+                # ID가 아니라 실패한 연결로 제거 (그 사이 새 연결로 다시 등록했다면 새 등록은 유지)
+                self.unregister_connection(station.conn)
@@ -0,0 +1,164 @@
+import json
+import os
+import threading
+from queue import Queue
+from log_util import get_logger
+
+log = get_logger("worker")
+
+DEFAULT_ROSTER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "workers.json")
+ROSTER_CHECK_INTERVAL = 5.0
+
+def new_worker(uid, button_pin):
+    """작업자 상태 (업무 큐, 버튼 입력 시각 등)."""
+    return {"uid": uid, "queue": Queue(), "is_working": False, "button_pin": button_pin,
+            "last_press_time": 0, "last_done_time": 0}
+
+def parse_entry(entry):
+    """
+    명단 항목 하나를 (이름, UID, 버튼 핀)으로 검사. 잘못된 항목은 ValueError
+    (watch()가 로그만 남기고 기존 명단을 계속 쓰도록 예외 종류를 하나로 맞춤).
+    """
+    if not isinstance(entry, dict):
+        raise ValueError(f"잘못된 명단 항목: {entry!r}")
+    name, uid, pin = entry.get("name"), entry.get("uid"), entry.get("button_pin")
+    if not isinstance(name, str) or not name:
+        raise ValueError(f"작업자 이름이 없음: {entry!r}")
+    # UID는 숫자나 숫자 문자열 (RFID 리더가 읽은 값을 그대로 적은 경우)
+    if isinstance(uid, bool) or not isinstance(uid, (int, str)):
+        raise ValueError(f"잘못된 UID: {name} ({uid!r})")
+    try:
+        uid = int(uid)
+    except ValueError:
+        raise ValueError(f"잘못된 UID: {name} ({uid!r})") from None
+    if pin is not None and (isinstance(pin, bool) or not isinstance(pin, int) or pin < 0):
+        raise ValueError(f"잘못된 버튼 핀: {name} ({pin!r})")
+    return name, uid, pin
+
+class RosterChange:
+    """다시 읽기 전후의 차이 (GPIO 이벤트 재설정 등에 사용)."""
+    def __init__(self, added, removed, added_pins, removed_pins, uid_changes=None):
+        self.added = added                # 새로 추가된 작업자 이름
+        self.removed = removed            # 명단에서 빠진 작업자 (이름 -> 작업자 상태)
+        self.added_pins = added_pins      # 새로 감시해야 할 버튼 핀
+        self.removed_pins = removed_pins  # 더 이상 쓰지 않는 버튼 핀
+        self.uid_changes = uid_changes or {}  # 카드가 바뀐 작업자 (이름 -> (이전 UID, 새 UID))
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.added_pins or self.removed_pins or self.uid_changes)
+
+class WorkerRoster:
+    """
+    명단 파일에서 읽은 작업자 목록과 UID/버튼 핀 색인.
+    RFID 태그와 버튼 콜백은 색인으로 바로 작업자를 찾는다 (작업자 수와 무관).
+    파일이 바뀌면 다시 읽되, 계속 남아 있는 작업자의 큐와 상태는 그대로 유지한다.
+    """
+    def __init__(self, path=DEFAULT_ROSTER):
+        self.path = path
+        self.workers = {}  # 이름 -> 작업자 상태
+        self.by_uid = {}   # UID -> (이름, 작업자 상태)
+        self.by_pin = {}   # 버튼 핀 -> (이름, 작업자 상태)
+        self.mtime = None
+        self.lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path=DEFAULT_ROSTER):
+        roster = cls(path)
+        roster.reload()
+        return roster
+
+    def reload(self):
+        """
+        명단 파일을 다시 읽고 색인을 새로 만든다. 변경 내용(RosterChange)을 반환.
+        항목을 모두 검사한 뒤에만 작업자 상태를 바꾸므로, 잘못된 명단이면 ValueError를 내고 기존 명단이 그대로 남는다.
+        """
+        mtime = os.stat(self.path).st_mtime
+        with open(self.path, encoding="utf-8") as f:
+            config = json.load(f)
+        entries = config.get("workers") if isinstance(config, dict) else None
+        if not isinstance(entries, list):
+            raise ValueError("명단 파일에 workers 목록이 없음")
+
+        # 1단계: 검사만 (기존 작업자 상태는 건드리지 않음)
+        parsed, names, uids, pins = [], set(), {}, {}
+        for entry in entries:
+            name, uid, pin = parse_entry(entry)
+            if name in names:
+                raise ValueError(f"중복된 작업자: {name}")
+            if uid in uids:
+                raise ValueError(f"중복된 UID: {uid} ({uids[uid]}, {name})")
+            if pin is not None and pin in pins:
+                raise ValueError(f"중복된 버튼 핀: {pin} ({pins[pin]}, {name})")
+            names.add(name)
+            uids[uid] = name
+            if pin is not None:
+                pins[pin] = name
+            parsed.append((name, uid, pin))
+
+        # 2단계: 새 명단 구성. 남아 있는 작업자는 같은 상태 객체(업무 큐 포함)를 유지
+        with self.lock:
+            workers, by_uid, by_pin, uid_changes = {}, {}, {}, {}
+            for name, uid, pin in parsed:
+                worker = self.workers.get(name)
+                if worker is None:
+                    worker = new_worker(uid, pin)
+                else:
+                    if worker["uid"] != uid:
+                        uid_changes[name] = (worker["uid"], uid)
+                    worker["uid"] = uid
+                    worker["button_pin"] = pin
+                workers[name] = worker
+                by_uid[uid] = (name, worker)
+                if pin is not None:
+                    by_pin[pin] = (name, worker)
+
+            change = RosterChange(
+                added=[name for name in workers if name not in self.workers],
+                removed={name: worker for name, worker in self.workers.items() if name not in workers},
+                added_pins=[pin for pin in by_pin if pin not in self.by_pin],
+                removed_pins=[pin for pin in self.by_pin if pin not in by_pin],
+                uid_changes=uid_changes,
+            )
+            # 색인은 통째로 교체 (콜백 스레드는 잠금 없이 읽음)
+            self.workers, self.by_uid, self.by_pin = workers, by_uid, by_pin
+            self.mtime = mtime
+        return change
+
+    def reload_if_changed(self):
+        """파일 수정 시각이 바뀐 경우에만 다시 읽음. 바뀌지 않았으면 None."""
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except OSError:
+            return None
+        if mtime == self.mtime:
+            return None
+        return self.reload()
+
+    def watch(self, on_change, stop_event, interval=ROSTER_CHECK_INTERVAL):
+        """명단 파일을 주기적으로 확인해 바뀌면 다시 읽고 on_change(change)를 호출 (스레드용)."""
+        while not stop_event.wait(interval):
+            try:
+                change = self.reload_if_changed()
+            except (OSError, ValueError, KeyError) as e:
+                # 잘못된 명단은 무시하고 기존 명단을 계속 사용
+                log.error("작업자 명단 다시 읽기 오류", path=self.path, error=e)
+                continue
+            if change:
+                on_change(change)
+
+    def find_by_uid(self, uid):
+        """UID로 (이름, 작업자 상태)를 찾음. 없으면 None."""
+        return self.by_uid.get(uid)
+
+    def find_by_pin(self, pin):
+        """버튼 핀으로 (이름, 작업자 상태)를 찾음. 없으면 None."""
+        return self.by_pin.get(pin)
+
+    def get(self, name):
+        return self.workers.get(name)
+
+    def __len__(self):
+        return len(self.workers)
+
+    def __iter__(self):
+        return iter(self.workers.items())
@@ -0,0 +1,263 @@
+import os
+import struct
+import threading
+import time
+import zlib
+from common import Message
+from log_util import get_logger
+
+log = get_logger("wal")
+
+# 로그 레코드: 길이(4) | CRC32(4) | 시퀀스(8) | Message 바이너리
+RECORD_HEADER = struct.Struct("!IIQ")
+# 스냅숏: 매직(4) | 시퀀스(8) | 항목 수(4) | [구역 길이(1) | 구역 | 재고(8)]...
+SNAPSHOT_MAGIC = b"INV1"
+SNAPSHOT_HEADER = struct.Struct("!4sQI")
+SNAPSHOT_QUANTITY = struct.Struct("!q")
+
+SNAPSHOT_FILE = "snapshot.bin"
+SEGMENT_PREFIX = "wal-"
+SEGMENT_SUFFIX = ".log"
+
+class WriteAheadLog:
+    """
+    추가 전용(append-only) 로그와 주기적 스냅숏으로 중앙 서버 상태를 보존.
+    - append()는 메모리 버퍼에 쌓고 바로 반환하며, 전용 스레드가 모아서 한 번에
+      write + fsync (group commit). 메시지마다 fsync하지 않음
+    - 스냅숏을 저장하면 그 이전 로그 세그먼트를 지워 복구 시 읽을 꼬리를 짧게 유지
+    - recover()는 스냅숏을 읽고 그 이후 로그만 재생
+    """
+    def __init__(self, directory, flush_interval=0.01, max_pending_bytes=256 * 1024):
+        self.directory = directory
+        self.flush_interval = flush_interval        # group commit 최대 대기 시간(초)
+        self.max_pending_bytes = max_pending_bytes  # 이만큼 쌓이면 즉시 flush
+        os.makedirs(directory, exist_ok=True)
+
+        self.cond = threading.Condition()
+        self.io_lock = threading.Lock()  # 세그먼트 파일 쓰기/교체 보호
+        self.pending = []
+        self.pending_bytes = 0
+        self.last_seq = 0             # 마지막으로 부여한 시퀀스
+        self.durable_seq = 0          # fsync까지 끝난 시퀀스
+        self.snapshot_seq = 0         # 마지막 스냅숏이 포함하는 시퀀스
+        self.segment = None
+        self.running = False
+        self.thread = None
+
+    # ----- 복구 -----
+
+    def recover(self):
+        """
+        스냅숏과 로그 꼬리를 읽어 (재고 dict, 스냅숏 이후 레코드 [(seq, Message), ...])를 반환.
+        마지막 레코드가 쓰다 만 상태(CRC 불일치 등)면 그 지점에서 파일을 잘라 낸다
+        (start()가 같은 세그먼트에 이어 쓸 수 있으므로 손상된 바이트 뒤에 새 레코드가 붙지 않도록).
+        """
+        inventory = {}
+        snapshot_path = os.path.join(self.directory, SNAPSHOT_FILE)
+        if os.path.exists(snapshot_path):
+            with open(snapshot_path, "rb") as f:
+                self.snapshot_seq, inventory = decode_snapshot(f.read())
+        self.last_seq = self.snapshot_seq
+
+        tail = []
+        for path in self._segments():
+            with open(path, "rb") as f:
+                data = f.read()
+            offset = 0
+            while offset + RECORD_HEADER.size <= len(data):
+                length, crc, seq = RECORD_HEADER.unpack_from(data, offset)
+                start = offset + RECORD_HEADER.size
+                payload = data[start:start + length]
+                if len(payload) < length or zlib.crc32(payload) != crc:
+                    break
+                offset = start + length
+                if seq <= self.snapshot_seq:
+                    continue
+                msg = Message.deserialize(payload)
+                apply_record(inventory, msg)
+                tail.append((seq, msg))
+                self.last_seq = max(self.last_seq, seq)
+            if offset < len(data):
+                log.warning("손상된 로그 꼬리 잘라 냄", segment=os.path.basename(path), offset=offset,
+                            dropped=len(data) - offset)
+                truncate_file(path, offset)
+
+        self.durable_seq = self.last_seq
+        return inventory, tail
+
+    # ----- 기록 -----
+
+    def start(self):
+        """새 세그먼트를 열고 group commit 스레드를 시작. recover() 뒤에 호출."""
+        self._open_segment(self.last_seq + 1)
+        self.running = True
+        self.thread = threading.Thread(target=self._flush_loop, name="wal-flush", daemon=True)
+        self.thread.start()
+
+    def close(self):
+        with self.cond:
+            self.running = False
+            self.cond.notify_all()
+        if self.thread:
+            self.thread.join()
+        self._write_pending()
+        if self.segment:
+            self.segment.close()
+            self.segment = None
+
+    def append(self, msg, wait=False):
+        """레코드를 추가하고 시퀀스를 반환. wait=True면 디스크에 기록될 때까지 대기."""
+        payload = msg.serialize()
+        with self.cond:
+            self.last_seq += 1
+            seq = self.last_seq
+            self.pending.append(RECORD_HEADER.pack(len(payload), zlib.crc32(payload), seq) + payload)
+            self.pending_bytes += RECORD_HEADER.size + len(payload)
+            if self.pending_bytes >= self.max_pending_bytes:
+                self.cond.notify_all()
+            if wait:
+                while self.durable_seq < seq and self.running:
+                    self.cond.wait()
+        return seq
+
+    def records_since_snapshot(self):
+        return self.last_seq - self.snapshot_seq
+
+    def _flush_loop(self):
+        while True:
+            with self.cond:
+                if self.running and self.pending_bytes < self.max_pending_bytes:
+                    self.cond.wait(self.flush_interval)
+                running = self.running
+            self._write_pending()
+            if not running:
+                return
+
+    def _write_pending(self, rotate=False):
+        """쌓인 레코드를 한 번의 write + fsync로 기록. rotate=True면 이어서 새 세그먼트를 엶."""
+        with self.io_lock:
+            if self.segment is None:
+                # start() 전이거나 close() 뒤: 쓸 세그먼트가 없으면 쌓인 레코드는 그대로 둠
+                return self.durable_seq
+            with self.cond:
+                batch = self.pending
+                seq = self.last_seq
+                self.pending = []
+                self.pending_bytes = 0
+
+            if batch:
+                self.segment.write(b"".join(batch))
+            if batch or rotate:
+                self.segment.flush()
+                os.fsync(self.segment.fileno())
+            if rotate:
+                self.segment.close()
+                self._open_segment(seq + 1)
+
+            with self.cond:
+                self.durable_seq = max(self.durable_seq, seq)
+                self.cond.notify_all()
+        return seq
+
+    # ----- 스냅숏 -----
+
+    def begin_snapshot(self):
+        """
+        스냅숏 시점을 정하고 새 세그먼트로 넘어감. (seq, 이전 세그먼트 목록)을 반환.
+        재고 잠금을 모두 잡은 상태에서 호출해야 seq와 재고 값이 같은 시점을 가리킴.
+        """
+        old_segments = self._segments()
+        seq = self._write_pending(rotate=True)
+        return seq, old_segments
+
+    def finish_snapshot(self, seq, inventory, old_segments):
+        """seq까지 반영된 재고를 스냅숏 파일로 저장하고 더 이상 필요 없는 세그먼트를 삭제."""
+        path = os.path.join(self.directory, SNAPSHOT_FILE)
+        temp_path = path + ".tmp"
+        with open(temp_path, "wb") as f:
+            f.write(encode_snapshot(seq, inventory))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)  # 원자적 교체
+        self.snapshot_seq = seq
+
+        for old_path in old_segments:
+            os.remove(old_path)
+
+    def _segments(self):
+        names = sorted(
+            name for name in os.listdir(self.directory)
+            if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX)
+        )
+        return [os.path.join(self.directory, name) for name in names]
+
+    def _open_segment(self, first_seq):
+        name = f"{SEGMENT_PREFIX}{first_seq:016d}{SEGMENT_SUFFIX}"
+        self.segment = open(os.path.join(self.directory, name), "ab")
+
+def truncate_file(path, size):
+    """path를 size 바이트로 자르고 디스크에 반영."""
+    with open(path, "r+b") as f:
+        f.truncate(size)
+        f.flush()
+        os.fsync(f.fileno())
+
+def apply_record(inventory, msg):
+    """로그 레코드 하나를 재고 dict에 반영. 재고와 관계없는 레코드(작업 지시 등)는 무시."""
+    if msg.items is not None:
+        for zone, quantity in msg.items:
+            inventory[zone] = quantity
+    elif msg.zone is not None and msg.quantity is not None:
+        inventory[msg.zone] = msg.quantity
+
+def encode_snapshot(seq, inventory):
+    parts = [SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, seq, len(inventory))]
+    for zone, quantity in inventory.items():
+        zone = zone.encode("utf-8")
+        parts.append(bytes((len(zone),)))
+        parts.append(zone)
+        parts.append(SNAPSHOT_QUANTITY.pack(quantity))
+    return b"".join(parts)
+
+def decode_snapshot(data):
+    magic, seq, count = SNAPSHOT_HEADER.unpack_from(data, 0)
+    if magic != SNAPSHOT_MAGIC:
+        raise ValueError("스냅숏 형식이 올바르지 않습니다")
+    offset = SNAPSHOT_HEADER.size
+    inventory = {}
+    for _ in range(count):
+        length = data[offset]
+        offset += 1
+        zone = str(data[offset:offset + length], "utf-8")
+        offset += length
+        (inventory[zone],) = SNAPSHOT_QUANTITY.unpack_from(data, offset)
+        offset += SNAPSHOT_QUANTITY.size
+    return seq, inventory
+
+class SnapshotScheduler:
+    """일정 시간 또는 일정 레코드 수마다 take_snapshot()을 호출하는 백그라운드 스레드."""
+    def __init__(self, wal, take_snapshot, interval=60.0, max_records=100000):
+        self.wal = wal
+        self.take_snapshot = take_snapshot
+        self.interval = interval
+        self.max_records = max_records
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="wal-snapshot", daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        self.thread.join()
+
+    def _run(self):
+        last = time.monotonic()
+        while not self.stop_event.wait(1.0):
+            records = self.wal.records_since_snapshot()
+            if records and (records >= self.max_records or time.monotonic() - last >= self.interval):
+                try:
+                    self.take_snapshot()
+                except Exception as e:
+                    log.exception("스냅숏 저장 오류", error=e)
+                last = time.monotonic()
@@ -0,0 +1,67 @@
+import json
+import os
+
+ZONE_SUFFIX = "구역"
+DEFAULT_ZONES_CONFIG = os.path.join(os.path.dirname(os.path.abspath(__file__)), "zones.json")
+
+def zone_key(name):
+    """"A", "A구역", "A 구역"을 모두 같은 구역 ID "A"로 정규화."""
+    key = "".join(str(name).split())
+    if key.endswith(ZONE_SUFFIX) and len(key) > len(ZONE_SUFFIX):
+        key = key[:-len(ZONE_SUFFIX)]
+    return key
+
+class Zone:
+    def __init__(self, zone_id, index, led_pin=None, options=None):
+        self.id = zone_id
+        self.index = index      # 재고 배열에서의 위치
+        self.led_pin = led_pin  # 재고 부족 표시 LED (없으면 None)
+        self.options = options or {}
+
+    @property
+    def label(self):
+        """화면/로그에 쓰는 이름 (예: "A 구역")."""
+        return f"{self.id} {ZONE_SUFFIX}"
+
+class ZoneRegistry:
+    """
+    설정 파일에서 읽은 구역 목록.
+    구역마다 0부터 시작하는 고정 인덱스를 부여해 배열 기반 처리에 사용한다.
+    """
+    def __init__(self, zones):
+        self.zones = []
+        self.by_key = {}
+        for entry in zones:
+            zone_id = zone_key(entry["id"])
+            if zone_id in self.by_key:
+                raise ValueError(f"중복된 구역: {zone_id}")
+            options = {k: v for k, v in entry.items() if k not in ("id", "led_pin")}
+            zone = Zone(zone_id, len(self.zones), entry.get("led_pin"), options)
+            self.zones.append(zone)
+            self.by_key[zone_id] = zone
+
+    @classmethod
+    def load(cls, path=DEFAULT_ZONES_CONFIG):
+        with open(path, encoding="utf-8") as f:
+            config = json.load(f)
+        return cls(config["zones"])
+
+    @property
+    def ids(self):
+        return [zone.id for zone in self.zones]
+
+    def get(self, name):
+        """구역 이름을 정규화해 Zone을 찾음. 없으면 None."""
+        return self.by_key.get(zone_key(name))
+
+    def index_of(self, name):
+        return self.by_key[zone_key(name)].index
+
+    def __len__(self):
+        return len(self.zones)
+
+    def __iter__(self):
+        return iter(self.zones)
+
+    def __contains__(self, name):
+        return zone_key(name) in self.by_key
@@ -1,7 +1,7 @@
 import RPi.GPIO as GPIO
 import socket
 import threading
-from common import Message, MessageType, SendType, CENTRAL_SERVER_PORT
+from common import Message, MessageType, SendType, FrameDecoder, send_message, CENTRAL_SERVER_PORT
 from socket_util import create_and_bind_socket
 
 # 글로벌 변수
@@ -43,7 +43,7 @@ def handle_inventory_update(msg):
 
 def send_work_order(target_socket, msg):
     if target_socket:
-        target_socket.send(msg.serialize())
+        send_message(target_socket, msg)
         print(f"작업 지시 전송: {msg.content}")
     else:
         print("작업자 소켓이 설정되지 않았습니다. 작업 지시를 보낼 수 없습니다.")
@@ -51,6 +51,7 @@ def send_work_order(target_socket, msg):
 def receiver_data(client_socket, addr):
     global worker_socket
     print(f"연결 수락됨: {addr}")
+    decoder = FrameDecoder()
 
     while True:
         try:
@@ -59,19 +60,18 @@ def receiver_data(client_socket, addr):
                 print(f"클라이언트 연결 종료: {addr}")
                 break
 
-            msg = Message.deserialize(data)
+            for msg in decoder.feed(data):
+                if msg.send_type == SendType.SEND_FROM_WORKER:
+                    worker_socket = client_socket
+                    print("작업자 소켓 설정 완료")  # 작업자 소켓 설정
+                    continue  # 작업자 소켓 설정 후 메시지 처리 건너뜀
 
-            if msg.send_type == SendType.SEND_FROM_WORKER:
-                worker_socket = client_socket
-                print("작업자 소켓 설정 완료")  # 작업자 소켓 설정
-                continue  # 작업자 소켓 설정 후 메시지 처리 건너뜀
-
-            if msg.type in (MessageType.INVENTORY_UPDATE_FROM_WARE, MessageType.INVENTORY_UPDATE_FROM_WORKER):
-                handle_inventory_update(msg)
-            elif msg.type == MessageType.WORK_ORDER:
-                send_work_order(worker_socket, msg)
-            else:
-                print(f"알 수 없는 메시지 수신: {msg.content}")
+                if msg.type in (MessageType.INVENTORY_UPDATE_FROM_WARE, MessageType.INVENTORY_UPDATE_FROM_WORKER):
+                    handle_inventory_update(msg)
+                elif msg.type == MessageType.WORK_ORDER:
+                    send_work_order(worker_socket, msg)
+                else:
+                    print(f"알 수 없는 메시지 수신: {msg.content}")
         except Exception as e:
             print(f"데이터 수신 오류: {e}")
             break
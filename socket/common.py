@@ -1,4 +1,5 @@
 import pickle
+import struct
 import binascii
 from enum import Enum
 
@@ -33,6 +34,50 @@ class Message:
         """Deserialize bytes to a Message object."""
         return pickle.loads(data)
 
+# 프레임 헤더: 페이로드 길이(4바이트, 네트워크 바이트 순서)
+FRAME_HEADER = struct.Struct("!I")
+MAX_FRAME_SIZE = 1024 * 1024  # 비정상적인 길이 헤더로 메모리를 낭비하지 않도록 제한
+
+def encode_frame(msg):
+    """Message를 길이 헤더가 붙은 프레임 바이트로 변환."""
+    payload = msg.serialize()
+    return FRAME_HEADER.pack(len(payload)) + payload
+
+def send_message(sock, msg):
+    """프레임 단위로 메시지를 전송. send()와 달리 전체가 전송될 때까지 보장."""
+    sock.sendall(encode_frame(msg))
+
+class FrameDecoder:
+    """
+    TCP 스트림에서 프레임을 복원하는 디코더.
+    recv()로 받은 조각을 feed()에 넘기면 완성된 Message를 모두 돌려주고,
+    남은 조각은 다음 호출까지 내부 버퍼에 보관.
+    """
+    def __init__(self):
+        self.buffer = bytearray()
+
+    def feed(self, data):
+        self.buffer += data
+        messages = []
+        offset = 0
+        header_size = FRAME_HEADER.size
+        buffered = len(self.buffer)
+
+        while buffered - offset >= header_size:
+            (length,) = FRAME_HEADER.unpack_from(self.buffer, offset)
+            if length > MAX_FRAME_SIZE:
+                raise ValueError(f"프레임 길이 초과: {length}")
+            end = offset + header_size + length
+            if end > buffered:
+                break
+            messages.append(Message.deserialize(bytes(self.buffer[offset + header_size:end])))
+            offset = end
+
+        # 처리한 프레임만 한 번에 잘라내고 버퍼 객체는 재사용
+        if offset:
+            del self.buffer[:offset]
+        return messages
+
 # CENTRAL_SERVER_IP = "192.168.124.3"
 # WORKER_SERVER_IP = "192.168.122.5"
 # CENTRAL_SERVER_PORT = 8080
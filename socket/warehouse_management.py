@@ -1,6 +1,6 @@
 import socket
 import time
-from common import Message, MessageType, SendType, CENTRAL_SERVER_IP, CENTRAL_SERVER_PORT
+from common import Message, MessageType, SendType, send_message, CENTRAL_SERVER_IP, CENTRAL_SERVER_PORT
 from socket_util import create_and_connect_socket
 
 # 예제 데이터: 각 구역별 센서와 수기 입력 데이터를 가져오는 함수
@@ -21,7 +21,7 @@ def update_inventory(server_socket, zone, updated_inventory):
         send_type=SendType.SEND_FROM_WAREHOUSE,
         content=f"{zone}구역: {updated_inventory}",
     )
-    server_socket.send(msg.serialize())
+    send_message(server_socket, msg)
     print(f"{zone}구역 재고 업데이트 완료")
 
 def compare_inventory_and_notify(server_socket, zone):
@@ -43,7 +43,7 @@ def compare_inventory_and_notify(server_socket, zone):
             send_type=SendType.SEND_FROM_WAREHOUSE,
             content=message_content,
         )
-        server_socket.send(msg.serialize())
+        send_message(server_socket, msg)
         print(f"업무 지시 전송 완료")
     else:
         print(f"{zone}구역 재고 데이터가 일치합니다. 추가 작업 필요 없음.")
@@ -5,7 +5,7 @@ import threading
 import socket
 from smbus2 import SMBus
 import time
-from common import Message, MessageType, SendType, CENTRAL_SERVER_IP, CENTRAL_SERVER_PORT
+from common import Message, MessageType, SendType, FrameDecoder, send_message, CENTRAL_SERVER_IP, CENTRAL_SERVER_PORT
 from socket_util import create_and_connect_socket
 
 # GPIO 초기화
@@ -160,6 +160,7 @@ def receiver_thread(server_socket):
     """
     중앙 서버로부터 데이터를 수신하는 스레드.
     """
+    decoder = FrameDecoder()
     while True:
         try:
             data = server_socket.recv(1024)
@@ -167,9 +168,9 @@ def receiver_thread(server_socket):
                 print("데이터 수신 오류 또는 연결 종료")
                 break
 
-            msg = Message.deserialize(data)
-            if msg.type == MessageType.WORK_ORDER:
-                assign_task(msg.content)
+            for msg in decoder.feed(data):
+                if msg.type == MessageType.WORK_ORDER:
+                    assign_task(msg.content)
         except Exception as e:
             print(f"수신 스레드 오류: {e}")
             break
@@ -186,7 +187,7 @@ def main():
             send_type=SendType.SEND_FROM_WORKER,
             content="worker_management"
         )
-        central_socket.send(identification_msg.serialize())
+        send_message(central_socket, identification_msg)
         print("작업자 식별 메시지 전송 완료")
 
         # RFID 태그 읽기 스레드 시작